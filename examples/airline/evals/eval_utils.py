@@ -5,12 +5,13 @@ import uuid
 from swarm_ollama import Swarm
 
 
-def run_function_evals(agent, test_cases, n=1, eval_path=None):
+def run_function_evals(agent, test_cases, n=1, eval_path=None, cache=None):
     correct_function = 0
     results = []
     eval_id = str(uuid.uuid4())
     eval_timestamp = datetime.datetime.now().isoformat()
-    client = Swarm()
+    # with a CompletionCache, repeated iterations replay the first completion
+    client = Swarm(cache=cache)
 
     for test_case in test_cases:
         case_correct = 0
@@ -1,5 +1,7 @@
 import json
+import os
 
+from swarm_ollama import CompletionCache
 from examples.airline.configs.agents import *
 from examples.airline.evals.eval_utils import run_function_evals
 
@@ -8,6 +10,10 @@ flight_modification_cases = "eval_cases/flight_modification_cases.json"
 
 n = 5
 
+# set SWARM_EVAL_CACHE to a file path to reuse completions across eval runs
+cache_path = os.getenv("SWARM_EVAL_CACHE")
+cache = CompletionCache(path=cache_path) if cache_path else None
+
 if __name__ == "__main__":
     # Run triage_agent evals
     with open(triage_test_cases, "r") as file:
@@ -17,6 +23,7 @@ if __name__ == "__main__":
         triage_test_cases,
         n,
         eval_path="eval_results/triage_evals.json",
+        cache=cache,
     )
 
     # Run flight modification evals
@@ -27,4 +34,5 @@ if __name__ == "__main__":
         flight_modification_cases,
         n,
         eval_path="eval_results/flight_modification_evals.json",
+        cache=cache,
     )
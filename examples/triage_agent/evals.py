@@ -1,10 +1,14 @@
-from swarm_ollama import Swarm
+import os
+
+from swarm_ollama import CompletionCache, Swarm
 from agents import triage_agent
 from evals_util import evaluate_with_llm_bool, BoolEvalResult
 import pytest
 import json
 
-client = Swarm()
+# set SWARM_EVAL_CACHE to a file path to reuse completions across eval runs
+cache_path = os.getenv("SWARM_EVAL_CACHE")
+client = Swarm(cache=CompletionCache(path=cache_path) if cache_path else None)
 
 CONVERSATIONAL_EVAL_SYSTEM_PROMPT = """
 You will be provided with a conversation between a user and an agent, as well as a main goal for the conversation.
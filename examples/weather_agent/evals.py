@@ -1,8 +1,12 @@
-from swarm_ollama import Swarm
+import os
+
+from swarm_ollama import CompletionCache, Swarm
 from agents import weather_agent
 import pytest
 
-client = Swarm()
+# set SWARM_EVAL_CACHE to a file path to reuse completions across eval runs
+cache_path = os.getenv("SWARM_EVAL_CACHE")
+client = Swarm(cache=CompletionCache(path=cache_path) if cache_path else None)
 
 
 def run_and_get_tool_calls(agent, query):
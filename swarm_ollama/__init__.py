@@ -1,5 +1,16 @@
-from .core import Swarm
+from .cache import CompletionCache
+from .core import AsyncSwarm, Swarm
+from .semantic_cache import SemanticCache
 from .types import Agent, Response
-from .wrapper import OllamaWrapper
+from .wrapper import AsyncOllamaWrapper, OllamaWrapper
 
-__all__ = ["Swarm", "Agent", "Response", "OllamaWrapper"]
+__all__ = [
+    "Swarm",
+    "AsyncSwarm",
+    "Agent",
+    "Response",
+    "OllamaWrapper",
+    "AsyncOllamaWrapper",
+    "CompletionCache",
+    "SemanticCache",
+]
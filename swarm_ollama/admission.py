@@ -0,0 +1,260 @@
+import asyncio
+import contextlib
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from enum import IntEnum
+from typing import Any, Dict, Optional
+
+from .util import percentile
+
+
+class Priority(IntEnum):
+    """Admission priority classes; lower values are admitted first."""
+
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+def _priority_name(priority: int) -> str:
+    try:
+        return Priority(priority).name.lower()
+    except ValueError:
+        return str(priority)
+
+
+class AdmissionRejected(RuntimeError):
+    """
+    Raised when a run is not admitted: the queue is full, the predicted wait
+    exceeds its deadline, or the deadline passed while it was queued.
+    """
+
+    def __init__(self, message: str, reason: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+class _Ticket:
+    def __init__(self, priority: int, deadline: Optional[float], loop=None):
+        self.priority = priority
+        self.deadline = deadline
+        self.enqueued_at = time.monotonic()
+        self.admitted = False
+        self.cancelled = False
+        self.loop = loop
+        if loop is None:
+            self.event = threading.Event()
+        else:
+            self.future = loop.create_future()
+
+    def wake(self) -> None:
+        self.admitted = True
+        if self.loop is None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(self._resolve)
+
+    def _resolve(self) -> None:
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class AdmissionController:
+    """
+    Limit the number of concurrent Swarm runs, admitting queued runs by priority.
+
+    Runs beyond `max_concurrency` wait in a priority queue (interactive before
+    batch, then first come first served). A run with a deadline is rejected with
+    `AdmissionRejected` upfront when its predicted wait exceeds the deadline, or
+    when the deadline passes while queued. The wait is predicted from the runs
+    queued ahead and an exponentially weighted average of run durations.
+
+    Args:
+        max_concurrency (int): Runs in flight at once.
+        max_queue (int, optional): Runs allowed to wait; more are rejected.
+        smoothing (float): Weight of the latest run duration in the average.
+        max_samples (int): Wait times kept for `stats`.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        max_queue: Optional[int] = None,
+        smoothing: float = 0.2,
+        max_samples: int = 1000,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.smoothing = smoothing
+        self.in_flight = 0
+        self.service_time: Optional[float] = None
+        self.admitted = 0
+        self.rejected: Dict[str, int] = {"queue_full": 0, "predicted": 0, "expired": 0}
+        self._queue = []
+        self._queued = 0
+        self._order = itertools.count()
+        self._waits = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+
+    def predicted_wait(self, priority: int = Priority.INTERACTIVE) -> float:
+        """Seconds a run of `priority` is expected to wait if queued now."""
+        with self._lock:
+            return self._predict(priority)
+
+    def _predict(self, priority: int) -> float:
+        if self.in_flight < self.max_concurrency and not self._queued:
+            return 0.0
+        if self.service_time is None:
+            return 0.0
+        ahead = sum(
+            1
+            for _, _, ticket in self._queue
+            if ticket.priority <= priority and not ticket.cancelled
+        )
+        # one slot frees up every service_time / max_concurrency on average
+        return (ahead + 1) * self.service_time / self.max_concurrency
+
+    def _reject(self, reason: str, message: str) -> AdmissionRejected:
+        self.rejected[reason] += 1
+        return AdmissionRejected(message, reason)
+
+    def _enter(self, priority: int, deadline: Optional[float], loop=None):
+        """Admit now (returns None) or enqueue a ticket. Called with the lock held."""
+        if self.in_flight < self.max_concurrency and not self._queued:
+            self.in_flight += 1
+            self.admitted += 1
+            self._waits.append(0.0)
+            return None
+        if self.max_queue is not None and self._queued >= self.max_queue:
+            raise self._reject("queue_full", "Admission queue is full.")
+        if deadline is not None:
+            wait = self._predict(priority)
+            if wait > deadline:
+                raise self._reject(
+                    "predicted",
+                    f"Predicted wait of {wait:.2f}s exceeds the {deadline}s deadline.",
+                )
+        ticket = _Ticket(
+            priority, None if deadline is None else time.monotonic() + deadline, loop
+        )
+        heapq.heappush(self._queue, (int(priority), next(self._order), ticket))
+        self._queued += 1
+        return ticket
+
+    def _dispatch(self) -> None:
+        """Admit queued runs while there is room. Called with the lock held."""
+        now = time.monotonic()
+        while self._queue and self.in_flight < self.max_concurrency:
+            _, _, ticket = heapq.heappop(self._queue)
+            if ticket.cancelled:
+                continue
+            self._queued -= 1
+            self.in_flight += 1
+            self.admitted += 1
+            self._waits.append(now - ticket.enqueued_at)
+            ticket.wake()
+
+    def _withdraw(self, ticket: _Ticket, keep_slot: bool) -> bool:
+        """
+        Stop waiting on a ticket. Returns whether it was admitted meanwhile, in
+        which case its slot is kept or given back according to `keep_slot`.
+        """
+        with self._lock:
+            if ticket.admitted:
+                if not keep_slot:
+                    self.in_flight -= 1
+                    self._dispatch()
+                return True
+            ticket.cancelled = True
+            self._queued -= 1
+            return False
+
+    def _expired(self) -> AdmissionRejected:
+        with self._lock:
+            return self._reject("expired", "Deadline passed while queued.")
+
+    def _release(self, started_at: float) -> None:
+        duration = time.monotonic() - started_at
+        with self._lock:
+            self.in_flight -= 1
+            if self.service_time is None:
+                self.service_time = duration
+            else:
+                self.service_time += self.smoothing * (duration - self.service_time)
+            self._dispatch()
+
+    @contextlib.contextmanager
+    def admit(
+        self, priority: int = Priority.INTERACTIVE, deadline: Optional[float] = None
+    ):
+        """
+        Hold a run slot for the duration of the `with` block.
+
+        Args:
+            priority: A `Priority`; lower values are admitted first.
+            deadline: Seconds the caller is willing to wait for a slot.
+        """
+        with self._lock:
+            ticket = self._enter(priority, deadline)
+        if ticket is not None:
+            timeout = None if deadline is None else ticket.deadline - time.monotonic()
+            if not ticket.event.wait(timeout):
+                if not self._withdraw(ticket, keep_slot=True):
+                    raise self._expired()
+        started_at = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(started_at)
+
+    @contextlib.asynccontextmanager
+    async def admit_async(
+        self, priority: int = Priority.INTERACTIVE, deadline: Optional[float] = None
+    ):
+        """`admit` for coroutines: waits for a slot without blocking the loop."""
+        with self._lock:
+            ticket = self._enter(priority, deadline, asyncio.get_running_loop())
+        if ticket is not None:
+            timeout = None if deadline is None else ticket.deadline - time.monotonic()
+            try:
+                await asyncio.wait_for(asyncio.shield(ticket.future), timeout)
+            except asyncio.TimeoutError:
+                if not self._withdraw(ticket, keep_slot=True):
+                    raise self._expired()
+            except asyncio.CancelledError:
+                self._withdraw(ticket, keep_slot=False)
+                raise
+        started_at = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(started_at)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """
+        Runs in flight and queued (per priority), admissions, rejections by
+        reason and rejection rate, average run duration and wait percentiles.
+        """
+        with self._lock:
+            queued = {priority.name.lower(): 0 for priority in Priority}
+            for priority, _, ticket in self._queue:
+                if not ticket.cancelled:
+                    name = _priority_name(priority)
+                    queued[name] = queued.get(name, 0) + 1
+            rejected = sum(self.rejected.values())
+            waits = list(self._waits)
+            return {
+                "in_flight": self.in_flight,
+                "queued": queued,
+                "admitted": self.admitted,
+                "rejected": dict(self.rejected),
+                "rejection_rate": rejected / ((self.admitted + rejected) or 1),
+                "service_time": self.service_time,
+                "p50_wait": percentile(waits, 50),
+                "p95_wait": percentile(waits, 95),
+            }
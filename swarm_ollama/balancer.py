@@ -0,0 +1,737 @@
+import asyncio
+import hashlib
+import itertools
+import queue
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from httpx import ConnectError, TimeoutException
+from ollama._types import ResponseError
+
+from .hedging import HedgePolicy, LatencyHistogram
+from .logging import setup_logging
+from .pool import LoopLocalAsyncClient, PoolConfig, get_client
+from .retry import CircuitOpenError, RetryPolicy
+
+logger = setup_logging(__name__)
+
+
+def _is_connect_error(e: Exception) -> bool:
+    # ollama reports httpx.ConnectError as a plain ConnectionError
+    return isinstance(e, (ConnectError, ConnectionError))
+
+
+def _is_node_failure(e: Exception) -> bool:
+    """Whether an error says the node is unhealthy, rather than the request bad."""
+    if isinstance(e, ResponseError):
+        return e.status_code >= 500
+    return isinstance(e, (ConnectError, TimeoutException, ConnectionError))
+
+
+def _collect(chunks, first):
+    """
+    Fold a streamed chat response back into a single response.
+    """
+    content = []
+    tool_calls = []
+    last = first
+    for chunk in itertools.chain([first], chunks):
+        content.append(chunk.message.content or "")
+        tool_calls.extend(chunk.message.tool_calls or [])
+        last = chunk
+    message = last.message.model_copy(
+        update={"content": "".join(content), "tool_calls": tool_calls or None}
+    )
+    return last.model_copy(update={"message": message})
+
+
+_NO_CHUNK = object()
+
+
+class _BackendStream:
+    """
+    A streamed response of one node, releasing the node exactly once: as a
+    success once exhausted, as a failure if it raises, and without touching
+    the node's health if the consumer closes it early.
+    """
+
+    def __init__(self, balancer, backend, chunks, model, first=_NO_CHUNK, retry=None):
+        self._balancer = balancer
+        self._backend = backend
+        self._chunks = chunks
+        self._model = model
+        self._first = first
+        self._retry = retry
+        self._released = False
+
+    def _finish(self, error: Optional[Exception] = None, abandoned=False) -> None:
+        if self._released:
+            return
+        self._released = True
+        if abandoned:
+            self._balancer._abandon(self._backend, self._retry)
+        else:
+            self._balancer._release(self._backend, error, self._model, self._retry)
+
+    def __iter__(self):
+        try:
+            if self._first is not _NO_CHUNK:
+                yield self._first
+            for chunk in self._chunks:
+                yield chunk
+        except GeneratorExit:
+            self.close()
+            raise
+        except Exception as e:
+            self._finish(e)
+            raise
+        self._finish()
+
+    def close(self) -> None:
+        """Abort the request on the node and release it. Idempotent."""
+        try:
+            close = getattr(self._chunks, "close", None)
+            if close is not None and not self._released:
+                close()
+        finally:
+            self._finish(abandoned=True)
+
+
+class _AsyncBackendStream(_BackendStream):
+    """`_BackendStream` over an async chunk iterator."""
+
+    def __iter__(self):
+        raise TypeError("Async streams must be consumed with `async for`.")
+
+    async def __aiter__(self):
+        try:
+            if self._first is not _NO_CHUNK:
+                yield self._first
+            async for chunk in self._chunks:
+                yield chunk
+        except GeneratorExit:
+            await self.aclose()
+            raise
+        except Exception as e:
+            self._finish(e)
+            raise
+        self._finish()
+
+    def close(self) -> None:
+        """
+        Release the node without awaiting; the request on the node is aborted
+        from the running event loop, if any. Prefer `aclose`. Idempotent.
+        """
+        try:
+            aclose = getattr(self._chunks, "aclose", None)
+            if aclose is not None and not self._released:
+                try:
+                    loop = asyncio.get_running_loop()
+                except RuntimeError:
+                    pass
+                else:
+                    self._closing = loop.create_task(aclose())
+        finally:
+            self._finish(abandoned=True)
+
+    async def aclose(self) -> None:
+        """Abort the request on the node and release it. Idempotent."""
+        try:
+            aclose = getattr(self._chunks, "aclose", None)
+            if aclose is not None and not self._released:
+                await aclose()
+        finally:
+            self._finish(abandoned=True)
+
+
+class _Race:
+    """First chunks of the attempts of a hedged request, until one wins."""
+
+    def __init__(self):
+        self.results = queue.Queue()
+        self._lock = threading.Lock()
+        self._decided = False
+
+    def offer(self, result) -> bool:
+        with self._lock:
+            if self._decided:
+                return False
+            self.results.put(result)
+            return True
+
+    def decide(self) -> List[tuple]:
+        """Stop accepting results; returns the ones that arrived too late."""
+        with self._lock:
+            self._decided = True
+        late = []
+        while not self.results.empty():
+            late.append(self.results.get_nowait())
+        return late
+
+
+class Backend:
+    """
+    One Ollama node behind a `BalancedClient`.
+
+    Attributes:
+        host (str): The node URL.
+        client: The pooled Ollama client for the node.
+        outstanding (int): Requests sent and not yet finished.
+        failures (int): Consecutive node failures.
+        ejected_until (float): Monotonic time until which the node is skipped.
+        models (set): Models the node served recently, hence likely loaded.
+        latency (LatencyHistogram): Recent times to first chunk of hedged requests.
+    """
+
+    def __init__(self, host: str, client):
+        self.host = host
+        self.client = client
+        self.outstanding = 0
+        self.failures = 0
+        self.ejected_until = 0.0
+        self.models = set()
+        self.requests = 0
+        self.errors = 0
+        self.latency = LatencyHistogram()
+
+    def available(self, now: float) -> bool:
+        return self.ejected_until <= now
+
+
+class BalancedClient:
+    """
+    An `ollama.Client` look-alike spreading requests over several Ollama nodes.
+
+    Each `chat` goes to the available node with the fewest outstanding requests,
+    favouring nodes that recently served the same model. Follow-up turns of a
+    conversation (same model and first message) stick to the node that served
+    the previous turn. A node failing `eject_after` times in a row is ejected
+    for `eject_for` seconds; `check_health` probes nodes actively. Requests that
+    could not connect fail over to another node.
+
+    With a `HedgePolicy`, requests are streamed internally and, if the first
+    chunk is late, duplicated to another node; the first node to answer wins
+    and the other request is closed.
+
+    With a `RetryPolicy`, each node also has a circuit breaker keyed by its URL:
+    nodes with an open circuit are skipped, and the outcome of every request,
+    streamed or not, is recorded on its node's breaker. `OllamaWrapper` hands
+    its policy to the balanced client it wraps.
+
+    Other client methods (`embed`, `generate`, `ps`, ...) are forwarded to the
+    least loaded available node.
+
+    Args:
+        hosts (List[str]): The Ollama node URLs.
+        pool (PoolConfig, optional): Connection pool settings of each node.
+        eject_after (int): Consecutive failures before a node is ejected.
+        eject_for (float): Seconds an ejected node is skipped.
+        sticky_ttl (float): Seconds a conversation stays bound to its node.
+        max_sessions (int): Maximum number of sticky bindings kept.
+        hedge (HedgePolicy, optional): Hedge slow requests. Off by default.
+        retry (RetryPolicy, optional): Source of the per-node circuit breakers,
+            unless a request brings its own with `chat(..., retry=policy)`.
+    """
+
+    _get_client = staticmethod(get_client)
+
+    def __init__(
+        self,
+        hosts: List[str],
+        pool: Optional[PoolConfig] = None,
+        eject_after: int = 3,
+        eject_for: float = 30.0,
+        sticky_ttl: float = 600.0,
+        max_sessions: int = 10000,
+        hedge: Optional[HedgePolicy] = None,
+        retry: Optional[RetryPolicy] = None,
+    ):
+        if not hosts:
+            raise ValueError("BalancedClient needs at least one host.")
+        self.backends = [Backend(host, self._get_client(host, pool)) for host in hosts]
+        self.eject_after = eject_after
+        self.eject_for = eject_for
+        self.sticky_ttl = sticky_ttl
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()  # session key -> (backend, expires at)
+        self._lock = threading.Lock()
+        self._health_thread = None
+        self._health_task = None
+        self.hedge = hedge
+        self.retry = retry
+        self.hedged_requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    @staticmethod
+    def session_key(model: str, messages: List[Dict[str, Any]]) -> Optional[str]:
+        """
+        Identify a conversation by its model and first non-system message.
+        """
+        first = next((m for m in messages if m.get("role") != "system"), None)
+        if first is None:
+            return None
+        digest = hashlib.sha1(
+            f"{model}\0{first.get('role')}\0{first.get('content')}".encode("utf-8")
+        )
+        return digest.hexdigest()
+
+    def _pick(
+        self,
+        model: Optional[str] = None,
+        session: Optional[str] = None,
+        exclude=(),
+        reserve: bool = True,
+        retry: Optional[RetryPolicy] = None,
+    ):
+        """
+        Choose a node. With `reserve`, the node's circuit breaker in `retry`
+        must let the request through, and the request is counted as outstanding on the node
+        until `_release` or `_abandon`. Raises `CircuitOpenError` if every node
+        not excluded has an open circuit.
+        """
+        now = time.monotonic()
+        with self._lock:
+            while True:
+                backend = self._choose(model, session, exclude, now)
+                if not reserve:
+                    return backend
+                try:
+                    if retry is not None:
+                        retry.breaker(backend.host).allow()
+                except CircuitOpenError:
+                    exclude = [*exclude, backend]
+                    if len(set(exclude)) >= len(self.backends):
+                        raise
+                    continue
+                return self._acquire(backend, session, now)
+
+    def _choose(self, model, session, exclude, now: float) -> Backend:
+        if session is not None:
+            bound = self._sessions.get(session)
+            if bound and bound[1] > now and bound[0].available(now):
+                if bound[0] not in exclude:
+                    self._sessions.move_to_end(session)
+                    return bound[0]
+
+        candidates = [b for b in self.backends if b.available(now) and b not in exclude]
+        if not candidates:
+            # everything is ejected: try the node that comes back first
+            remaining = [b for b in self.backends if b not in exclude]
+            candidates = [
+                min(remaining or self.backends, key=lambda b: b.ejected_until)
+            ]
+        return min(
+            candidates,
+            key=lambda b: b.outstanding - (1 if model in b.models else 0),
+        )
+
+    def _acquire(self, backend: Backend, session: Optional[str], now: float) -> Backend:
+        backend.outstanding += 1
+        backend.requests += 1
+        if session is not None:
+            self._sessions[session] = (backend, now + self.sticky_ttl)
+            self._sessions.move_to_end(session)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return backend
+
+    def _release(
+        self,
+        backend: Backend,
+        error: Optional[Exception],
+        model=None,
+        retry: Optional[RetryPolicy] = None,
+    ):
+        if retry is not None:
+            retry.breaker(backend.host).record(error)
+        with self._lock:
+            backend.outstanding -= 1
+            if error is None:
+                backend.failures = 0
+                if model:
+                    backend.models.add(model)
+                return
+            backend.errors += 1
+            if not _is_node_failure(error):
+                return
+            backend.failures += 1
+            if backend.failures >= self.eject_after:
+                backend.ejected_until = time.monotonic() + self.eject_for
+                backend.models.clear()
+                logger.warning(
+                    "Ejecting Ollama node %s for %ss after %s failures: %s",
+                    backend.host,
+                    self.eject_for,
+                    backend.failures,
+                    error,
+                )
+
+    def _abandon(self, backend: Backend, retry: Optional[RetryPolicy] = None) -> None:
+        """Release a backend whose request was given up, e.g. lost a hedging race."""
+        if retry is not None:
+            retry.breaker(backend.host).release_probe()
+        with self._lock:
+            backend.outstanding -= 1
+
+    def _may_hedge(self, tried: List[Backend]) -> bool:
+        with self._lock:
+            if len(tried) >= len(self.backends):
+                return False
+            if self.hedges >= self.hedge.max_ratio * self.hedged_requests:
+                return False
+            self.hedges += 1
+            return True
+
+    _stream_class = _BackendStream
+
+    def chat(
+        self,
+        model: str = "",
+        messages=None,
+        stream: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        **kwargs,
+    ):
+        """
+        Send a chat request to a node; other arguments are those of Ollama's
+        `chat`. `retry` supplies the circuit breakers of this request in place
+        of the client's own.
+        """
+        messages = messages or []
+        session = self.session_key(model, messages)
+        retry = retry or self.retry
+        if self.hedge is not None and len(self.backends) > 1:
+            return self._hedged_chat(model, messages, stream, session, kwargs, retry)
+        tried = []
+        while True:
+            backend = self._pick(model, session, exclude=tried, retry=retry)
+            try:
+                response = backend.client.chat(
+                    model=model, messages=messages, stream=stream, **kwargs
+                )
+            except Exception as e:
+                self._release(backend, e, retry=retry)
+                tried.append(backend)
+                # the request never reached the node, so another one can take it
+                if _is_connect_error(e) and len(tried) < len(self.backends):
+                    continue
+                raise
+            if stream:
+                return self._stream_class(self, backend, response, model, retry=retry)
+            self._release(backend, None, model, retry)
+            return response
+
+    def _first_chunk(
+        self, backend, model, messages, kwargs, race: _Race, retry
+    ) -> None:
+        start = time.perf_counter()
+        try:
+            stream = backend.client.chat(
+                model=model, messages=messages, stream=True, **kwargs
+            )
+            first = next(stream)
+        except Exception as e:
+            self._release(backend, e, retry=retry)
+            race.offer((backend, None, None, e))
+            return
+        backend.latency.record(time.perf_counter() - start)
+        if not race.offer((backend, stream, first, None)):
+            # lost the race; closing the stream aborts the request on the node
+            stream.close()
+            self._abandon(backend, retry)
+
+    def _hedged_chat(self, model, messages, stream, session, kwargs, retry):
+        race = _Race()
+        tried = []
+
+        def launch() -> bool:
+            # False when every other node's circuit is open
+            try:
+                backend = self._pick(model, session, exclude=tried, retry=retry)
+            except CircuitOpenError:
+                if not tried:
+                    raise
+                return False
+            tried.append(backend)
+            threading.Thread(
+                target=self._first_chunk,
+                args=(backend, model, messages, kwargs, race, retry),
+                name="swarm-hedge",
+                daemon=True,
+            ).start()
+            return True
+
+        with self._lock:
+            self.hedged_requests += 1
+        launch()
+        delay = self.hedge.delay(tried[0].latency)
+        pending, error = 1, None
+        while True:
+            try:
+                result = race.results.get(timeout=delay)
+            except queue.Empty:
+                # the first chunk is late: send a duplicate to another node
+                if self._may_hedge(tried) and launch():
+                    pending += 1
+                delay = None
+                continue
+            pending -= 1
+            backend, chunks, first, attempt_error = result
+            if attempt_error is None:
+                break
+            error = error or attempt_error
+            if pending:
+                continue
+            if _is_connect_error(attempt_error) and len(tried) < len(self.backends):
+                if launch():
+                    pending += 1
+                    continue
+            raise error
+
+        for late_backend, late_stream, _, late_error in race.decide():
+            if late_error is None:
+                late_stream.close()
+                self._abandon(late_backend, retry)
+        if backend is not tried[0]:
+            with self._lock:
+                self.hedge_wins += 1
+        if stream:
+            return self._stream_class(self, backend, chunks, model, first, retry)
+        rest = self._stream_class(self, backend, chunks, model, retry=retry)
+        return _collect(rest, first)
+
+    def _probe(self, backend: Backend, error: Optional[Exception]) -> None:
+        with self._lock:
+            if error is None:
+                backend.failures = 0
+                backend.ejected_until = 0.0
+            elif _is_node_failure(error):
+                backend.failures = max(backend.failures, self.eject_after)
+                backend.ejected_until = time.monotonic() + self.eject_for
+
+    def check_health(self) -> Dict[str, bool]:
+        """
+        Probe every node with `ps`, ejecting unreachable nodes and restoring
+        the ones that answer. Returns the health of each host.
+        """
+        health = {}
+        for backend in self.backends:
+            try:
+                loaded = backend.client.ps()
+            except Exception as e:
+                self._probe(backend, e)
+                health[backend.host] = False
+                continue
+            self._probe(backend, None)
+            with self._lock:
+                backend.models = {m["model"] for m in loaded.get("models") or []}
+            health[backend.host] = True
+        return health
+
+    def start_health_checks(self, interval: float = 10.0) -> None:
+        """Run `check_health` every `interval` seconds in a daemon thread."""
+        if self._health_thread is not None:
+            return
+
+        def loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.check_health()
+                except Exception:
+                    logger.exception("Ollama health check failed")
+
+        self._health_thread = threading.Thread(
+            target=loop, name="swarm-health-check", daemon=True
+        )
+        self._health_thread.start()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "host": b.host,
+                    "available": b.available(now),
+                    "outstanding": b.outstanding,
+                    "requests": b.requests,
+                    "errors": b.errors,
+                    "consecutive_failures": b.failures,
+                    "models": sorted(b.models),
+                    "first_chunk_latency": b.latency.summary(),
+                }
+                for b in self.backends
+            ]
+
+    def __getattr__(self, name):
+        """
+        Forward other Ollama client methods to the least loaded node.
+        """
+        if name.startswith("_") or name == "backends":
+            raise AttributeError(name)
+        # only routing: the call's outcome is not seen, so health is left alone
+        return getattr(self._pick(reserve=False).client, name)
+
+
+class AsyncBalancedClient(BalancedClient):
+    """
+    `BalancedClient` over `ollama.AsyncClient`s, for `AsyncSwarm`.
+    """
+
+    _get_client = LoopLocalAsyncClient
+
+    _stream_class = _AsyncBackendStream
+
+    async def chat(
+        self,
+        model: str = "",
+        messages=None,
+        stream: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        **kwargs,
+    ):
+        messages = messages or []
+        session = self.session_key(model, messages)
+        retry = retry or self.retry
+        if self.hedge is not None and len(self.backends) > 1:
+            return await self._hedged_chat(
+                model, messages, stream, session, kwargs, retry
+            )
+        tried = []
+        while True:
+            backend = self._pick(model, session, exclude=tried, retry=retry)
+            try:
+                response = await backend.client.chat(
+                    model=model, messages=messages, stream=stream, **kwargs
+                )
+            except Exception as e:
+                self._release(backend, e, retry=retry)
+                tried.append(backend)
+                if _is_connect_error(e) and len(tried) < len(self.backends):
+                    continue
+                raise
+            if stream:
+                return self._stream_class(self, backend, response, model, retry=retry)
+            self._release(backend, None, model, retry)
+            return response
+
+    async def _first_chunk(self, backend, model, messages, kwargs, retry):
+        start = time.perf_counter()
+        chunks = None
+        try:
+            chunks = await backend.client.chat(
+                model=model, messages=messages, stream=True, **kwargs
+            )
+            first = await chunks.__anext__()
+        except asyncio.CancelledError:
+            # lost the race; closing the stream aborts the request on the node
+            if chunks is not None:
+                await chunks.aclose()
+            self._abandon(backend, retry)
+            raise
+        except Exception as e:
+            self._release(backend, e, retry=retry)
+            raise
+        backend.latency.record(time.perf_counter() - start)
+        return chunks, first
+
+    async def _hedged_chat(self, model, messages, stream, session, kwargs, retry):
+        attempts = {}
+        tried = []
+
+        def launch() -> bool:
+            # False when every other node's circuit is open
+            try:
+                backend = self._pick(model, session, exclude=tried, retry=retry)
+            except CircuitOpenError:
+                if not tried:
+                    raise
+                return False
+            tried.append(backend)
+            task = asyncio.ensure_future(
+                self._first_chunk(backend, model, messages, kwargs, retry)
+            )
+            attempts[task] = backend
+            return True
+
+        with self._lock:
+            self.hedged_requests += 1
+        launch()
+        delay = self.hedge.delay(tried[0].latency)
+        winner, error = None, None
+        try:
+            while winner is None:
+                done, _ = await asyncio.wait(
+                    attempts, timeout=delay, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    # the first chunk is late: send a duplicate to another node
+                    if self._may_hedge(tried):
+                        launch()
+                    delay = None
+                    continue
+                for task in done:
+                    backend = attempts.pop(task)
+                    if task.exception() is not None:
+                        error = error or task.exception()
+                    elif winner is None:
+                        winner = backend, task.result()
+                    else:
+                        chunks, _ = task.result()
+                        await chunks.aclose()
+                        self._abandon(backend, retry)
+                if winner is not None or attempts:
+                    continue
+                if _is_connect_error(error) and len(tried) < len(self.backends):
+                    if launch():
+                        continue
+                raise error
+        finally:
+            for task in attempts:
+                task.cancel()
+
+        backend, (chunks, first) = winner
+        if backend is not tried[0]:
+            with self._lock:
+                self.hedge_wins += 1
+        if stream:
+            return self._stream_class(self, backend, chunks, model, first, retry)
+        rest = self._stream_class(self, backend, chunks, model, retry=retry)
+        return _collect([chunk async for chunk in rest], first)
+
+    async def check_health(self) -> Dict[str, bool]:
+        health = {}
+        for backend in self.backends:
+            try:
+                loaded = await backend.client.ps()
+            except Exception as e:
+                self._probe(backend, e)
+                health[backend.host] = False
+                continue
+            self._probe(backend, None)
+            with self._lock:
+                backend.models = {m["model"] for m in loaded.get("models") or []}
+            health[backend.host] = True
+        return health
+
+    def start_health_checks(self, interval: float = 10.0) -> "asyncio.Task":
+        """
+        Run `check_health` every `interval` seconds in a task on the running
+        event loop. Returns the task; cancel it to stop the checks.
+        """
+        if self._health_task is not None and not self._health_task.done():
+            return self._health_task
+
+        async def loop():
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    await self.check_health()
+                except Exception:
+                    logger.exception("Ollama health check failed")
+
+        self._health_task = asyncio.get_running_loop().create_task(loop())
+        return self._health_task
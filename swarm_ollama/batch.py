@@ -0,0 +1,281 @@
+import asyncio
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .types import Agent, Response
+from .util import debug_print, percentile
+
+
+@dataclass
+class BatchResult:
+    """
+    The outcome of one job of a `run_many` batch.
+
+    Attributes:
+        index (int): Position of the job in the input iterable.
+        response (Response): The run response, if the job succeeded.
+        error (BaseException): The exception raised by the job, if any. Timed out
+            jobs carry a `TimeoutError`.
+        latency (float): Seconds between the job being started and finishing.
+    """
+
+    index: int
+    response: Optional[Response] = None
+    error: Optional[BaseException] = None
+    latency: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BatchStats:
+    """
+    Aggregate throughput and latency of a `run_many` batch.
+    """
+
+    succeeded: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    elapsed: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+
+    @property
+    def completed(self) -> int:
+        return self.succeeded + self.failed + self.timed_out
+
+    @property
+    def throughput(self) -> float:
+        """Completed jobs per second."""
+        return self.completed / self.elapsed if self.elapsed else 0.0
+
+    def record(self, result: BatchResult) -> None:
+        if result.ok:
+            self.succeeded += 1
+        elif isinstance(result.error, TimeoutError):
+            self.timed_out += 1
+        else:
+            self.failed += 1
+        self.latencies.append(result.latency)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "completed": self.completed,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "elapsed_s": round(self.elapsed, 3),
+            "throughput_per_s": round(self.throughput, 3),
+            "latency_p50_s": round(percentile(self.latencies, 50), 3),
+            "latency_p95_s": round(percentile(self.latencies, 95), 3),
+            "latency_p99_s": round(percentile(self.latencies, 99), 3),
+        }
+
+
+def normalize_job(job) -> Dict[str, Any]:
+    """
+    Turn a job into `run` keyword arguments.
+
+    A job is either a dict of `run` arguments, or an `(agent, messages)` or
+    `(agent, messages, context_variables)` tuple.
+    """
+    if isinstance(job, dict):
+        return dict(job)
+    if isinstance(job, Agent):
+        raise TypeError("A run_many job needs at least an agent and messages.")
+    agent, messages, *rest = job
+    kwargs = {"agent": agent, "messages": messages}
+    if rest:
+        kwargs["context_variables"] = rest[0] or {}
+    return kwargs
+
+
+class _OrderedEmitter:
+    """Releases results either as they complete or in job order."""
+
+    def __init__(self, ordered: bool):
+        self.ordered = ordered
+        self.buffer = {}
+        self.next_index = 0
+
+    def push(self, result: BatchResult) -> List[BatchResult]:
+        if not self.ordered:
+            return [result]
+        self.buffer[result.index] = result
+        released = []
+        while self.next_index in self.buffer:
+            released.append(self.buffer.pop(self.next_index))
+            self.next_index += 1
+        return released
+
+
+class BatchRun:
+    """
+    Iterate over the `BatchResult`s of many independent `Swarm.run` calls.
+
+    At most `max_concurrency` runs execute at once, each on a worker thread.
+    A job exceeding `timeout` is reported as failed with a `TimeoutError`; its
+    thread cannot be interrupted, so its slot is only reused once it returns.
+    `stats` is filled in as results are produced.
+    """
+
+    def __init__(
+        self,
+        run: Callable[..., Response],
+        jobs: Iterable,
+        max_concurrency: int = 8,
+        timeout: Optional[float] = None,
+        ordered: bool = False,
+        debug: bool = False,
+        run_kwargs: Optional[Dict[str, Any]] = None,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.run = run
+        self.jobs = jobs
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.ordered = ordered
+        self.debug = debug
+        self.run_kwargs = run_kwargs or {}
+        self.stats = BatchStats()
+
+    def _run_job(self, job) -> Response:
+        return self.run(**{**self.run_kwargs, **normalize_job(job)})
+
+    def __iter__(self):
+        started_at = time.monotonic()
+        emitter = _OrderedEmitter(self.ordered)
+        jobs = enumerate(self.jobs)
+        exhausted = False
+        in_flight = {}  # future -> (index, start time)
+        abandoned = set()  # timed out futures still holding a worker
+        executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="swarm-batch"
+        )
+
+        def finish(result):
+            self.stats.record(result)
+            self.stats.elapsed = time.monotonic() - started_at
+            return emitter.push(result)
+
+        try:
+            while True:
+                while not exhausted and len(in_flight) < self.max_concurrency:
+                    try:
+                        index, job = next(jobs)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    future = executor.submit(self._run_job, job)
+                    in_flight[future] = (index, time.monotonic())
+
+                live = [f for f in in_flight if f not in abandoned]
+                if not live and exhausted:
+                    break
+
+                wait_timeout = None
+                if self.timeout is not None and live:
+                    oldest = min(in_flight[f][1] for f in live)
+                    wait_timeout = max(0.0, oldest + self.timeout - time.monotonic())
+                done, _ = wait(
+                    in_flight, timeout=wait_timeout, return_when=FIRST_COMPLETED
+                )
+
+                released = []
+                now = time.monotonic()
+                for future in done:
+                    index, start = in_flight.pop(future)
+                    if future in abandoned:
+                        abandoned.discard(future)
+                        continue
+                    error = future.exception()
+                    released += finish(
+                        BatchResult(
+                            index=index,
+                            response=None if error else future.result(),
+                            error=error,
+                            latency=now - start,
+                        )
+                    )
+                if self.timeout is not None:
+                    for future, (index, start) in in_flight.items():
+                        if future in abandoned or now - start < self.timeout:
+                            continue
+                        abandoned.add(future)
+                        released += finish(
+                            BatchResult(
+                                index=index,
+                                error=TimeoutError(
+                                    f"Job {index} timed out after {self.timeout}s"
+                                ),
+                                latency=now - start,
+                            )
+                        )
+                yield from released
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            debug_print(self.debug, "Batch finished:", self.stats.summary())
+
+
+class AsyncBatchRun(BatchRun):
+    """
+    Async-iterate over the `BatchResult`s of many independent `AsyncSwarm.run` calls.
+
+    Runs are tasks on the current event loop, so a timed out job is cancelled.
+    """
+
+    def __iter__(self):
+        raise TypeError("AsyncBatchRun must be consumed with `async for`.")
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _run_job(self, index: int, job) -> BatchResult:
+        start = time.monotonic()
+        try:
+            response = await asyncio.wait_for(
+                self.run(**{**self.run_kwargs, **normalize_job(job)}), self.timeout
+            )
+        except asyncio.TimeoutError:
+            error = TimeoutError(f"Job {index} timed out after {self.timeout}s")
+            return BatchResult(index, error=error, latency=time.monotonic() - start)
+        except Exception as e:
+            return BatchResult(index, error=e, latency=time.monotonic() - start)
+        return BatchResult(index, response=response, latency=time.monotonic() - start)
+
+    async def _iterate(self):
+        started_at = time.monotonic()
+        emitter = _OrderedEmitter(self.ordered)
+        jobs = enumerate(self.jobs)
+        exhausted = False
+        in_flight = set()
+
+        try:
+            while True:
+                while not exhausted and len(in_flight) < self.max_concurrency:
+                    try:
+                        index, job = next(jobs)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    in_flight.add(asyncio.ensure_future(self._run_job(index, job)))
+                if not in_flight:
+                    break
+
+                done, in_flight = await asyncio.wait(
+                    in_flight, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    result = task.result()
+                    self.stats.record(result)
+                    self.stats.elapsed = time.monotonic() - started_at
+                    for released in emitter.push(result):
+                        yield released
+        finally:
+            for task in in_flight:
+                task.cancel()
+            debug_print(self.debug, "Batch finished:", self.stats.summary())
@@ -0,0 +1,328 @@
+"""
+A local stand-in for the Ollama HTTP API, for benchmarks and integration tests.
+
+Serves `/api/chat` (streaming NDJSON and non-streaming), `/api/generate`,
+`/api/embed`, `/api/tags`, `/api/ps` and `/api/version` with synthetic answers
+and configurable latencies, so the framework can be measured end to end
+without a model.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class FakeModelConfig:
+    """
+    How the fake server answers chat requests.
+
+    Attributes:
+        response_tokens (int): Tokens in each text answer.
+        token_latency (float): Seconds per generated token.
+        prompt_eval_delay (float): Seconds before the first token.
+        tool_calls (int): Tool calls answered to requests offering tools,
+            unless the last message is a tool result. 0 answers text, unless
+            the last message names offered tools in backticks: those are
+            called, as a model would when told to.
+        embedding_size (int): Dimension of `/api/embed` vectors.
+    """
+
+    response_tokens: int = 20
+    token_latency: float = 0.0
+    prompt_eval_delay: float = 0.0
+    tool_calls: int = 0
+    embedding_size: int = 64
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _prompt_tokens(messages: List[dict]) -> int:
+    # roughly four characters per token
+    return sum(len(m.get("content") or "") for m in messages) // 4 + len(messages)
+
+
+def _embedding(text: str, size: int) -> List[float]:
+    digest = hashlib.sha256(text.encode()).digest()
+    return [digest[i % len(digest)] / 255.0 for i in range(size)]
+
+
+def _named_tools(tools: List[dict], message: dict) -> List[dict]:
+    content = message.get("content") or ""
+    return [tool for tool in tools if f"`{tool['function']['name']}`" in content]
+
+
+def _tool_calls(tools: List[dict], count: int) -> List[dict]:
+    calls = []
+    for i in range(count):
+        function = tools[i % len(tools)]["function"]
+        required = function.get("parameters", {}).get("required", [])
+        calls.append(
+            {
+                "function": {
+                    "name": function["name"],
+                    "arguments": {name: "x" for name in required},
+                }
+            }
+        )
+    return calls
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # headers and body are separate writes: don't let Nagle hold the body back
+    disable_nagle_algorithm = True
+    server: "_Server"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("content-length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _send_json(self, payload: Any, status: int = 200) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_chunk(self, payload: Any) -> None:
+        data = json.dumps(payload).encode() + b"\n"
+        self.wfile.write(b"%X\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def do_GET(self):
+        fake = self.server.fake
+        if self.path == "/api/tags":
+            models = [{"name": m, "model": m} for m in sorted(fake.loaded)]
+            self._send_json({"models": models})
+        elif self.path == "/api/ps":
+            self._send_json(
+                {"models": [{"name": m, "model": m} for m in sorted(fake.loaded)]}
+            )
+        elif self.path == "/api/version":
+            self._send_json({"version": "0.0.0-fake"})
+        else:
+            self._send_json({"error": "not found"}, 404)
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("content-length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        fake = self.server.fake
+        request = self._read_json()
+        fake.requests += 1
+        if self.path == "/api/chat":
+            if fake.recorded is not None:
+                fake.recorded.append(request)
+            self._chat(fake, request)
+        elif self.path == "/api/generate":
+            fake.loaded.add(request.get("model", ""))
+            self._send_json(
+                {
+                    "model": request.get("model"),
+                    "created_at": _now(),
+                    "response": "",
+                    "done": True,
+                }
+            )
+        elif self.path == "/api/embed":
+            inputs = request.get("input") or []
+            if isinstance(inputs, str):
+                inputs = [inputs]
+            size = fake.config.embedding_size
+            self._send_json(
+                {
+                    "model": request.get("model"),
+                    "embeddings": [_embedding(text, size) for text in inputs],
+                }
+            )
+        else:
+            self._send_json({"error": "not found"}, 404)
+
+    def _chat(self, fake: "FakeOllamaServer", request: Dict[str, Any]) -> None:
+        config = fake.config
+        model = request.get("model", "")
+        messages = request.get("messages") or []
+        tools = request.get("tools") or []
+        fake.loaded.add(model)
+        prompt_tokens = _prompt_tokens(messages)
+
+        tool_calls = []
+        if tools and messages and messages[-1].get("role") != "tool":
+            named = _named_tools(tools, messages[-1])
+            if named:
+                tool_calls = _tool_calls(named, len(named))
+            elif config.tool_calls:
+                tool_calls = _tool_calls(tools, config.tool_calls)
+        tokens = 0 if tool_calls else config.response_tokens
+
+        started = time.perf_counter()
+        if config.prompt_eval_delay:
+            time.sleep(config.prompt_eval_delay)
+        prompt_done = time.perf_counter()
+
+        def final(message: Dict[str, Any]) -> Dict[str, Any]:
+            end = time.perf_counter()
+            return {
+                "model": model,
+                "created_at": _now(),
+                "message": message,
+                "done": True,
+                "done_reason": "stop",
+                "total_duration": int((end - started) * 1e9),
+                "load_duration": 0,
+                "prompt_eval_count": prompt_tokens,
+                "prompt_eval_duration": int((prompt_done - started) * 1e9),
+                "eval_count": tokens,
+                "eval_duration": int((end - prompt_done) * 1e9),
+            }
+
+        if not request.get("stream", True):
+            if config.token_latency:
+                time.sleep(config.token_latency * tokens)
+            message = {"role": "assistant", "content": "tok " * tokens}
+            if tool_calls:
+                message["tool_calls"] = tool_calls
+            self._send_json(final(message))
+            return
+
+        self.send_response(200)
+        self.send_header("content-type", "application/x-ndjson")
+        self.send_header("transfer-encoding", "chunked")
+        self.end_headers()
+        for _ in range(tokens):
+            if config.token_latency:
+                time.sleep(config.token_latency)
+            self._send_chunk(
+                {
+                    "model": model,
+                    "created_at": _now(),
+                    "message": {"role": "assistant", "content": "tok "},
+                    "done": False,
+                }
+            )
+        if tool_calls:
+            self._send_chunk(
+                {
+                    "model": model,
+                    "created_at": _now(),
+                    "message": {
+                        "role": "assistant",
+                        "content": "",
+                        "tool_calls": tool_calls,
+                    },
+                    "done": False,
+                }
+            )
+        self._send_chunk(final({"role": "assistant", "content": ""}))
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+    fake: "FakeOllamaServer"
+
+
+class FakeOllamaServer:
+    """
+    A fake Ollama server on a local port, run from a background thread.
+
+    Use it as a context manager, and point clients at `url`:
+
+        with FakeOllamaServer(FakeModelConfig(token_latency=0.01)) as server:
+            client = Swarm(base_url=server.url)
+
+    Args:
+        config (FakeModelConfig, optional): How chat requests are answered; may
+            be replaced between requests.
+        host (str): Interface to listen on.
+        port (int): Port to listen on; 0 picks a free one.
+    """
+
+    def __init__(
+        self,
+        config: Optional[FakeModelConfig] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.config = config or FakeModelConfig()
+        self.loaded = set()
+        self.requests = 0
+        # set to a list to keep the body of every chat request
+        self.recorded: Optional[List[Dict[str, Any]]] = None
+        self._server = _Server((host, port), _Handler)
+        self._server.fake = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeOllamaServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name="fake-ollama",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeOllamaServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--response-tokens", type=int, default=20)
+    parser.add_argument("--token-latency", type=float, default=0.0)
+    parser.add_argument("--prompt-eval-delay", type=float, default=0.0)
+    parser.add_argument("--tool-calls", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    config = FakeModelConfig(
+        response_tokens=args.response_tokens,
+        token_latency=args.token_latency,
+        prompt_eval_delay=args.prompt_eval_delay,
+        tool_calls=args.tool_calls,
+    )
+    server = FakeOllamaServer(config, port=args.port)
+    print(f"Fake Ollama listening on {server.url}", flush=True)
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
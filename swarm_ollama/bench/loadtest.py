@@ -0,0 +1,330 @@
+"""
+Load test: concurrent synthetic multi-turn sessions through `Swarm`.
+
+Each session talks to a triage agent for a number of turns. A turn asks for a
+tool call or a handoff with the configured probabilities, by naming the tool
+in the user message: the fake server always complies, a real model usually
+does. Reports throughput, turn latency and time to first token percentiles,
+client CPU per turn and errors.
+
+Run with `python -m swarm_ollama.bench [--url URL] [--sessions N] ...`; without
+`--url`, a fake server is started in a subprocess so its CPU is not counted.
+"""
+
+import argparse
+import json
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+from ..core import Swarm
+from ..pool import PoolConfig
+from ..types import Agent
+from ..util import percentile
+
+_WORDS = "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod "
+
+
+@dataclass
+class LoadTestConfig:
+    """
+    Shape of the synthetic load.
+
+    Attributes:
+        sessions (int): Sessions run concurrently.
+        turns (int): User turns per session.
+        tool_probability (float): Chance a turn asks for a tool call.
+        handoff_probability (float): Chance a turn asks for a handoff.
+        message_chars (int): Mean size of user messages; sizes vary ±50%.
+        model (str): Model of the agents.
+        stream (bool): Use `run_and_stream` rather than `run`.
+        seed (int, optional): Seed of the session dice, for repeatable loads.
+    """
+
+    sessions: int = 8
+    turns: int = 5
+    tool_probability: float = 0.3
+    handoff_probability: float = 0.1
+    message_chars: int = 200
+    model: str = "llama3.2:3b"
+    stream: bool = True
+    seed: Optional[int] = None
+
+
+@dataclass
+class LoadTestReport:
+    """
+    Measurements of a load test. Times are in seconds.
+
+    Attributes:
+        config (LoadTestConfig): The load that was run.
+        elapsed (float): Wall time of the whole test.
+        cpu_time (float): Process CPU time used by the test.
+        latencies (list): Wall time of each successful turn.
+        time_to_first_token (list): Per successful turn that measured it.
+        completion_tokens (int): Generated over the test.
+        tool_calls (int): Agent functions run.
+        handoffs (int): Turns that ended with another agent.
+        errors (Counter): Failed turns by exception type.
+    """
+
+    config: LoadTestConfig
+    elapsed: float = 0.0
+    cpu_time: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+    time_to_first_token: List[float] = field(default_factory=list)
+    completion_tokens: int = 0
+    tool_calls: int = 0
+    handoffs: int = 0
+    errors: Counter = field(default_factory=Counter)
+
+    @property
+    def turns(self) -> int:
+        return len(self.latencies) + sum(self.errors.values())
+
+    @property
+    def error_rate(self) -> float:
+        return sum(self.errors.values()) / self.turns if self.turns else 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Successful turns per second."""
+        return len(self.latencies) / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def cpu_per_turn(self) -> float:
+        return self.cpu_time / self.turns if self.turns else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        def distribution(values):
+            return {
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "p99": percentile(values, 99),
+                "max": max(values, default=0.0),
+            }
+
+        return {
+            "config": asdict(self.config),
+            "turns": self.turns,
+            "elapsed": self.elapsed,
+            "throughput": self.throughput,
+            "tokens_per_second": (
+                self.completion_tokens / self.elapsed if self.elapsed else 0.0
+            ),
+            "latency": distribution(self.latencies),
+            "time_to_first_token": distribution(self.time_to_first_token),
+            "cpu_per_turn": self.cpu_per_turn,
+            "tool_calls": self.tool_calls,
+            "handoffs": self.handoffs,
+            "error_rate": self.error_rate,
+            "errors": dict(self.errors),
+        }
+
+
+def _triage_agent(model: str) -> Agent:
+    def lookup(query: str) -> str:
+        """Look up `query` in the knowledge base."""
+        return f"{query}: nothing found"
+
+    def transfer_to_support():
+        """Hand the conversation to support."""
+        return support
+
+    def transfer_to_triage():
+        """Hand the conversation back to triage."""
+        return triage
+
+    triage = Agent(
+        name="Triage",
+        model=model,
+        instructions="Answer briefly, or hand off to support.",
+        functions=[lookup, transfer_to_support],
+    )
+    support = Agent(
+        name="Support",
+        model=model,
+        instructions="Answer briefly, or hand back to triage.",
+        functions=[lookup, transfer_to_triage],
+    )
+    return triage
+
+
+def _user_message(rng: random.Random, config: LoadTestConfig, agent: Agent) -> dict:
+    size = max(1, int(config.message_chars * rng.uniform(0.5, 1.5)))
+    text = (_WORDS * (size // len(_WORDS) + 1))[:size]
+    roll = rng.random()
+    if roll < config.handoff_probability:
+        transfer = next(f for f in agent.functions if f.__name__.startswith("transfer"))
+        text = f"Call `{transfer.__name__}`. {text}"
+    elif roll < config.handoff_probability + config.tool_probability:
+        text = f"Call `lookup`. {text}"
+    return {"role": "user", "content": text}
+
+
+class _Recorder:
+    def __init__(self, report: LoadTestReport):
+        self.report = report
+        self.lock = threading.Lock()
+
+    def turn(self, latency: float, response, handoff: bool) -> None:
+        usage = response.usage
+        with self.lock:
+            self.report.latencies.append(latency)
+            # unknown when neither streamed nor timed by Ollama
+            if usage.turns and usage.turns[0].time_to_first_token is not None:
+                self.report.time_to_first_token.append(
+                    usage.turns[0].time_to_first_token
+                )
+            self.report.completion_tokens += usage.completion_tokens
+            self.report.tool_calls += sum(
+                1 for m in response.messages if m.get("role") == "tool"
+            )
+            self.report.handoffs += handoff
+
+    def error(self, error: BaseException) -> None:
+        with self.lock:
+            self.report.errors[type(error).__name__] += 1
+
+
+def _session(swarm: Swarm, config: LoadTestConfig, seed: int, recorder) -> None:
+    rng = random.Random(seed)
+    agent = _triage_agent(config.model)
+    history = []
+    for _ in range(config.turns):
+        messages = history + [_user_message(rng, config, agent)]
+        started = time.perf_counter()
+        try:
+            if config.stream:
+                response = None
+                for chunk in swarm.run_and_stream(agent, messages):
+                    if "response" in chunk:
+                        response = chunk["response"]
+            else:
+                response = swarm.run(agent, messages)
+        except Exception as e:
+            recorder.error(e)
+            continue
+        handoff = response.agent.name != agent.name
+        recorder.turn(time.perf_counter() - started, response, handoff)
+        history = messages + response.messages
+        agent = response.agent
+
+
+def run_load_test(url: str, config: LoadTestConfig) -> LoadTestReport:
+    """Run `config.sessions` concurrent sessions against the Ollama at `url`."""
+    pool = PoolConfig(
+        max_connections=max(100, config.sessions),
+        max_keepalive_connections=config.sessions,
+    )
+    swarm = Swarm(base_url=url, pool=pool)
+    seeds = random.Random(config.seed)
+    report = LoadTestReport(config)
+    recorder = _Recorder(report)
+
+    cpu_started, started = time.process_time(), time.perf_counter()
+    with ThreadPoolExecutor(
+        max_workers=config.sessions, thread_name_prefix="swarm-load"
+    ) as executor:
+        futures = [
+            executor.submit(_session, swarm, config, seeds.random(), recorder)
+            for _ in range(config.sessions)
+        ]
+        for future in futures:
+            future.result()
+    report.elapsed = time.perf_counter() - started
+    report.cpu_time = time.process_time() - cpu_started
+    return report
+
+
+@contextmanager
+def fake_server(response_tokens: int = 20, token_latency: float = 0.0) -> Iterator[str]:
+    """Run `bench.fake_server` in a subprocess and yield its URL."""
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "swarm_ollama.bench.fake_server",
+            "--port",
+            "0",
+            "--response-tokens",
+            str(response_tokens),
+            "--token-latency",
+            str(token_latency),
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        line = process.stdout.readline()
+        if not line:
+            raise RuntimeError("The fake Ollama server failed to start")
+        yield line.split()[-1]
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def _print(report: LoadTestReport) -> None:
+    summary = report.summary()
+
+    def ms(values):
+        return "  ".join(
+            f"{key} {value * 1e3:8.1f} ms" for key, value in values.items()
+        )
+
+    print(f"turns        {summary['turns']} in {summary['elapsed']:.2f} s")
+    print(f"throughput   {summary['throughput']:.1f} turns/s")
+    print(f"tokens       {summary['tokens_per_second']:.1f} tokens/s")
+    print(f"latency      {ms(summary['latency'])}")
+    print(f"ttft         {ms(summary['time_to_first_token'])}")
+    print(f"client cpu   {summary['cpu_per_turn'] * 1e3:.2f} ms/turn")
+    print(f"tool calls   {summary['tool_calls']}, handoffs {summary['handoffs']}")
+    print(f"errors       {summary['error_rate']:.2%} {summary['errors'] or ''}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="Ollama to load (default: a fake server)")
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--tool-probability", type=float, default=0.3)
+    parser.add_argument("--handoff-probability", type=float, default=0.1)
+    parser.add_argument("--message-chars", type=int, default=200)
+    parser.add_argument("--model", default="llama3.2:3b")
+    parser.add_argument("--no-stream", action="store_true")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--response-tokens", type=int, default=20, help="fake server")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="fake server")
+    parser.add_argument("--json", help="also write the summary to this file")
+    args = parser.parse_args(argv)
+
+    config = LoadTestConfig(
+        sessions=args.sessions,
+        turns=args.turns,
+        tool_probability=args.tool_probability,
+        handoff_probability=args.handoff_probability,
+        message_chars=args.message_chars,
+        model=args.model,
+        stream=not args.no_stream,
+        seed=args.seed,
+    )
+    if args.url:
+        report = run_load_test(args.url, config)
+    else:
+        with fake_server(args.response_tokens, args.token_latency) as url:
+            report = run_load_test(url, config)
+
+    _print(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report.summary(), f, indent=2)
+            f.write("\n")
+    return 1 if report.errors else 0
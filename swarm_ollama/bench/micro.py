@@ -0,0 +1,396 @@
+"""
+Microbenchmarks for Swarm's per-turn and per-chunk hot paths.
+
+Run with `python -m swarm_ollama.bench.micro [name ...]`. `--save FILE` stores
+the samples as a baseline; `--compare FILE` reruns the benchmarks against one
+and exits with status 1 on a significant slowdown. Baselines are timed relative
+to a reference workload, so they are comparable across runs and, roughly,
+across machines.
+"""
+
+import argparse
+import json
+import platform
+import random
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..core import Swarm
+from ..types import ChatCompletionMessageToolCall, Function
+from ..util import (
+    MessageAccumulator,
+    delta_to_dict,
+    function_to_json,
+    merge_chunk,
+    percentile,
+)
+from ..wrapper import OllamaWrapper, _ChunkTranslator
+
+# name -> setup function returning (operation, units of work per operation, unit)
+BENCHMARKS: Dict[str, Callable[[], Tuple[Callable[[], None], int, str]]] = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark setup function under `name`."""
+
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+def _ollama_stream(n_chunks: int = 200, n_tool_calls: int = 1) -> List[dict]:
+    chunks = [
+        {"message": {"role": "assistant", "content": f"token{i} "}, "done": False}
+        for i in range(n_chunks)
+    ]
+    chunks.append(
+        {
+            "message": {
+                "role": "assistant",
+                "content": "",
+                "tool_calls": [
+                    {"function": {"name": f"tool_{i}", "arguments": {"q": "x" * 64}}}
+                    for i in range(n_tool_calls)
+                ],
+            },
+            "done": False,
+        }
+    )
+    chunks.append({"message": {"role": "assistant", "content": ""}, "done": True})
+    return chunks
+
+
+@benchmark("stream_chunks_legacy")
+def _stream_chunks_legacy():
+    """Per-chunk handling as run_and_stream used to do it: JSON round trip + merge_chunk."""
+    chunks = _ollama_stream()
+
+    def op():
+        translator = _ChunkTranslator()
+        message = {
+            "content": "",
+            "sender": "Agent",
+            "role": "assistant",
+            "function_call": None,
+            "tool_calls": defaultdict(
+                lambda: {
+                    "function": {"arguments": "", "name": ""},
+                    "id": "",
+                    "type": "",
+                }
+            ),
+        }
+        for chunk in chunks:
+            delta = json.loads(translator.translate(chunk).choices[0].delta.json())
+            if delta["role"] == "assistant":
+                delta["sender"] = "Agent"
+            delta.pop("role", None)
+            delta.pop("sender", None)
+            merge_chunk(message, delta)
+        message["tool_calls"] = list(message["tool_calls"].values()) or None
+
+    return op, len(chunks), "chunk"
+
+
+@benchmark("stream_chunks")
+def _stream_chunks():
+    """Per-chunk handling in run_and_stream: plain dict deltas + MessageAccumulator."""
+    chunks = _ollama_stream()
+
+    def op():
+        translator = _ChunkTranslator()
+        accumulator = MessageAccumulator()
+        for chunk in chunks:
+            delta = delta_to_dict(translator.translate(chunk).choices[0].delta)
+            if delta.get("role") == "assistant":
+                delta["sender"] = "Agent"
+            accumulator.add(delta)
+        accumulator.build(sender="Agent")
+
+    return op, len(chunks), "chunk"
+
+
+@benchmark("merge_chunk")
+def _merge_chunk():
+    """Folding streamed deltas into a message with `util.merge_chunk`."""
+    deltas = [{"role": "assistant", "content": f"token{i} "} for i in range(200)]
+    deltas.append(
+        {
+            "tool_calls": [
+                {
+                    "index": 0,
+                    "id": "call_0",
+                    "type": "function",
+                    "function": {"name": "lookup", "arguments": '{"q": "x"}'},
+                }
+            ]
+        }
+    )
+
+    def op():
+        message = {
+            "content": "",
+            "tool_calls": defaultdict(
+                lambda: {
+                    "function": {"arguments": "", "name": ""},
+                    "id": "",
+                    "type": "",
+                }
+            ),
+        }
+        for delta in deltas:
+            # merge_chunk consumes "role" and the tool call "index"
+            delta = dict(delta)
+            if "tool_calls" in delta:
+                delta["tool_calls"] = [dict(t) for t in delta["tool_calls"]]
+            merge_chunk(message, delta)
+
+    return op, len(deltas), "chunk"
+
+
+def _tool_function(a: str, b: int, c: float = 1.0, d: bool = False, e: list = None):
+    """A tool with a handful of typed parameters."""
+    return f"{a}{b}"
+
+
+@benchmark("function_to_json")
+def _function_to_json():
+    """Schema generation for an agent function."""
+    return lambda: function_to_json(_tool_function), 1, "function"
+
+
+def _lookup(query: str) -> str:
+    return query
+
+
+@benchmark("handle_tool_calls")
+def _handle_tool_calls():
+    """Swarm.handle_tool_calls dispatching serial calls to a trivial function."""
+    swarm = Swarm(client=OllamaWrapper(object()))
+    tool_calls = [
+        ChatCompletionMessageToolCall(
+            id=f"call_{i}",
+            type="function",
+            function=Function(name="_lookup", arguments=f'{{"query": "q{i}"}}'),
+        )
+        for i in range(4)
+    ]
+    functions = [_lookup, _tool_function]
+
+    def op():
+        swarm.handle_tool_calls(tool_calls, functions, {}, debug=False)
+
+    return op, len(tool_calls), "call"
+
+
+class _CannedClient:
+    """An Ollama client answering every chat with the same message."""
+
+    def __init__(self, response: dict):
+        self.response = response
+
+    def chat(self, **kwargs):
+        return self.response
+
+
+@benchmark("create_translation")
+def _create_translation():
+    """ChatCompletions.create translating a 50-message request and its reply."""
+    wrapper = OllamaWrapper(
+        _CannedClient(
+            {
+                "model": "llama3.2:3b",
+                "message": {"role": "assistant", "content": "Hello " * 50},
+                "done": True,
+            }
+        )
+    )
+    messages = [{"role": "system", "content": "You are a benchmark."}]
+    messages += [
+        {"role": ("user", "assistant")[i % 2], "content": "lorem ipsum " * 20}
+        for i in range(49)
+    ]
+    tools = tuple(function_to_json(f) for f in (_lookup, _tool_function))
+
+    def op():
+        wrapper.chat.completions.create(
+            model="llama3.2:3b", messages=messages, tools=tools
+        )
+
+    return op, 1, "request"
+
+
+def _reference():
+    """A fixed workload of dict, string and JSON operations, like Swarm's own."""
+    items = {f"key{i}": {"content": "x" * (i % 7), "n": i} for i in range(200)}
+    json.dumps(items)
+    return sorted(items, key=lambda key: items[key]["n"])
+
+
+def _reference_time(number: int = 50) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        _reference()
+    return (time.perf_counter() - start) / number
+
+
+def run_benchmark(
+    name: str, repeat: int = 7, min_time: float = 0.2, relative: bool = False
+) -> List[float]:
+    """
+    Time benchmark `name` and return `repeat` samples, in seconds per unit of work.
+
+    Each sample loops the operation for at least `min_time` seconds. With
+    `relative`, samples are instead divided by the time of a reference workload
+    measured around them: that cancels most of the machine's speed changes
+    (frequency scaling, noisy neighbours), so runs can be compared.
+    """
+    op, units, _ = BENCHMARKS[name]()
+    op()  # warm up
+
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            op()
+        if time.perf_counter() - start >= min_time / 10:
+            break
+        number *= 2
+    number = max(1, int(number * min_time / max(time.perf_counter() - start, 1e-9)))
+
+    samples = []
+    for _ in range(repeat):
+        reference = _reference_time() if relative else 0.0
+        start = time.perf_counter()
+        for _ in range(number):
+            op()
+        sample = (time.perf_counter() - start) / (number * units)
+        if relative:
+            sample /= (reference + _reference_time()) / 2
+        samples.append(sample)
+    return samples
+
+
+def median_interval(
+    samples: List[float], confidence: float = 0.95, resamples: int = 1000
+) -> Tuple[float, float]:
+    """Bootstrap confidence interval of the median of `samples`."""
+    rng = random.Random(0)  # deterministic: the same samples give the same interval
+    medians = [
+        percentile(rng.choices(samples, k=len(samples)), 50) for _ in range(resamples)
+    ]
+    tail = (1 - confidence) / 2 * 100
+    return percentile(medians, tail), percentile(medians, 100 - tail)
+
+
+def summarize(samples: List[float], unit: str) -> Dict[str, Any]:
+    low, high = median_interval(samples)
+    return {
+        "unit": unit,
+        "median": percentile(samples, 50),
+        "low": low,
+        "high": high,
+        "samples": samples,
+    }
+
+
+def compare(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.1
+) -> str:
+    """
+    Compare two `summarize` results: "slower" or "faster" when the medians
+    differ by more than `threshold` (a fraction) and their confidence
+    intervals do not overlap, "same" otherwise.
+    """
+    change = current["median"] / baseline["median"] - 1
+    if change > threshold and current["low"] > baseline["high"]:
+        return "slower"
+    if change < -threshold and current["high"] < baseline["low"]:
+        return "faster"
+    return "same"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("names", nargs="*", help="benchmarks to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument(
+        "--save", metavar="FILE", help="write the results as a baseline"
+    )
+    parser.add_argument(
+        "--compare", metavar="FILE", help="fail on slowdowns against a baseline"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="smallest slowdown reported, as a fraction (default: 0.1)",
+    )
+    args = parser.parse_args(argv)
+
+    baseline: Optional[Dict[str, Any]] = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["benchmarks"]
+
+    relative = bool(args.save or args.compare)
+    results = {}
+    regressions = []
+    for name in args.names or BENCHMARKS:
+        samples = run_benchmark(name, repeat=args.repeat, relative=relative)
+        unit = BENCHMARKS[name]()[2]
+        if not relative:
+            print(f"{name:<28} {percentile(samples, 50) * 1e9:>10.0f} ns/{unit}")
+            continue
+
+        result = results[name] = summarize(samples, unit)
+        line = f"{name:<28} {result['median']:>10.3f} x reference/{unit}"
+        before = baseline.get(name) if baseline is not None else None
+        if before is not None:
+            verdict = compare(before, result, args.threshold)
+            if verdict == "slower":
+                # a burst of noise can still skew one run: confirm
+                samples = run_benchmark(name, repeat=args.repeat, relative=True)
+                result = results[name] = summarize(samples, unit)
+                verdict = compare(before, result, args.threshold)
+            if verdict == "slower":
+                regressions.append(name)
+            change = result["median"] / before["median"] - 1
+            line = (
+                f"{name:<28} {change:>+7.1%}"
+                f"  [{result['low'] / before['median'] - 1:+.1%},"
+                f" {result['high'] / before['median'] - 1:+.1%}]  {verdict}"
+            )
+        elif baseline is not None:
+            line += "  (not in baseline)"
+        print(line, flush=True)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "schema": 1,
+                    "environment": {
+                        "python": platform.python_version(),
+                        "implementation": platform.python_implementation(),
+                        "machine": platform.machine(),
+                    },
+                    "repeat": args.repeat,
+                    "unit": "reference",
+                    "benchmarks": results,
+                },
+                f,
+                indent=2,
+            )
+            f.write("\n")
+    if regressions:
+        print(f"Significantly slower than the baseline: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
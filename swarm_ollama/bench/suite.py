@@ -0,0 +1,347 @@
+"""
+End-to-end benchmarks of Swarm against a local fake Ollama server.
+
+Each case times a Swarm operation (`run`, `run_and_stream`, the wrapper's
+`create`, tool dispatch, `run_many`) and a baseline replaying the very same
+`/api/chat` requests with a bare `ollama.Client`; the difference is the
+framework's overhead. Results are written as JSON, to keep as baselines.
+
+Run with `python -m swarm_ollama.bench.suite [--output FILE] [name ...]`.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from importlib import metadata
+from typing import Any, Callable, Dict, List, Optional
+
+import ollama
+
+from ..core import Swarm
+from ..types import Agent
+from ..util import percentile
+from .fake_server import FakeModelConfig, FakeOllamaServer
+
+SCHEMA_VERSION = 1
+
+HISTORY_LENGTHS = (1, 100, 1000)
+TOOL_COUNTS = (0, 16)
+PARALLEL_TOOL_CALLS = (1, 8)
+CONCURRENCY = (1, 8, 32)
+BATCH_JOBS = 64
+
+# keys of a recorded `/api/chat` body that `ollama.Client.chat` accepts
+_CHAT_KEYS = ("model", "messages", "tools", "stream", "format", "options", "keep_alive")
+
+
+@dataclass
+class Case:
+    """
+    One benchmark case.
+
+    Attributes:
+        name (str): The scenario (`run`, `stream`, `wrapper`, `tools`, `batch`).
+        params (dict): What varies within the scenario.
+        config (FakeModelConfig): How the fake server answers.
+        setup (callable): Takes the server URL, returns the timed operation.
+        units (int): Runs per operation, for throughput.
+        concurrency (int): Requests the baseline sends at once.
+    """
+
+    name: str
+    params: Dict[str, Any]
+    config: FakeModelConfig
+    setup: Callable[[str], Callable[[], Any]]
+    units: int = 1
+    concurrency: int = 1
+
+    @property
+    def id(self) -> str:
+        params = ",".join(f"{key}={value}" for key, value in self.params.items())
+        return f"{self.name}[{params}]"
+
+
+@dataclass
+class CaseResult:
+    """Timings of a case, in seconds per operation."""
+
+    case: Case
+    samples: List[float]
+    baseline: List[float] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        median = percentile(self.samples, 50)
+        baseline = percentile(self.baseline, 50) if self.baseline else None
+        return {
+            "id": self.case.id,
+            "name": self.case.name,
+            "params": self.case.params,
+            "iterations": len(self.samples),
+            "median": median,
+            "p95": percentile(self.samples, 95),
+            "mean": statistics.fmean(self.samples),
+            "min": min(self.samples),
+            "baseline_median": baseline,
+            "overhead": None if baseline is None else median - baseline,
+            "throughput": self.case.units / median if median else None,
+        }
+
+
+def _history(length: int) -> List[dict]:
+    roles = ("user", "assistant")
+    messages = [
+        {"role": roles[i % 2], "content": f"message {i} " + "lorem ipsum " * 16}
+        for i in range(length - 1)
+    ]
+    # end on a user turn
+    if messages and messages[-1]["role"] == "user":
+        messages.append({"role": "assistant", "content": "ok"})
+    messages.append({"role": "user", "content": "What is the answer?"})
+    return messages
+
+
+def _tool(index: int):
+    def tool(query: str) -> str:
+        return f"result {index} for {query}"
+
+    tool.__name__ = f"lookup_{index}"
+    tool.__doc__ = f"Look up `query` in source {index}."
+    return tool
+
+
+def _agent(tools: int = 0) -> Agent:
+    return Agent(
+        name="Bench",
+        instructions="You are a benchmark.",
+        functions=[_tool(i) for i in range(tools)],
+    )
+
+
+def _run(url: str, tools: int, history: int) -> Callable[[], Any]:
+    swarm = Swarm(base_url=url)
+    agent, messages = _agent(tools), _history(history)
+    return lambda: swarm.run(agent, messages)
+
+
+def _stream(url: str, history: int) -> Callable[[], Any]:
+    swarm = Swarm(base_url=url)
+    agent, messages = _agent(), _history(history)
+    return lambda: list(swarm.run_and_stream(agent, messages))
+
+
+def _wrapper(url: str, stream: bool, history: int) -> Callable[[], Any]:
+    swarm = Swarm(base_url=url)
+    messages = [{"role": "system", "content": "You are a benchmark."}]
+    messages += _history(history)
+
+    def op():
+        completion = swarm.client.chat.completions.create(
+            model=_agent().model, messages=messages, stream=stream
+        )
+        if stream:
+            for _ in completion:
+                pass
+
+    return op
+
+
+def _batch(url: str, concurrency: int) -> Callable[[], Any]:
+    swarm = Swarm(base_url=url)
+    agent = _agent()
+    jobs = [(agent, _history(1)) for _ in range(BATCH_JOBS)]
+
+    def op():
+        for result in swarm.run_many(jobs, max_concurrency=concurrency):
+            if result.error is not None:
+                raise result.error
+
+    return op
+
+
+def cases() -> List[Case]:
+    """The benchmark grid."""
+    grid = []
+    for history in HISTORY_LENGTHS:
+        for tools in TOOL_COUNTS:
+            grid.append(
+                Case(
+                    "run",
+                    {"history": history, "tools": tools},
+                    FakeModelConfig(),
+                    lambda url, t=tools, h=history: _run(url, t, h),
+                )
+            )
+    for history in HISTORY_LENGTHS:
+        grid.append(
+            Case(
+                "stream",
+                {"history": history, "tokens": 100},
+                FakeModelConfig(response_tokens=100),
+                lambda url, h=history: _stream(url, h),
+            )
+        )
+    for stream in (False, True):
+        grid.append(
+            Case(
+                "wrapper",
+                {"history": 100, "stream": stream},
+                FakeModelConfig(response_tokens=100),
+                lambda url, s=stream: _wrapper(url, s, 100),
+            )
+        )
+    for calls in PARALLEL_TOOL_CALLS:
+        grid.append(
+            Case(
+                "tools",
+                {"history": 10, "tools": 8, "tool_calls": calls},
+                FakeModelConfig(tool_calls=calls),
+                lambda url: _run(url, 8, 10),
+            )
+        )
+    for concurrency in CONCURRENCY:
+        grid.append(
+            Case(
+                "batch",
+                {"jobs": BATCH_JOBS, "concurrency": concurrency},
+                FakeModelConfig(),
+                lambda url, c=concurrency: _batch(url, c),
+                units=BATCH_JOBS,
+                concurrency=concurrency,
+            )
+        )
+    return grid
+
+
+def _replay(url: str, bodies: List[dict], concurrency: int) -> Callable[[], Any]:
+    """Send recorded `/api/chat` bodies with a bare Ollama client."""
+    client = ollama.Client(host=url)
+    requests = [{k: body[k] for k in _CHAT_KEYS if k in body} for body in bodies]
+
+    def send(request):
+        response = client.chat(**request)
+        if request.get("stream"):
+            for _ in response:
+                pass
+
+    if concurrency == 1:
+        return lambda: [send(request) for request in requests]
+
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    return lambda: list(executor.map(send, requests))
+
+
+def _time(op: Callable[[], Any], iterations: int, warmup: int) -> List[float]:
+    for _ in range(warmup):
+        op()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        op()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def run_case(
+    case: Case, server: FakeOllamaServer, iterations: int = 20, warmup: int = 2
+) -> CaseResult:
+    """Time `case` and its bare-client baseline against `server`."""
+    server.config = case.config
+    op = case.setup(server.url)
+
+    # record the requests of one operation, for the baseline to replay
+    server.recorded = []
+    op()
+    bodies, server.recorded = server.recorded, None
+
+    samples = _time(op, iterations, warmup)
+    baseline = _time(_replay(server.url, bodies, case.concurrency), iterations, warmup)
+    return CaseResult(case, samples, baseline)
+
+
+def environment() -> Dict[str, Any]:
+    def version(package):
+        try:
+            return metadata.version(package)
+        except metadata.PackageNotFoundError:
+            return None
+
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "swarm_ollama": version("swarm-ollama"),
+        "ollama": version("ollama"),
+    }
+
+
+def run_suite(
+    names: Optional[List[str]] = None,
+    iterations: int = 20,
+    warmup: int = 2,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Run the cases whose name or id contains one of `names` (default: all)
+    against a fresh fake server, and return the machine-readable report.
+    """
+    selected = [
+        case for case in cases() if not names or any(name in case.id for name in names)
+    ]
+    results = []
+    with FakeOllamaServer() as server:
+        for case in selected:
+            result = run_case(case, server, iterations, warmup).to_dict()
+            results.append(result)
+            if progress is not None:
+                progress(result)
+    return {
+        "schema": SCHEMA_VERSION,
+        "suite": "swarm_ollama.bench.suite",
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": environment(),
+        "iterations": iterations,
+        "warmup": warmup,
+        "unit": "s",
+        "results": results,
+    }
+
+
+def _print(result: Dict[str, Any]) -> None:
+    overhead = result["overhead"]
+    print(
+        f"{result['id']:<44} {result['median'] * 1e3:>9.3f} ms"
+        f" {result['p95'] * 1e3:>9.3f} ms p95"
+        + ("" if overhead is None else f" {overhead * 1e3:>+9.3f} ms overhead"),
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("names", nargs="*", help="cases to run (default: all)")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.names, args.iterations, args.warmup, progress=_print)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
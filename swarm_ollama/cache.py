@@ -0,0 +1,157 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+def cache_key(request: Dict[str, Any]) -> str:
+    """
+    Return a canonical hash of a chat request.
+
+    The request is serialized with sorted keys and no insignificant whitespace,
+    so equal (model, messages, tools, options) requests share a key whatever the
+    dict ordering.
+    """
+    canonical = json.dumps(
+        request,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SQLiteCache:
+    """
+    On-disk tier of a `CompletionCache`, stored in a single SQLite table.
+
+    Args:
+        path (str): The database file. Created if missing.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS completions ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM completions WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completions (key, value, created_at) "
+                "VALUES (?, ?, ?)",
+                (key, value, time.time()),
+            )
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM completions")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CompletionCache:
+    """
+    Cache of non-streaming chat completions, keyed by `cache_key`.
+
+    Entries are kept as serialized JSON in an in-process LRU bounded by
+    `max_entries` and `max_bytes`, backed by an optional SQLite tier that
+    survives restarts. Every hit returns a fresh copy of the response.
+
+    Args:
+        max_entries (int): Maximum number of entries kept in memory.
+        max_bytes (int): Maximum total size of the entries kept in memory.
+        path (str, optional): SQLite file for the on-disk tier.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        path: Optional[str] = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk = SQLiteCache(path) if path else None
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _store(self, key: str, value: str) -> None:
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            if len(value) > self.max_bytes:
+                return
+            self._entries[key] = value
+            self._size += len(value)
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return json.loads(value)
+
+        value = self.disk.get(key) if self.disk else None
+        if value is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+            self.disk_hits += 1
+        self._store(key, value)
+        return json.loads(value)
+
+    def set(self, key: str, response: Dict[str, Any]) -> None:
+        value = json.dumps(response, ensure_ascii=False, default=str)
+        self._store(key, value)
+        if self.disk:
+            self.disk.set(key, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+        if self.disk:
+            self.disk.clear()
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._size,
+            }
@@ -1,16 +1,27 @@
 # Standard library imports
+import asyncio
 import copy
+import functools
+import inspect
 import json
+import time
 from collections import defaultdict
-from typing import List
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List
 
 # Package/library imports
-import ollama
 # from openai import OpenAI
 
 
 # Local imports
-from .util import function_to_json, debug_print, merge_chunk
+from .util import (
+    MessageAccumulator,
+    debug_print,
+    delta_to_dict,
+    run_coroutine_sync,
+    submit_coroutine,
+)
 from .types import (
     Agent,
     AgentFunction,
@@ -19,31 +30,341 @@ from .types import (
     Function,
     Response,
     Result,
+    TurnUsage,
+    Usage,
 )
+from .admission import AdmissionController, Priority
+from .balancer import AsyncBalancedClient, BalancedClient
+from .batch import AsyncBatchRun, BatchRun
+from .cache import CompletionCache
+from .hooks import RunHooks, SwarmHooks, as_hooks
+from .logging import StructuredLogger, setup_logging
+from .pool import LoopLocalAsyncClient, PoolConfig, get_client
+from .residency import AsyncModelResidency, ModelResidency, reachable_agents
+from .retry import RetryPolicy
+from .scheduler import ModelScheduler
+from .semantic_cache import SemanticCache
+from .sessions import Session, SessionStore
+from .tools import __CTX_VARS_NAME__, ToolSet, compile_tools
 from .wrapper import (
+    AsyncOllamaWrapper,
     OllamaWrapper,
 )
 
-__CTX_VARS_NAME__ = "context_variables"
+logger = setup_logging(__name__)
+log = StructuredLogger(logger)
+
+_MISSING_TOOL = object()
+
+
+def _debug(debug: bool, event: str, **fields) -> None:
+    """
+    Log a run event at debug level, serializing its payloads only if the record
+    is written. Runs started with `debug=True` print it instead.
+    """
+    if debug:
+        debug_print(True, log.render(event, **fields))
+    else:
+        log.debug(event, **fields)
+
+
+def _semantic_cache_failed(e: Exception) -> None:
+    # the cache is only an optimisation: the run goes to the chat model instead
+    log.warning("Semantic cache lookup failed", error=repr(e))
+
+
+def _is_async_result(value) -> bool:
+    return inspect.isawaitable(value) or inspect.isasyncgen(value)
+
+
+async def _resolve_async_result(value):
+    """
+    Await a coroutine, or drain an async generator, returned by an agent function.
+
+    Items yielded by an async generator are concatenated into a single string,
+    unless the last item is a `Result` or an `Agent`, which is returned as is.
+    """
+    if inspect.isasyncgen(value):
+        items = [item async for item in value]
+        if items and isinstance(items[-1], (Result, Agent)):
+            return items[-1]
+        return "".join(map(str, items))
+    return await value
+
+
+def _turn_usage(
+    agent: Agent,
+    model_override: str,
+    completion,
+    started: float,
+    first_token_at: float = None,
+) -> TurnUsage:
+    """
+    Usage of one completion started at `started` (a `time.perf_counter()`),
+    from the counters the wrapped client reports.
+    """
+    wall_time = time.perf_counter() - started
+    counters = getattr(completion, "usage", None)
+    if not isinstance(counters, dict):
+        # OpenAI-shaped completions only count tokens
+        counters = {
+            "prompt_eval_count": getattr(counters, "prompt_tokens", None),
+            "eval_count": getattr(counters, "completion_tokens", None),
+        }
+        counters = {k: v for k, v in counters.items() if isinstance(v, int)}
+    ns = 1e9
+    usage = TurnUsage(
+        agent=agent.name,
+        model=model_override or agent.model,
+        prompt_tokens=counters.get("prompt_eval_count", 0),
+        completion_tokens=counters.get("eval_count", 0),
+        prompt_eval_duration=counters.get("prompt_eval_duration", 0) / ns,
+        eval_duration=counters.get("eval_duration", 0) / ns,
+        load_duration=counters.get("load_duration", 0) / ns,
+        total_duration=counters.get("total_duration", 0) / ns,
+        wall_time=wall_time,
+        cached=getattr(completion, "cached", False) is True,
+    )
+    if first_token_at is not None:
+        usage.time_to_first_token = first_token_at - started
+    elif "prompt_eval_duration" in counters:
+        usage.time_to_first_token = usage.load_duration + usage.prompt_eval_duration
+    return usage
+
+
+def _close_stream(completion) -> None:
+    close = getattr(completion, "close", None)
+    if close is not None:
+        close()
+
+
+async def _aclose_stream(completion) -> None:
+    aclose = getattr(completion, "aclose", None)
+    if aclose is not None:
+        await aclose()
+    else:
+        _close_stream(completion)
+
+
+def _invoke_hooked(run_hooks: RunHooks, tool_call, call):
+    with run_hooks.tool(tool_call) as scope:
+        scope.result = _invoke_sync(call[0].function, call[1])
+    return scope.result
+
+
+async def _hooked_tool(run_hooks: RunHooks, tool_call, awaitable):
+    with run_hooks.tool(tool_call) as scope:
+        scope.result = await awaitable
+    return scope.result
+
+
+def _invoke_sync(func, args: dict):
+    raw_result = func(**args)
+    if _is_async_result(raw_result):
+        raw_result = run_coroutine_sync(_resolve_async_result(raw_result))
+    return raw_result
+
+
+def _tool_call_objects(tool_calls: List[dict]) -> List[ChatCompletionMessageToolCall]:
+    """Tool calls of a streamed message, as the objects `handle_tool_calls` takes."""
+    return [
+        ChatCompletionMessageToolCall(
+            id=tool_call["id"],
+            function=Function(
+                arguments=tool_call["function"]["arguments"],
+                name=tool_call["function"]["name"],
+            ),
+            type=tool_call["type"],
+        )
+        for tool_call in tool_calls
+    ]
+
+
+class _Run:
+    """
+    State of one run, shared by the sync and async loops: the history, the
+    active agent, context variables and usage, updated turn by turn. The loops
+    only send the requests and call the tools.
+    """
+
+    def __init__(
+        self,
+        agent: Agent,
+        messages: List,
+        context_variables: dict,
+        model_override: str,
+        run_hooks: RunHooks = None,
+    ):
+        self.agent = agent
+        self.context_variables = copy.deepcopy(context_variables)
+        # runs only append to the history, so a shallow copy will do
+        self.history = list(messages)
+        self.init_len = len(messages)
+        self.model_override = model_override
+        self.hooks = run_hooks
+        self.usage = Usage()
+        self._accumulator = None
+        self._first_token_at = None
+
+    @property
+    def messages(self) -> List:
+        """The messages added by the run."""
+        return self.history[self.init_len :]
+
+    def turns_left(self, max_turns) -> bool:
+        return len(self.history) - self.init_len < max_turns
+
+    def start_turn(self) -> float:
+        """Start a turn; returns its start time."""
+        self._accumulator = None
+        self._first_token_at = None
+        if self.hooks:
+            self.hooks.turn_start(self.agent)
+        return time.perf_counter()
+
+    def completion_kwargs(self, stream: bool, debug: bool) -> dict:
+        """Arguments of `get_chat_completion` for the current turn."""
+        return {
+            "agent": self.agent,
+            "history": self.history,
+            "context_variables": self.context_variables,
+            "model_override": self.model_override,
+            "stream": stream,
+            "debug": debug,
+            "run_hooks": self.hooks,
+        }
+
+    def delta(self, chunk) -> dict:
+        """The delta of a streamed chunk, accumulated into the turn's message."""
+        if self._first_token_at is None:
+            self._first_token_at = time.perf_counter()
+            self._accumulator = MessageAccumulator()
+            if self.hooks:
+                self.hooks.first_token()
+        delta = delta_to_dict(chunk.choices[0].delta)
+        if delta.get("role") == "assistant":
+            delta["sender"] = self.agent.name
+        self._accumulator.add(delta)
+        return delta
+
+    def streamed_message(self) -> dict:
+        """The assistant message of a streamed turn."""
+        accumulator = self._accumulator or MessageAccumulator()
+        return accumulator.build(sender=self.agent.name)
+
+    def record(self, message: dict, completion, started: float, debug: bool):
+        """Add the turn's message to the history; returns the turn's usage."""
+        turn = _turn_usage(
+            self.agent, self.model_override, completion, started, self._first_token_at
+        )
+        self.usage.turns.append(turn)
+        _debug(debug, "Received completion", message=message)
+        self.history.append(message)
+        if self.hooks:
+            self.hooks.completion(message, turn)
+        return turn
+
+    def tool_kwargs(self, debug: bool) -> dict:
+        """Arguments of `handle_tool_calls`, besides the tool calls."""
+        return {
+            "functions": self.agent.functions,
+            "context_variables": self.context_variables,
+            "debug": debug,
+            "parallel": self.agent.parallel_tool_calls,
+            "run_hooks": self.hooks,
+        }
+
+    def apply_tools(self, partial_response: Response, turn, started: float) -> None:
+        """Add the tool results, updating context variables and switching agents."""
+        turn.tool_time = time.perf_counter() - started
+        self.history.extend(partial_response.messages)
+        self.context_variables.update(partial_response.context_variables)
+        if partial_response.agent:
+            if self.hooks:
+                self.hooks.handoff(self.agent, partial_response.agent)
+            self.agent = partial_response.agent
+
+    def finish(self) -> Response:
+        response = Response(
+            messages=self.messages,
+            agent=self.agent,
+            context_variables=self.context_variables,
+            usage=self.usage,
+        )
+        if self.hooks:
+            self.hooks.finish(response)
+        return response
 
 
 class Swarm:
-    def __init__(self, base_url="http://localhost:11434", client=None):
+    _residency_class = ModelResidency
+    _balanced_client_class = BalancedClient
+    # clients are shared per host and pool settings
+    _get_client = staticmethod(get_client)
+    _wrapper_class = OllamaWrapper
+
+    def __init__(
+        self,
+        base_url="http://localhost:11434",
+        client=None,
+        max_tool_workers: int = None,
+        cache: CompletionCache = None,
+        semantic_cache: SemanticCache = None,
+        pool: PoolConfig = None,
+        residency: ModelResidency = None,
+        scheduler: ModelScheduler = None,
+        retry: RetryPolicy = None,
+        admission: AdmissionController = None,
+        sessions: SessionStore = None,
+        hooks: SwarmHooks = None,
+    ):
+        # tool calls of agents with parallel_tool_calls share this pool
+        self.max_tool_workers = max_tool_workers
+        self._tool_executor = None
+        self.semantic_cache = semantic_cache
+        self.admission = admission
+        self.sessions = sessions
+        self.hooks = as_hooks(hooks)
         if not client:
             try:
-                ollama_client = ollama.Client(host=base_url)
-                wrapped_client = OllamaWrapper(ollama_client)
-                self.client = wrapped_client
+                if isinstance(base_url, (list, tuple)):
+                    ollama_client = self._balanced_client_class(base_url, pool=pool)
+                else:
+                    ollama_client = self._get_client(base_url, pool)
+                self.client = self._wrapper_class(
+                    ollama_client, cache=cache, scheduler=scheduler, retry=retry
+                )
             except Exception as e:
                 raise ConnectionError(
                     f"Failed to connect to Ollama at {base_url}. "
                     "Make sure Ollama is running and the URL is correct. "
                     f"Error: {str(e)}"
                 ) from e
+        elif not hasattr(getattr(client, "chat", None), "completions"):
+            # a raw Ollama-style client, such as a BalancedClient
+            self.client = self._wrapper_class(
+                client, cache=cache, scheduler=scheduler, retry=retry
+            )
         else:
             self.client = client
+        if semantic_cache is not None and semantic_cache.client is None:
+            semantic_cache.client = self.client
+        self.residency = residency or self._residency_class(self.client)
 
-    def get_chat_completion(
+    def warmup(
+        self,
+        agent: Agent = None,
+        models: Iterable[str] = (),
+        keep_alive=None,
+    ) -> Dict[str, float]:
+        """
+        Load `models`, and the model of every agent reachable by handoff from
+        `agent`, before the first request needs them. Returns the load time of
+        each model; see `self.residency` for load and eviction history.
+        """
+        return self.residency.warmup(agent, models, keep_alive)
+
+    def _build_create_params(
         self,
         agent: Agent,
         history: List,
@@ -51,7 +372,7 @@ class Swarm:
         model_override: str,
         stream: bool,
         debug: bool,
-    ) -> ChatCompletionMessage:
+    ) -> dict:
         context_variables = defaultdict(str, context_variables)
         instructions = (
             agent.instructions(context_variables)
@@ -59,15 +380,10 @@ class Swarm:
             else agent.instructions
         )
         messages = [{"role": "system", "content": instructions}] + history
-        debug_print(debug, "Getting chat completion for...:", messages)
+        _debug(debug, "Getting chat completion", agent=agent.name, messages=messages)
 
-        tools = [function_to_json(f) for f in agent.functions]
-        # hide context_variables from model
-        for tool in tools:
-            params = tool["function"]["parameters"]
-            params["properties"].pop(__CTX_VARS_NAME__, None)
-            if __CTX_VARS_NAME__ in params["required"]:
-                params["required"].remove(__CTX_VARS_NAME__)
+        # compiled once per function list, with context_variables already hidden
+        tools = compile_tools(agent.functions).schemas
 
         create_params = {
             "model": model_override or agent.model,
@@ -79,7 +395,107 @@ class Swarm:
 
         if tools:
             create_params["parallel_tool_calls"] = agent.parallel_tool_calls
+        if agent.keep_alive is not None:
+            create_params["keep_alive"] = agent.keep_alive
+
+        return create_params
+
+    def _admit(self, priority: int, deadline: float):
+        if self.admission is None:
+            return nullcontext()
+        return self.admission.admit(priority, deadline)
+
+    def _run_hooks(self, agent: Agent, messages: List):
+        """The `RunHooks` of a new run, or a no-op context without hooks."""
+        if self.hooks is None:
+            return nullcontext()
+        return RunHooks(self.hooks, agent, messages)
+
+    def _open_session(
+        self,
+        session_id: str,
+        agent: Agent,
+        messages: List,
+        new_messages: List,
+        context_variables: dict,
+    ):
+        """
+        Load a session for a run: the agent that answered last (if reachable
+        from `agent`), the stored history followed by the new messages, and the
+        stored context variables updated with `context_variables`.
+        """
+        if self.sessions is None:
+            raise ValueError("session_id requires a session store: pass sessions=.")
+        new_messages = list(
+            new_messages if new_messages is not None else messages or []
+        )
+        session = self.sessions.load(session_id) or Session(session_id)
+        if session.agent_name and session.agent_name != agent.name:
+            agent = next(
+                (a for a in reachable_agents(agent) if a.name == session.agent_name),
+                agent,
+            )
+        session.messages.extend(new_messages)
+        context_variables = {**session.context_variables, **context_variables}
+        return agent, session.messages, context_variables, new_messages
+
+    def _save_session(
+        self, session_id: str, new_messages: List, response: Response
+    ) -> None:
+        self.sessions.append(
+            session_id,
+            new_messages + response.messages,
+            response.agent.name if response.agent else None,
+            response.context_variables,
+        )
+
+    def _use_semantic_cache(
+        self, agent: Agent, messages: List, model_override: str
+    ) -> bool:
+        return (
+            self.semantic_cache is not None
+            and not model_override
+            and self.semantic_cache.eligible(agent, messages)
+        )
+
+    def _cached_response(
+        self,
+        agent: Agent,
+        messages: List,
+        context_variables: dict,
+        cached: dict,
+        debug: bool,
+    ) -> Response:
+        """The response of a run answered by the semantic cache."""
+        _debug(debug, "Semantic cache hit", agent=agent.name, message=cached)
+        response = Response(
+            messages=[cached],
+            agent=agent,
+            context_variables=copy.deepcopy(context_variables),
+            usage=Usage(
+                turns=[TurnUsage(agent=agent.name, model=agent.model, cached=True)]
+            ),
+        )
+        if self.hooks:
+            with self._run_hooks(agent, messages) as run_hooks:
+                run_hooks.finish(response)
+        return response
 
+    def get_chat_completion(
+        self,
+        agent: Agent,
+        history: List,
+        context_variables: dict,
+        model_override: str,
+        stream: bool,
+        debug: bool,
+        run_hooks: RunHooks = None,
+    ) -> ChatCompletionMessage:
+        create_params = self._build_create_params(
+            agent, history, context_variables, model_override, stream, debug
+        )
+        if run_hooks:
+            run_hooks.request_sent(create_params)
         return self.client.chat.completions.create(**create_params)
 
     def handle_function_result(self, result, debug) -> Result:
@@ -97,24 +513,58 @@ class Swarm:
                     return Result(value=str(result))
                 except Exception as e:
                     error_message = f"Failed to cast response to string: {result}. Make sure agent functions return a string or Result object. Error: {str(e)}"
-                    debug_print(debug, error_message)
+                    _debug(debug, "Failed to cast function result", error=str(e))
                     raise TypeError(error_message)
 
-    def handle_tool_calls(
+    def _get_tool_executor(self) -> ThreadPoolExecutor:
+        if self._tool_executor is None:
+            self._tool_executor = ThreadPoolExecutor(
+                max_workers=self.max_tool_workers, thread_name_prefix="swarm-tool"
+            )
+        return self._tool_executor
+
+    def _prepare_tool_call(
         self,
-        tool_calls: List[ChatCompletionMessageToolCall],
-        functions: List[AgentFunction],
+        tool_call: ChatCompletionMessageToolCall,
+        toolset: ToolSet,
         context_variables: dict,
         debug: bool,
+    ):
+        """
+        Resolve a tool call to `(ToolSpec, kwargs)`, or `None` if the tool is unknown.
+        """
+        name = tool_call.function.name
+        spec = toolset.by_name.get(name)
+        if spec is None:
+            _debug(debug, "Tool not found in function map", tool=name)
+            return None
+        args = json.loads(tool_call.function.arguments)
+        _debug(debug, "Processing tool call", tool=name, arguments=args)
+
+        # pass context_variables to agent functions
+        if spec.takes_context_variables:
+            args[__CTX_VARS_NAME__] = context_variables
+        return spec, args
+
+    def _merge_tool_results(
+        self,
+        tool_calls: List[ChatCompletionMessageToolCall],
+        raw_results: List,
+        debug: bool,
     ) -> Response:
-        function_map = {f.__name__: f for f in functions}
+        """
+        Fold raw tool results into a partial `Response`, in tool call order.
+
+        Tool messages keep the order of `tool_calls` regardless of completion
+        order; `context_variables` updates are applied in that same order (later
+        calls win on conflicting keys) and the last call returning an agent wins.
+        """
         partial_response = Response(messages=[], agent=None, context_variables={})
 
-        for tool_call in tool_calls:
+        for tool_call, raw_result in zip(tool_calls, raw_results):
             name = tool_call.function.name
             # handle missing tool case, skip to next tool
-            if name not in function_map:
-                debug_print(debug, f"Tool {name} not found in function map.")
+            if raw_result is _MISSING_TOOL:
                 partial_response.messages.append(
                     {
                         "role": "tool",
@@ -124,14 +574,6 @@ class Swarm:
                     }
                 )
                 continue
-            args = json.loads(tool_call.function.arguments)
-            debug_print(debug, f"Processing tool call: {name} with arguments {args}")
-
-            func = function_map[name]
-            # pass context_variables to agent functions
-            if __CTX_VARS_NAME__ in func.__code__.co_varnames:
-                args[__CTX_VARS_NAME__] = context_variables
-            raw_result = function_map[name](**args)
 
             result: Result = self.handle_function_result(raw_result, debug)
             partial_response.messages.append(
@@ -148,106 +590,402 @@ class Swarm:
 
         return partial_response
 
+    def handle_tool_calls(
+        self,
+        tool_calls: List[ChatCompletionMessageToolCall],
+        functions: List[AgentFunction],
+        context_variables: dict,
+        debug: bool,
+        parallel: bool = False,
+        run_hooks: RunHooks = None,
+    ) -> Response:
+        toolset = compile_tools(functions)
+        calls = [
+            self._prepare_tool_call(tool_call, toolset, context_variables, debug)
+            for tool_call in tool_calls
+        ]
+
+        if parallel and sum(call is not None for call in calls) > 1:
+            executor = self._get_tool_executor()
+            futures = []
+            for tool_call, call in zip(tool_calls, calls):
+                if call is None:
+                    futures.append(None)
+                    continue
+                spec, args = call
+                if spec.is_async:
+                    # coroutines run on the shared background loop, not a worker
+                    coroutine = _resolve_async_result(spec.function(**args))
+                    if run_hooks:
+                        coroutine = _hooked_tool(run_hooks, tool_call, coroutine)
+                    futures.append(submit_coroutine(coroutine))
+                elif run_hooks:
+                    futures.append(
+                        executor.submit(_invoke_hooked, run_hooks, tool_call, call)
+                    )
+                else:
+                    futures.append(executor.submit(_invoke_sync, spec.function, args))
+            raw_results = [
+                future.result() if future else _MISSING_TOOL for future in futures
+            ]
+        else:
+            raw_results = []
+            for tool_call, call in zip(tool_calls, calls):
+                if call is None:
+                    raw_results.append(_MISSING_TOOL)
+                elif run_hooks:
+                    raw_results.append(_invoke_hooked(run_hooks, tool_call, call))
+                else:
+                    raw_results.append(_invoke_sync(call[0].function, call[1]))
+
+        return self._merge_tool_results(tool_calls, raw_results, debug)
+
     def run_and_stream(
         self,
         agent: Agent,
-        messages: List,
+        messages: List = None,
         context_variables: dict = {},
         model_override: str = None,
         debug: bool = False,
         max_turns: int = float("inf"),
         execute_tools: bool = True,
+        priority: int = Priority.INTERACTIVE,
+        deadline: float = None,
+        session_id: str = None,
+        new_messages: List = None,
     ):
-        active_agent = agent
-        context_variables = copy.deepcopy(context_variables)
-        history = copy.deepcopy(messages)
-        init_len = len(messages)
-
-        while len(history) - init_len < max_turns:
-            message = {
-                "content": "",
-                "sender": agent.name,
-                "role": "assistant",
-                "function_call": None,
-                "tool_calls": defaultdict(
-                    lambda: {
-                        "function": {"arguments": "", "name": ""},
-                        "id": "",
-                        "type": "",
-                    }
-                ),
-            }
+        if session_id is not None:
+            agent, messages, context_variables, new_messages = self._open_session(
+                session_id, agent, messages, new_messages, context_variables
+            )
+        with (
+            self._run_hooks(agent, messages) as run_hooks,
+            self._admit(priority, deadline),
+        ):
+            run = _Run(agent, messages, context_variables, model_override, run_hooks)
+            while run.turns_left(max_turns):
+                started = run.start_turn()
+                completion = self.get_chat_completion(
+                    **run.completion_kwargs(stream=True, debug=debug)
+                )
+
+                # released even if the consumer stops reading mid-stream
+                try:
+                    yield {"delim": "start"}
+                    for chunk in completion:
+                        yield run.delta(chunk)
+                finally:
+                    _close_stream(completion)
+                yield {"delim": "end"}
+
+                message = run.streamed_message()
+                turn = run.record(message, completion, started, debug)
+                if not message["tool_calls"] or not execute_tools:
+                    _debug(debug, "Ending turn")
+                    break
+
+                tool_started = time.perf_counter()
+                partial_response = self.handle_tool_calls(
+                    _tool_call_objects(message["tool_calls"]), **run.tool_kwargs(debug)
+                )
+                run.apply_tools(partial_response, turn, tool_started)
 
-            # get completion with current history, agent
-            completion = self.get_chat_completion(
-                agent=active_agent,
-                history=history,
+            response = run.finish()
+            if session_id is not None:
+                self._save_session(session_id, new_messages, response)
+            yield {"response": response}
+
+    def run(
+        self,
+        agent: Agent,
+        messages: List = None,
+        context_variables: dict = {},
+        model_override: str = None,
+        stream: bool = False,
+        debug: bool = False,
+        max_turns: int = float("inf"),
+        execute_tools: bool = True,
+        priority: int = Priority.INTERACTIVE,
+        deadline: float = None,
+        session_id: str = None,
+        new_messages: List = None,
+    ) -> Response:
+        if stream:
+            return self.run_and_stream(
+                agent=agent,
+                messages=messages,
                 context_variables=context_variables,
                 model_override=model_override,
-                stream=True,
                 debug=debug,
+                max_turns=max_turns,
+                execute_tools=execute_tools,
+                priority=priority,
+                deadline=deadline,
+                session_id=session_id,
+                new_messages=new_messages,
+            )
+        if session_id is not None:
+            agent, messages, context_variables, new_messages = self._open_session(
+                session_id, agent, messages, new_messages, context_variables
             )
+        query_vector = None
+        if self._use_semantic_cache(agent, messages, model_override):
+            try:
+                query_vector = self.semantic_cache.embed(messages[-1]["content"])
+            except Exception as e:
+                _semantic_cache_failed(e)
+        if query_vector is not None:
+            cached = self.semantic_cache.search(agent, query_vector)
+            if cached is not None:
+                response = self._cached_response(
+                    agent, messages, context_variables, cached, debug
+                )
+                if session_id is not None:
+                    self._save_session(session_id, new_messages, response)
+                return response
 
-            yield {"delim": "start"}
-            for chunk in completion:
-                delta = json.loads(chunk.choices[0].delta.json())
-                if delta["role"] == "assistant":
-                    delta["sender"] = active_agent.name
-                yield delta
-                delta.pop("role", None)
-                delta.pop("sender", None)
-                merge_chunk(message, delta)
-            yield {"delim": "end"}
-
-            message["tool_calls"] = list(message.get("tool_calls", {}).values())
-            if not message["tool_calls"]:
-                message["tool_calls"] = None
-            debug_print(debug, "Received completion:", message)
-            history.append(message)
-
-            if not message["tool_calls"] or not execute_tools:
-                debug_print(debug, "Ending turn.")
-                break
-
-            # convert tool_calls to objects
-            tool_calls = []
-            for tool_call in message["tool_calls"]:
-                function = Function(
-                    arguments=tool_call["function"]["arguments"],
-                    name=tool_call["function"]["name"],
+        with (
+            self._run_hooks(agent, messages) as run_hooks,
+            self._admit(priority, deadline),
+        ):
+            run = _Run(agent, messages, context_variables, model_override, run_hooks)
+            while run.turns_left(max_turns) and run.agent:
+                started = run.start_turn()
+                completion = self.get_chat_completion(
+                    **run.completion_kwargs(stream=False, debug=debug)
                 )
-                tool_call_object = ChatCompletionMessageToolCall(
-                    id=tool_call["id"], function=function, type=tool_call["type"]
+                message = completion.choices[0].message
+                message.sender = run.agent.name
+                # to plain dicts, out of the client's types
+                turn = run.record(
+                    json.loads(message.model_dump_json()), completion, started, debug
                 )
-                tool_calls.append(tool_call_object)
+                if not message.tool_calls or not execute_tools:
+                    _debug(debug, "Ending turn")
+                    break
+
+                tool_started = time.perf_counter()
+                partial_response = self.handle_tool_calls(
+                    message.tool_calls, **run.tool_kwargs(debug)
+                )
+                run.apply_tools(partial_response, turn, tool_started)
+
+            if query_vector is not None:
+                self.semantic_cache.add(agent, query_vector, run.messages)
+
+            response = run.finish()
+            if session_id is not None:
+                self._save_session(session_id, new_messages, response)
+            return response
+
+    def run_many(
+        self,
+        jobs: Iterable,
+        max_concurrency: int = 8,
+        timeout: float = None,
+        ordered: bool = False,
+        debug: bool = False,
+        **run_kwargs,
+    ) -> BatchRun:
+        """
+        Run many independent conversations with bounded concurrency.
+
+        Args:
+            jobs: `(agent, messages)` / `(agent, messages, context_variables)`
+                tuples, or dicts of `run` arguments. Consumed lazily.
+            max_concurrency: Maximum number of runs in flight.
+            timeout: Per-job timeout in seconds.
+            ordered: Yield results in job order instead of as they complete.
+            debug: Print the aggregate stats once the batch is done.
+            **run_kwargs: Default `run` arguments shared by every job. Runs
+                are admitted with `Priority.BATCH` unless a priority is given.
+
+        Returns:
+            BatchRun: An iterable of `BatchResult`s. A failing or timed out job
+            yields a result carrying its error instead of aborting the batch;
+            throughput and latency are aggregated in its `stats`.
+        """
+        run_kwargs.setdefault("priority", Priority.BATCH)
+        return BatchRun(
+            self.run,
+            jobs,
+            max_concurrency=max_concurrency,
+            timeout=timeout,
+            ordered=ordered,
+            debug=debug,
+            run_kwargs=run_kwargs,
+        )
+
+
+class AsyncSwarm(Swarm):
+    """
+    asyncio flavour of `Swarm`: `run` and `run_and_stream` are coroutines driving
+    an `ollama.AsyncClient`, so a single event loop can serve many conversations.
+    """
+
+    _residency_class = AsyncModelResidency
+    _balanced_client_class = AsyncBalancedClient
+    _get_client = LoopLocalAsyncClient
+    _wrapper_class = AsyncOllamaWrapper
+
+    async def warmup(
+        self,
+        agent: Agent = None,
+        models: Iterable[str] = (),
+        keep_alive=None,
+    ) -> Dict[str, float]:
+        return await self.residency.warmup(agent, models, keep_alive)
+
+    def _admit_async(self, priority: int, deadline: float):
+        if self.admission is None:
+            return nullcontext()
+        return self.admission.admit_async(priority, deadline)
+
+    async def _open_session_async(self, *args):
+        # stores do blocking I/O (SQLite): keep it off the event loop
+        return await asyncio.to_thread(self._open_session, *args)
+
+    async def _save_session_async(self, *args) -> None:
+        await asyncio.to_thread(self._save_session, *args)
+
+    async def get_chat_completion(
+        self,
+        agent: Agent,
+        history: List,
+        context_variables: dict,
+        model_override: str,
+        stream: bool,
+        debug: bool,
+        run_hooks: RunHooks = None,
+    ) -> ChatCompletionMessage:
+        create_params = self._build_create_params(
+            agent, history, context_variables, model_override, stream, debug
+        )
+        if run_hooks:
+            run_hooks.request_sent(create_params)
+        return await self.client.chat.completions.create(**create_params)
+
+    async def handle_tool_calls(
+        self,
+        tool_calls: List[ChatCompletionMessageToolCall],
+        functions: List[AgentFunction],
+        context_variables: dict,
+        debug: bool,
+        parallel: bool = False,
+        run_hooks: RunHooks = None,
+    ) -> Response:
+        toolset = compile_tools(functions)
+        calls = [
+            self._prepare_tool_call(tool_call, toolset, context_variables, debug)
+            for tool_call in tool_calls
+        ]
+        loop = asyncio.get_running_loop()
+        executor = self._get_tool_executor()
 
-            # handle function calls, updating context_variables, and switching agents
-            partial_response = self.handle_tool_calls(
-                tool_calls, active_agent.functions, context_variables, debug
+        async def invoke(tool_call, call):
+            if call is None:
+                return _MISSING_TOOL
+            if run_hooks:
+                return await _hooked_tool(run_hooks, tool_call, call_tool(*call))
+            return await call_tool(*call)
+
+        async def call_tool(spec, args):
+            if spec.is_async:
+                return await _resolve_async_result(spec.function(**args))
+            # keep blocking agent functions off the event loop
+            raw_result = await loop.run_in_executor(
+                executor, functools.partial(spec.function, **args)
             )
-            history.extend(partial_response.messages)
-            context_variables.update(partial_response.context_variables)
-            if partial_response.agent:
-                active_agent = partial_response.agent
-
-        yield {
-            "response": Response(
-                messages=history[init_len:],
-                agent=active_agent,
-                context_variables=context_variables,
+            if _is_async_result(raw_result):
+                raw_result = await _resolve_async_result(raw_result)
+            return raw_result
+
+        if parallel:
+            raw_results = await asyncio.gather(
+                *(invoke(tool_call, call) for tool_call, call in zip(tool_calls, calls))
             )
-        }
+        else:
+            raw_results = [
+                await invoke(tool_call, call)
+                for tool_call, call in zip(tool_calls, calls)
+            ]
 
-    def run(
+        return self._merge_tool_results(tool_calls, raw_results, debug)
+
+    async def run_and_stream(
         self,
         agent: Agent,
-        messages: List,
+        messages: List = None,
+        context_variables: dict = {},
+        model_override: str = None,
+        debug: bool = False,
+        max_turns: int = float("inf"),
+        execute_tools: bool = True,
+        priority: int = Priority.INTERACTIVE,
+        deadline: float = None,
+        session_id: str = None,
+        new_messages: List = None,
+    ):
+        if session_id is not None:
+            (
+                agent,
+                messages,
+                context_variables,
+                new_messages,
+            ) = await self._open_session_async(
+                session_id, agent, messages, new_messages, context_variables
+            )
+        async with (
+            self._run_hooks(agent, messages) as run_hooks,
+            self._admit_async(priority, deadline),
+        ):
+            run = _Run(agent, messages, context_variables, model_override, run_hooks)
+            while run.turns_left(max_turns):
+                started = run.start_turn()
+                completion = await self.get_chat_completion(
+                    **run.completion_kwargs(stream=True, debug=debug)
+                )
+
+                # released even if the consumer stops reading mid-stream
+                try:
+                    yield {"delim": "start"}
+                    async for chunk in completion:
+                        yield run.delta(chunk)
+                finally:
+                    await _aclose_stream(completion)
+                yield {"delim": "end"}
+
+                message = run.streamed_message()
+                turn = run.record(message, completion, started, debug)
+                if not message["tool_calls"] or not execute_tools:
+                    _debug(debug, "Ending turn")
+                    break
+
+                tool_started = time.perf_counter()
+                partial_response = await self.handle_tool_calls(
+                    _tool_call_objects(message["tool_calls"]), **run.tool_kwargs(debug)
+                )
+                run.apply_tools(partial_response, turn, tool_started)
+
+            response = run.finish()
+            if session_id is not None:
+                await self._save_session_async(session_id, new_messages, response)
+            yield {"response": response}
+
+    async def run(
+        self,
+        agent: Agent,
+        messages: List = None,
         context_variables: dict = {},
         model_override: str = None,
         stream: bool = False,
         debug: bool = False,
         max_turns: int = float("inf"),
         execute_tools: bool = True,
+        priority: int = Priority.INTERACTIVE,
+        deadline: float = None,
+        session_id: str = None,
+        new_messages: List = None,
     ) -> Response:
         if stream:
             return self.run_and_stream(
@@ -258,44 +996,90 @@ class Swarm:
                 debug=debug,
                 max_turns=max_turns,
                 execute_tools=execute_tools,
+                priority=priority,
+                deadline=deadline,
+                session_id=session_id,
+                new_messages=new_messages,
             )
-        active_agent = agent
-        context_variables = copy.deepcopy(context_variables)
-        history = copy.deepcopy(messages)
-        init_len = len(messages)
-
-        while len(history) - init_len < max_turns and active_agent:
-            # get completion with current history, agent
-            completion = self.get_chat_completion(
-                agent=active_agent,
-                history=history,
-                context_variables=context_variables,
-                model_override=model_override,
-                stream=stream,
-                debug=debug,
-            )
-            message = completion.choices[0].message
-            debug_print(debug, "Received completion:", message)
-            message.sender = active_agent.name
-            history.append(
-                json.loads(message.model_dump_json())
-            )  # to avoid OpenAI types (?)
-
-            if not message.tool_calls or not execute_tools:
-                debug_print(debug, "Ending turn.")
-                break
-
-            # handle function calls, updating context_variables, and switching agents
-            partial_response = self.handle_tool_calls(
-                message.tool_calls, active_agent.functions, context_variables, debug
+        if session_id is not None:
+            (
+                agent,
+                messages,
+                context_variables,
+                new_messages,
+            ) = await self._open_session_async(
+                session_id, agent, messages, new_messages, context_variables
             )
-            history.extend(partial_response.messages)
-            context_variables.update(partial_response.context_variables)
-            if partial_response.agent:
-                active_agent = partial_response.agent
-
-        return Response(
-            messages=history[init_len:],
-            agent=active_agent,
-            context_variables=context_variables,
+        query_vector = None
+        if self._use_semantic_cache(agent, messages, model_override):
+            try:
+                query_vector = await self.semantic_cache.aembed(messages[-1]["content"])
+            except Exception as e:
+                _semantic_cache_failed(e)
+        if query_vector is not None:
+            cached = self.semantic_cache.search(agent, query_vector)
+            if cached is not None:
+                response = self._cached_response(
+                    agent, messages, context_variables, cached, debug
+                )
+                if session_id is not None:
+                    await self._save_session_async(session_id, new_messages, response)
+                return response
+
+        async with (
+            self._run_hooks(agent, messages) as run_hooks,
+            self._admit_async(priority, deadline),
+        ):
+            run = _Run(agent, messages, context_variables, model_override, run_hooks)
+            while run.turns_left(max_turns) and run.agent:
+                started = run.start_turn()
+                completion = await self.get_chat_completion(
+                    **run.completion_kwargs(stream=False, debug=debug)
+                )
+                message = completion.choices[0].message
+                message.sender = run.agent.name
+                # to plain dicts, out of the client's types
+                turn = run.record(
+                    json.loads(message.model_dump_json()), completion, started, debug
+                )
+                if not message.tool_calls or not execute_tools:
+                    _debug(debug, "Ending turn")
+                    break
+
+                tool_started = time.perf_counter()
+                partial_response = await self.handle_tool_calls(
+                    message.tool_calls, **run.tool_kwargs(debug)
+                )
+                run.apply_tools(partial_response, turn, tool_started)
+
+            if query_vector is not None:
+                self.semantic_cache.add(agent, query_vector, run.messages)
+
+            response = run.finish()
+            if session_id is not None:
+                await self._save_session_async(session_id, new_messages, response)
+            return response
+
+    def run_many(
+        self,
+        jobs: Iterable,
+        max_concurrency: int = 8,
+        timeout: float = None,
+        ordered: bool = False,
+        debug: bool = False,
+        **run_kwargs,
+    ) -> AsyncBatchRun:
+        """
+        Same as `Swarm.run_many`, but consumed with `async for`; timed out jobs
+        are cancelled.
+        """
+        run_kwargs.setdefault("priority", Priority.BATCH)
+        return AsyncBatchRun(
+            self.run,
+            jobs,
+            max_concurrency=max_concurrency,
+            timeout=timeout,
+            ordered=ordered,
+            debug=debug,
+            run_kwargs=run_kwargs,
         )
@@ -0,0 +1,76 @@
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict
+
+from .util import percentile
+
+
+class LatencyHistogram:
+    """
+    Recent latencies of one backend, in seconds.
+
+    Keeps the last `max_samples` samples, so percentiles follow the current
+    behaviour of the node rather than its whole history.
+    """
+
+    def __init__(self, max_samples: int = 500):
+        self._samples = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> float:
+        with self._lock:
+            samples = list(self._samples)
+        return percentile(samples, q)
+
+    def summary(self) -> Dict[str, float]:
+        with self._lock:
+            samples = list(self._samples)
+        return {
+            "count": self.count,
+            "p50": percentile(samples, 50),
+            "p95": percentile(samples, 95),
+            "p99": percentile(samples, 99),
+        }
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """
+    When a `BalancedClient` sends a duplicate of a slow request to another node.
+
+    A request whose first chunk has not arrived after the `percentile` of its
+    node's recent time-to-first-chunk is hedged; until the node has
+    `min_samples` samples, `initial_delay` is used instead.
+
+    Attributes:
+        percentile (float): Latency percentile (0-100) after which to hedge.
+        min_delay (float): Lower bound of the hedge delay, in seconds.
+        max_delay (float): Upper bound of the hedge delay, in seconds.
+        initial_delay (float): Hedge delay while latencies are unknown.
+        min_samples (int): Samples needed before trusting the percentile.
+        max_ratio (float): Maximum fraction of requests hedged, so a cluster-wide
+            slowdown does not double the load.
+    """
+
+    percentile: float = 95.0
+    min_delay: float = 0.05
+    max_delay: float = 10.0
+    initial_delay: float = 2.0
+    min_samples: int = 20
+    max_ratio: float = 0.1
+
+    def delay(self, histogram: LatencyHistogram) -> float:
+        if len(histogram) < self.min_samples:
+            return self.initial_delay
+        delay = histogram.percentile(self.percentile)
+        return min(max(delay, self.min_delay), self.max_delay)
@@ -0,0 +1,203 @@
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from .logging import setup_logging
+from .types import Agent, Response, TurnUsage
+
+logger = setup_logging(__name__)
+
+_run_ids = itertools.count(1)
+
+
+@dataclass
+class RunInfo:
+    """
+    The run a hook is called for.
+
+    Attributes:
+        run_id (int): Unique within the process, to correlate concurrent runs.
+        agent (Agent): The active agent; updated on handoff.
+        turn (int): Completions requested so far; the current turn is 1-based.
+        started_at (float): `time.monotonic()` when the run started.
+        response (Response, optional): The final response, in `on_run_end`.
+        extra (dict): Free for hooks to keep per-run state in.
+    """
+
+    run_id: int
+    agent: Agent
+    turn: int = 0
+    started_at: float = 0.0
+    response: Optional[Response] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+class SwarmHooks:
+    """
+    Callbacks observing the internals of `Swarm.run` and `run_and_stream`.
+
+    Subclass and override the events you need; the others do nothing. Every
+    event gets the `RunInfo` of its run and `ts`, a `time.monotonic()`
+    timestamp. Payloads are passed by reference, not copied: treat them as
+    read-only. Hooks run inline (tool hooks on the thread running the tool), so
+    keep them fast. Exceptions raised by hooks are logged, not propagated.
+    """
+
+    def on_run_start(self, run: RunInfo, messages: List[dict], ts: float) -> None:
+        """The run starts, before admission and the first turn."""
+
+    def on_turn_start(self, run: RunInfo, ts: float) -> None:
+        """A completion is about to be requested for `run.agent`."""
+
+    def on_request_sent(self, run: RunInfo, request: Dict[str, Any], ts: float) -> None:
+        """`request` (the chat completion parameters) is handed to the client."""
+
+    def on_first_token(self, run: RunInfo, ts: float) -> None:
+        """The first chunk of a streamed completion arrived."""
+
+    def on_completion(
+        self, run: RunInfo, message: dict, usage: TurnUsage, ts: float
+    ) -> None:
+        """The completion of the turn is complete."""
+
+    def on_tool_start(self, run: RunInfo, tool_call: Any, ts: float) -> None:
+        """An agent function is about to run for `tool_call`."""
+
+    def on_tool_end(
+        self,
+        run: RunInfo,
+        tool_call: Any,
+        result: Any,
+        error: Optional[BaseException],
+        ts: float,
+    ) -> None:
+        """An agent function returned `result`, or raised `error`."""
+
+    def on_handoff(
+        self, run: RunInfo, from_agent: Agent, to_agent: Agent, ts: float
+    ) -> None:
+        """A tool handed the conversation over to another agent."""
+
+    def on_run_end(
+        self,
+        run: RunInfo,
+        response: Optional[Response],
+        error: Optional[BaseException],
+        ts: float,
+    ) -> None:
+        """The run returned `response`, or failed with `error`."""
+
+
+_EVENTS = [name for name in vars(SwarmHooks) if name.startswith("on_")]
+
+
+class HookList(SwarmHooks):
+    """
+    Calls several `SwarmHooks` in order, logging (rather than raising) their
+    exceptions so a faulty hook cannot fail a run.
+    """
+
+    def __init__(self, hooks: Iterable[SwarmHooks]):
+        self.hooks = list(hooks)
+        # bind only the overridden events, so no-op ones cost nothing
+        for event in _EVENTS:
+            handlers = [
+                getattr(hook, event)
+                for hook in self.hooks
+                if getattr(type(hook), event, None) is not getattr(SwarmHooks, event)
+            ]
+            setattr(self, event, self._dispatcher(event, handlers))
+
+    @staticmethod
+    def _dispatcher(event: str, handlers: list):
+        def dispatch(*args) -> None:
+            for handler in handlers:
+                try:
+                    handler(*args)
+                except Exception:
+                    logger.exception("Hook %s failed", event)
+
+        return dispatch
+
+
+def as_hooks(hooks: Union[SwarmHooks, Iterable[SwarmHooks], None]):
+    """Normalize the `hooks` argument of `Swarm` to a `HookList`, or None."""
+    if hooks is None:
+        return None
+    if isinstance(hooks, SwarmHooks):
+        hooks = [hooks]
+    hooks = list(hooks)
+    return HookList(hooks) if hooks else None
+
+
+class _ToolScope:
+    """Emits `on_tool_start` / `on_tool_end` around one agent function call."""
+
+    def __init__(self, hooks: SwarmHooks, run: RunInfo, tool_call: Any):
+        self.hooks = hooks
+        self.run = run
+        self.tool_call = tool_call
+        self.result = None
+
+    def __enter__(self):
+        self.hooks.on_tool_start(self.run, self.tool_call, time.monotonic())
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.hooks.on_tool_end(
+            self.run, self.tool_call, self.result, exc, time.monotonic()
+        )
+        return False
+
+
+class RunHooks:
+    """
+    The hooks of one run, as used by `Swarm`: emits events with timestamps and
+    keeps `RunInfo` up to date. A context manager (sync or async) around the
+    run, so failures are reported to `on_run_end`.
+    """
+
+    def __init__(self, hooks: SwarmHooks, agent: Agent, messages: List[dict]):
+        self.hooks = hooks
+        self.messages = messages
+        self.info = RunInfo(run_id=next(_run_ids), agent=agent)
+
+    def __enter__(self) -> "RunHooks":
+        self.info.started_at = ts = time.monotonic()
+        self.hooks.on_run_start(self.info, self.messages, ts)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.hooks.on_run_end(self.info, self.info.response, exc, time.monotonic())
+        return False
+
+    async def __aenter__(self) -> "RunHooks":
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return self.__exit__(exc_type, exc, tb)
+
+    def turn_start(self, agent: Agent) -> None:
+        self.info.agent = agent
+        self.info.turn += 1
+        self.hooks.on_turn_start(self.info, time.monotonic())
+
+    def request_sent(self, request: Dict[str, Any]) -> None:
+        self.hooks.on_request_sent(self.info, request, time.monotonic())
+
+    def first_token(self) -> None:
+        self.hooks.on_first_token(self.info, time.monotonic())
+
+    def completion(self, message: dict, usage: TurnUsage) -> None:
+        self.hooks.on_completion(self.info, message, usage, time.monotonic())
+
+    def tool(self, tool_call: Any) -> _ToolScope:
+        return _ToolScope(self.hooks, self.info, tool_call)
+
+    def handoff(self, from_agent: Agent, to_agent: Agent) -> None:
+        self.info.agent = to_agent
+        self.hooks.on_handoff(self.info, from_agent, to_agent, time.monotonic())
+
+    def finish(self, response: Response) -> None:
+        self.info.response = response
@@ -1,11 +1,22 @@
+import atexit
+import json
 import logging
+import logging.handlers
 import argparse
-from typing import Optional
+import queue
+import random
+from typing import Any, Optional
+
+# payload logging settings, see `configure_logging`
+_max_chars = 2000
+_sample_ratio = 1.0
+_listener: Optional[logging.handlers.QueueListener] = None
 
 
 def get_debug_flag() -> bool:
     """Get debug flag from command line arguments."""
-    parser = argparse.ArgumentParser(add_help=True)
+    # no help: `--help` belongs to the program importing us
+    parser = argparse.ArgumentParser(add_help=False)
     parser.add_argument(
         "--debug", "-v", action="store_true", help="Enable debug logging"
     )
@@ -45,3 +56,181 @@ def setup_logging(
         logger.debug("Debug logging enabled")
 
     return logger
+
+
+def _clip(payload: Any, limit: int) -> Any:
+    """
+    A copy of `payload` holding about `limit` characters worth of its strings
+    and container items, so that serializing it costs O(limit) however long
+    the history or tool list is.
+    """
+    remaining = limit
+
+    def clip(value):
+        nonlocal remaining
+        if hasattr(value, "model_dump"):
+            value = value.model_dump(exclude_none=True)
+        if value is None or isinstance(value, (bool, int, float)):
+            remaining -= 5
+            return value
+        if isinstance(value, dict):
+            clipped = {}
+            for key, item in value.items():
+                if remaining <= 0:
+                    clipped["..."] = f"{len(value) - len(clipped)} more"
+                    break
+                remaining -= len(str(key)) + 4
+                clipped[key] = clip(item)
+            return clipped
+        if isinstance(value, (list, tuple)):
+            clipped = []
+            for item in value:
+                if remaining <= 0:
+                    clipped.append(f"... {len(value) - len(clipped)} more")
+                    break
+                remaining -= 2
+                clipped.append(clip(item))
+            return clipped
+        text = value if isinstance(value, str) else str(value)
+        if len(text) > max(remaining, 0):
+            text = text[: max(remaining, 0)] + "..."
+        remaining -= len(text) + 2
+        return text
+
+    return clip(payload)
+
+
+class LazyPayload:
+    """
+    A log argument serialized to JSON only when the record is formatted, and
+    truncated to `max_chars` characters (None keeps it whole). Long strings and
+    containers are cut before serializing, so a huge payload costs no more to
+    log than a small one.
+    """
+
+    __slots__ = ("payload", "max_chars")
+
+    def __init__(self, payload: Any, max_chars: Optional[int] = None):
+        self.payload = payload
+        self.max_chars = max_chars
+
+    def __str__(self) -> str:
+        limit = self.max_chars
+        payload = self.payload if limit is None else _clip(self.payload, limit)
+        text = json.dumps(payload, ensure_ascii=False, default=str)
+        if limit is not None and len(text) > limit:
+            return f"{text[:limit]}... ({len(text) - limit} more chars)"
+        return text
+
+
+class StructuredLogger:
+    """
+    Logs an event with keyword fields, as `event key=value ...`, with the fields
+    also attached to the record as `record.fields` for structured handlers.
+
+    Nothing is built or serialized unless the level is enabled: payload fields
+    are `LazyPayload`s, rendered (and truncated) only if a handler formats the
+    record. Debug events are sampled by the `sample_ratio` of
+    `configure_logging`, so verbose tracing can stay on under load.
+
+    Args:
+        logger (logging.Logger): Where records go.
+    """
+
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+
+    def isEnabledFor(self, level: int) -> bool:
+        return self.logger.isEnabledFor(level)
+
+    @staticmethod
+    def _format(event: str, fields: dict):
+        args = [
+            value
+            if value is None or isinstance(value, (str, int, float, bool))
+            else LazyPayload(value, _max_chars)
+            for value in fields.values()
+        ]
+        return " ".join([event] + [f"{key}=%s" for key in fields]), args
+
+    def render(self, event: str, **fields) -> str:
+        """The event as it would be logged, payloads truncated alike."""
+        message, args = self._format(event, fields)
+        return message % tuple(args) if args else message
+
+    def _log(self, level: int, event: str, fields: dict) -> None:
+        if not self.logger.isEnabledFor(level):
+            return
+        if level <= logging.DEBUG and _sample_ratio < 1.0:
+            if random.random() >= _sample_ratio:
+                return
+        message, args = self._format(event, fields)
+        self.logger.log(
+            level,
+            message,
+            *args,
+            extra={"event": event, "fields": fields},
+            stacklevel=3,
+        )
+
+    def log(self, level: int, event: str, **fields) -> None:
+        self._log(level, event, fields)
+
+    def debug(self, event: str, **fields) -> None:
+        self._log(logging.DEBUG, event, fields)
+
+    def info(self, event: str, **fields) -> None:
+        self._log(logging.INFO, event, fields)
+
+    def warning(self, event: str, **fields) -> None:
+        self._log(logging.WARNING, event, fields)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queues records as they are: `QueueHandler` would format them first, on the
+    request path. The queue stays in-process, so nothing needs pickling.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def configure_logging(
+    max_chars: Optional[int] = 2000,
+    sample_ratio: float = 1.0,
+    background: bool = False,
+) -> None:
+    """
+    Configure payload logging of Swarm's `StructuredLogger`s.
+
+    Args:
+        max_chars (int, optional): Serialized payloads are cut to this many
+            characters. None logs them whole.
+        sample_ratio (float): Fraction of debug events logged, between 0 and 1.
+        background (bool): Move the root logger's handlers behind a queue, so
+            a slow stream or file never blocks the request path. Records are
+            formatted, and payloads serialized, on the queue's thread.
+    """
+    global _max_chars, _sample_ratio, _listener
+    _max_chars = max_chars
+    _sample_ratio = sample_ratio
+    if background and _listener is None:
+        root = logging.getLogger()
+        records = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(
+            records, *root.handlers, respect_handler_level=True
+        )
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(_DeferredQueueHandler(records))
+        _listener.start()
+        atexit.register(_stop_background)
+
+
+def _stop_background() -> None:
+    """Flush and stop the background logging thread, if any."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,202 @@
+import asyncio
+import threading
+import weakref
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+import httpx
+import ollama
+
+DEFAULT_HOST = "http://localhost:11434"
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    """
+    HTTP connection pool settings of a shared Ollama client.
+
+    Attributes:
+        max_connections (int): Maximum concurrent connections to the host.
+        max_keepalive_connections (int): Idle connections kept open for reuse.
+        keepalive_expiry (float): Seconds an idle connection is kept open.
+        timeout (float, optional): Request timeout in seconds. None waits forever,
+            like `ollama.Client`.
+        connect_timeout (float, optional): Connection timeout in seconds.
+        http2 (bool): Negotiate HTTP/2 (requires the `h2` package).
+    """
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    timeout: Optional[float] = None
+    connect_timeout: Optional[float] = 10.0
+    http2: bool = False
+
+    def client_kwargs(self) -> Dict[str, Any]:
+        return {
+            "limits": httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            "timeout": httpx.Timeout(self.timeout, connect=self.connect_timeout),
+            "http2": self.http2,
+        }
+
+
+class _Registered:
+    def __init__(self, host: str, config: PoolConfig, client, loop=None):
+        self.host = host
+        self.config = config
+        self.client = client
+        self.loop = loop
+        self.acquisitions = 0
+        self.requests = 0
+
+
+_clients: Dict[tuple, _Registered] = {}
+_lock = threading.Lock()
+
+
+def _get(host: Optional[str], config: Optional[PoolConfig], client_class, loop=None):
+    host = (host or DEFAULT_HOST).rstrip("/")
+    config = config or PoolConfig()
+    key = (client_class, host, config, loop)
+    with _lock:
+        entry = _clients.get(key)
+        if entry is None:
+            if loop is not None:
+                # clients of finished loops can never be used again
+                _forget_closed_loops()
+            entry = _Registered(host, config, None, loop)
+            hook = _count_request(entry, client_class is ollama.AsyncClient)
+            entry.client = client_class(
+                host=host, event_hooks={"request": [hook]}, **config.client_kwargs()
+            )
+            _clients[key] = entry
+        entry.acquisitions += 1
+        return entry.client
+
+
+def _forget_closed_loops() -> None:
+    for key in [k for k, e in _clients.items() if e.loop and e.loop.is_closed()]:
+        del _clients[key]
+
+
+def _count_request(entry: _Registered, is_async: bool):
+    def hook(request):
+        entry.requests += 1
+
+    async def async_hook(request):
+        entry.requests += 1
+
+    return async_hook if is_async else hook
+
+
+def get_client(
+    host: Optional[str] = None, config: Optional[PoolConfig] = None
+) -> ollama.Client:
+    """
+    Return the process-wide `ollama.Client` for `host` and `config`.
+
+    Clients, and therefore their httpx connection pools, are shared by every
+    caller asking for the same host and settings.
+    """
+    return _get(host, config, ollama.Client)
+
+
+def get_async_client(
+    host: Optional[str] = None, config: Optional[PoolConfig] = None
+) -> ollama.AsyncClient:
+    """
+    Return the `ollama.AsyncClient` for `host` and `config` shared on the running
+    event loop.
+
+    Async connections belong to the event loop that opened them, so each loop
+    gets its own client. Called outside a loop, the client is shared with other
+    such callers and bound to the first loop that uses it; prefer
+    `LoopLocalAsyncClient` when the client is created before the loop runs.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    return _get(host, config, ollama.AsyncClient, loop)
+
+
+class LoopLocalAsyncClient:
+    """
+    Stand-in for an `ollama.AsyncClient` that can outlive event loops: every
+    attribute is looked up on the shared client of the loop running at the time,
+    so one `AsyncSwarm` serves any number of `asyncio.run` calls. The client of
+    each loop is acquired from the pool once, then remembered.
+
+    Attributes:
+        host (str): The Ollama host.
+        config (PoolConfig): Connection pool settings of the per-loop clients.
+    """
+
+    def __init__(self, host: Optional[str] = None, config: Optional[PoolConfig] = None):
+        self.host = (host or DEFAULT_HOST).rstrip("/")
+        self.config = config or PoolConfig()
+        self._loop_clients = weakref.WeakKeyDictionary()
+
+    def _resolve(self) -> ollama.AsyncClient:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return get_async_client(self.host, self.config)
+        client = self._loop_clients.get(loop)
+        if client is None:
+            client = self._loop_clients[loop] = get_async_client(self.host, self.config)
+        return client
+
+    def __getattr__(self, name):
+        if name == "_loop_clients":
+            raise AttributeError(name)
+        return getattr(self._resolve(), name)
+
+
+def _pool_usage(client) -> Dict[str, int]:
+    # httpx does not expose pool metrics; read them from httpcore when available
+    pool = getattr(getattr(client._client, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", []))
+    idle = sum(1 for connection in connections if connection.is_idle())
+    return {
+        "connections": len(connections),
+        "active_connections": len(connections) - idle,
+        "idle_connections": idle,
+        "pending_requests": len(getattr(pool, "_requests", [])),
+    }
+
+
+def pool_stats() -> List[Dict[str, Any]]:
+    """
+    Return the utilization of every shared client's connection pool.
+    """
+    with _lock:
+        entries = list(_clients.values())
+    return [
+        {
+            "host": entry.host,
+            "async": isinstance(entry.client, ollama.AsyncClient),
+            "acquisitions": entry.acquisitions,
+            "requests": entry.requests,
+            **_pool_usage(entry.client),
+            **asdict(entry.config),
+        }
+        for entry in entries
+    ]
+
+
+def close_all() -> None:
+    """
+    Close and forget every shared sync client. Async clients are only forgotten;
+    close them from their event loop with `await client._client.aclose()`.
+    """
+    with _lock:
+        entries = list(_clients.values())
+        _clients.clear()
+    for entry in entries:
+        if isinstance(entry.client, ollama.Client):
+            entry.client._client.close()
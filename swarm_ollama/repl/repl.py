@@ -1,6 +1,8 @@
 import json
+import uuid
 
 from swarm_ollama import Swarm
+from swarm_ollama.sessions import InMemorySessionStore
 
 
 def process_and_print_streaming_response(response):
@@ -60,28 +62,32 @@ def pretty_print_messages(messages) -> None:
 def run_demo_loop(
     starting_agent, context_variables=None, stream=False, debug=False
 ) -> None:
-    client = Swarm()
+    # the session keeps the history and the active agent between turns
+    client = Swarm(sessions=InMemorySessionStore())
+    session_id = str(uuid.uuid4())
     print("Starting Swarm CLI 🐝")
 
-    messages = []
+    # handoffs may return agents the session cannot find from the starting one
     agent = starting_agent
 
     while True:
         user_input = input("\033[90mUser\033[0m: ")
-        messages.append({"role": "user", "content": user_input})
 
         response = client.run(
             agent=agent,
-            messages=messages,
+            session_id=session_id,
+            new_messages=[{"role": "user", "content": user_input}],
             context_variables=context_variables or {},
             stream=stream,
             debug=debug,
         )
+        # the session holds them from now on, with the updates of tools and
+        # handoffs, which resending the initial ones would overwrite
+        context_variables = None
 
         if stream:
             response = process_and_print_streaming_response(response)
         else:
             pretty_print_messages(response.messages)
 
-        messages.extend(response.messages)
         agent = response.agent
@@ -0,0 +1,299 @@
+import asyncio
+import functools
+import inspect
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from .logging import setup_logging
+from .types import Agent
+
+logger = setup_logging(__name__)
+
+KeepAlive = Optional[Union[float, str]]
+
+
+@dataclass
+class ResidencyEvent:
+    """
+    A model being loaded into, or evicted from, Ollama's memory.
+
+    Attributes:
+        model (str): The model name.
+        kind (str): "load" or "evict".
+        at (float): Unix time the event was observed.
+        duration (float, optional): For loads, the seconds Ollama spent loading
+            the model (None when the load was only seen in a `ps` snapshot). For
+            evictions, the seconds the model had been seen resident.
+    """
+
+    model: str
+    kind: str
+    at: float
+    duration: Optional[float] = None
+
+
+def _canonical(model: str) -> str:
+    # `ps` reports "llama3.2" as "llama3.2:latest"
+    return model if ":" in model else f"{model}:latest"
+
+
+def _handoff_targets(func) -> List[Agent]:
+    """
+    Agents an agent function may hand off to: the agents it references through
+    globals or closure variables, directly or in a list, tuple or dict.
+    """
+    if isinstance(func, functools.partial):
+        values = list(func.args) + list(func.keywords.values())
+        return _handoff_targets(func.func) + [v for v in values if isinstance(v, Agent)]
+    try:
+        closure = inspect.getclosurevars(inspect.unwrap(func))
+    except TypeError:
+        return []
+    targets = []
+    for value in [*closure.nonlocals.values(), *closure.globals.values()]:
+        if isinstance(value, Agent):
+            targets.append(value)
+        elif isinstance(value, (list, tuple, dict)):
+            items = value.values() if isinstance(value, dict) else value
+            targets.extend(item for item in items if isinstance(item, Agent))
+    return targets
+
+
+def reachable_agents(agent: Agent) -> List[Agent]:
+    """
+    Return `agent` and every agent reachable from it by handoff, breadth first.
+    """
+    seen = {id(agent)}
+    agents = [agent]
+    for current in agents:
+        for func in current.functions:
+            for target in _handoff_targets(func):
+                if id(target) not in seen:
+                    seen.add(id(target))
+                    agents.append(target)
+    return agents
+
+
+class ModelResidency:
+    """
+    Keep the models of a swarm loaded in Ollama's memory.
+
+    `preload` and `warmup` load models ahead of the first request, so users do
+    not pay the model load time; `refresh` compares `ps` snapshots to notice
+    models loaded by traffic and models Ollama evicted. Loads and evictions are
+    kept as `ResidencyEvent`s.
+
+    Args:
+        client: Ollama-style client with `generate` and `ps` methods, such as
+            an `OllamaWrapper`.
+        keep_alive (float | str, optional): How long preloaded models stay
+            loaded, in seconds or as an Ollama duration ("30m", -1 for ever).
+            None uses the server default.
+        max_workers (int): Models loaded concurrently by `preload`.
+        max_events (int): Number of events kept.
+    """
+
+    def __init__(
+        self,
+        client,
+        keep_alive: KeepAlive = None,
+        max_workers: int = 4,
+        max_events: int = 1000,
+    ):
+        self.client = client
+        self.keep_alive = keep_alive
+        self.max_workers = max_workers
+        self.events = deque(maxlen=max_events)
+        self._resident: Dict[str, float] = {}  # model -> unix time first seen
+        self._lock = threading.Lock()
+
+    def _plan(
+        self,
+        agent: Optional[Agent],
+        models: Iterable[str],
+        keep_alive: KeepAlive,
+    ) -> Dict[str, KeepAlive]:
+        keep_alive = self.keep_alive if keep_alive is None else keep_alive
+        plan = dict.fromkeys(models, keep_alive)
+        for reachable in reachable_agents(agent) if agent is not None else []:
+            if reachable.model not in plan or reachable.keep_alive is not None:
+                plan[reachable.model] = (
+                    keep_alive if reachable.keep_alive is None else reachable.keep_alive
+                )
+        return plan
+
+    def _record_load(self, model: str, response, elapsed: float) -> float:
+        # Ollama reports durations in nanoseconds; fall back to the wall time
+        load_duration = response.get("load_duration")
+        seconds = load_duration / 1e9 if load_duration is not None else elapsed
+        now = time.time()
+        with self._lock:
+            self._resident.setdefault(_canonical(model), now)
+            self.events.append(ResidencyEvent(_canonical(model), "load", now, seconds))
+        logger.info("Loaded %s in %.2fs", model, seconds)
+        return seconds
+
+    def _load(self, model: str, keep_alive: KeepAlive) -> Optional[float]:
+        start = time.perf_counter()
+        try:
+            # an empty prompt loads the model without generating anything
+            response = self.client.generate(
+                model=model, prompt="", keep_alive=keep_alive
+            )
+        except Exception as e:
+            logger.warning("Failed to preload %s: %s", model, e)
+            return None
+        return self._record_load(model, response, time.perf_counter() - start)
+
+    def preload(
+        self, models: Iterable[str], keep_alive: KeepAlive = None
+    ) -> Dict[str, float]:
+        """
+        Load `models` concurrently. Returns the load time of each model that
+        loaded; failures are logged and left out.
+        """
+        return self._preload(self._plan(None, models, keep_alive))
+
+    def _preload(self, plan: Dict[str, KeepAlive]) -> Dict[str, float]:
+        if not plan:
+            return {}
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(plan)),
+            thread_name_prefix="swarm-preload",
+        ) as executor:
+            futures = {
+                model: executor.submit(self._load, model, keep_alive)
+                for model, keep_alive in plan.items()
+            }
+        results = {model: future.result() for model, future in futures.items()}
+        return {model: s for model, s in results.items() if s is not None}
+
+    def warmup(
+        self,
+        agent: Optional[Agent] = None,
+        models: Iterable[str] = (),
+        keep_alive: KeepAlive = None,
+    ) -> Dict[str, float]:
+        """
+        Preload `models` and the model of every agent reachable by handoff from
+        `agent`, each with its agent's `keep_alive` when set.
+        """
+        return self._preload(self._plan(agent, models, keep_alive))
+
+    def _apply_snapshot(self, loaded) -> List[ResidencyEvent]:
+        now = time.time()
+        current = {_canonical(m["model"]) for m in loaded.get("models") or []}
+        new_events = []
+        with self._lock:
+            for model in current - self._resident.keys():
+                self._resident[model] = now
+                new_events.append(ResidencyEvent(model, "load", now))
+            for model in self._resident.keys() - current:
+                resident_for = now - self._resident.pop(model)
+                new_events.append(ResidencyEvent(model, "evict", now, resident_for))
+                logger.info("%s was evicted after %.0fs", model, resident_for)
+            self.events.extend(new_events)
+        return new_events
+
+    def refresh(self) -> List[ResidencyEvent]:
+        """
+        Take a `ps` snapshot and return the loads and evictions since the last one.
+        """
+        return self._apply_snapshot(self.client.ps())
+
+    @property
+    def resident(self) -> List[str]:
+        """Models loaded as of the last preload or snapshot."""
+        with self._lock:
+            return sorted(self._resident)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """
+        Per model load and eviction counts, last load time and mean residency.
+        """
+        with self._lock:
+            events = list(self.events)
+            resident = set(self._resident)
+        models = {}
+        for event in events:
+            entry = models.setdefault(
+                event.model,
+                {
+                    "loads": 0,
+                    "evictions": 0,
+                    "last_load_seconds": None,
+                    "_resident": [],
+                },
+            )
+            if event.kind == "load":
+                entry["loads"] += 1
+                if event.duration is not None:
+                    entry["last_load_seconds"] = event.duration
+            else:
+                entry["evictions"] += 1
+                entry["_resident"].append(event.duration)
+        for model, entry in models.items():
+            durations = entry.pop("_resident")
+            entry["mean_resident_seconds"] = (
+                sum(durations) / len(durations) if durations else None
+            )
+            entry["resident"] = model in resident
+        return models
+
+    def history(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [asdict(event) for event in self.events]
+
+
+class AsyncModelResidency(ModelResidency):
+    """
+    `ModelResidency` over an async Ollama client, for `AsyncSwarm`.
+    """
+
+    async def _load(self, model: str, keep_alive: KeepAlive) -> Optional[float]:
+        start = time.perf_counter()
+        try:
+            response = await self.client.generate(
+                model=model, prompt="", keep_alive=keep_alive
+            )
+        except Exception as e:
+            logger.warning("Failed to preload %s: %s", model, e)
+            return None
+        return self._record_load(model, response, time.perf_counter() - start)
+
+    async def _preload(self, plan: Dict[str, KeepAlive]) -> Dict[str, float]:
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def load(model, keep_alive):
+            async with semaphore:
+                return await self._load(model, keep_alive)
+
+        results = await asyncio.gather(
+            *(load(model, keep_alive) for model, keep_alive in plan.items())
+        )
+        return {
+            model: seconds
+            for model, seconds in zip(plan, results)
+            if seconds is not None
+        }
+
+    async def preload(
+        self, models: Iterable[str], keep_alive: KeepAlive = None
+    ) -> Dict[str, float]:
+        return await self._preload(self._plan(None, models, keep_alive))
+
+    async def warmup(
+        self,
+        agent: Optional[Agent] = None,
+        models: Iterable[str] = (),
+        keep_alive: KeepAlive = None,
+    ) -> Dict[str, float]:
+        return await self._preload(self._plan(agent, models, keep_alive))
+
+    async def refresh(self) -> List[ResidencyEvent]:
+        return self._apply_snapshot(await self.client.ps())
@@ -0,0 +1,296 @@
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+from httpx import ConnectError, NetworkError, RemoteProtocolError, TimeoutException
+from ollama._types import ResponseError
+
+from .logging import setup_logging
+
+logger = setup_logging(__name__)
+
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised without contacting a host whose circuit breaker is open."""
+
+
+def is_retryable(e: Exception) -> bool:
+    """
+    Whether an error is transient: an overload or gateway status, or a network
+    failure. Other errors (unknown model, bad request) fail the same way again.
+    """
+    if isinstance(e, ResponseError):
+        return e.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(
+        e,
+        (
+            ConnectError,
+            NetworkError,
+            RemoteProtocolError,
+            TimeoutException,
+            ConnectionError,
+        ),
+    ) and not isinstance(e, CircuitOpenError)
+
+
+class CircuitBreaker:
+    """
+    Fail fast while a host is known to be bad.
+
+    After `failure_threshold` consecutive transient failures the circuit opens
+    and calls raise `CircuitOpenError` for `reset_timeout` seconds. Then a single
+    probe request is let through (half-open): its success closes the circuit,
+    its failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self, host: str, failure_threshold: int = 5, reset_timeout: float = 30.0
+    ):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self._probing = False
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> None:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            now = time.monotonic()
+            if self.state == self.OPEN:
+                if now - self.opened_at < self.reset_timeout:
+                    raise CircuitOpenError(
+                        f"Circuit open for {self.host} after {self.failures} failures."
+                    )
+                self.state = self.HALF_OPEN
+            # a probe that never reported back (cancelled) is replaced eventually
+            if self._probing and now - self._probe_started < self.reset_timeout:
+                raise CircuitOpenError(f"Circuit half-open for {self.host}, probing.")
+            self._probing = True
+            self._probe_started = now
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def release_probe(self) -> None:
+        """
+        End a call let through by `allow` without a verdict, e.g. when it is
+        abandoned before the host answered in full.
+        """
+        with self._lock:
+            self._probing = False
+
+    def record(self, error: Optional[Exception]) -> None:
+        """Record the outcome of a call let through by `allow`; None is a success."""
+        if error is None or (
+            isinstance(error, ResponseError) and not is_retryable(error)
+        ):
+            # the host answered, so it is up
+            self.record_success()
+        elif is_retryable(error):
+            self.record_failure()
+        else:
+            self.release_probe()
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.trips += 1
+                    logger.warning(
+                        "Opening circuit for %s after %s failures",
+                        self.host,
+                        self.failures,
+                    )
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class RetryBudget:
+    """
+    Cap retries to a fraction of recent requests, so that retries cannot
+    multiply the load on an overloaded server.
+
+    Over the last `window` seconds, retries are allowed while they stay under
+    `min_retries_per_second * window + ratio * requests`.
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.1,
+        min_retries_per_second: float = 1.0,
+        window: float = 10.0,
+    ):
+        self.ratio = ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.window = window
+        self._requests = deque()
+        self._retries = deque()
+        self._lock = threading.Lock()
+        self.exhausted = 0
+
+    def _trim(self, now: float) -> None:
+        for events in (self._requests, self._retries):
+            while events and events[0] <= now - self.window:
+                events.popleft()
+
+    def record_request(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._trim(now)
+            self._requests.append(now)
+
+    def try_retry(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._trim(now)
+            allowed = self.min_retries_per_second * self.window + self.ratio * len(
+                self._requests
+            )
+            if len(self._retries) >= allowed:
+                self.exhausted += 1
+                return False
+            self._retries.append(now)
+            return True
+
+
+class RetryPolicy:
+    """
+    Retries with jittered exponential backoff, a circuit breaker per host and a
+    shared retry budget, for `ChatCompletions`.
+
+    Share one policy between clients so they share breakers and budget.
+
+    Args:
+        max_attempts (int): Attempts per request, the first one included.
+        base_delay (float): Backoff before the first retry, in seconds.
+        max_delay (float): Maximum backoff, in seconds.
+        budget (RetryBudget, optional): Retry budget. Defaults to 10% of requests.
+        failure_threshold (int): Consecutive failures that open a host's circuit.
+        reset_timeout (float): Seconds before an open circuit lets a probe through.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.25,
+        max_delay: float = 8.0,
+        budget: Optional[RetryBudget] = None,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget or RetryBudget()
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self.retries = 0
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(
+                    host, self.failure_threshold, self.reset_timeout
+                )
+            return breaker
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter backoff before retry number `attempt` (1-based)."""
+        return random.uniform(
+            0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        )
+
+    def _should_retry(
+        self, e: Exception, breaker: Optional[CircuitBreaker], attempt: int
+    ) -> bool:
+        if breaker is not None:
+            breaker.record(e)
+        if not is_retryable(e):
+            return False
+        if attempt >= self.max_attempts or not self.budget.try_retry():
+            return False
+        with self._lock:
+            self.retries += 1
+        host = breaker.host if breaker is not None else "balanced nodes"
+        logger.info("Retrying request to %s after error: %s", host, e)
+        return True
+
+    def call(self, host: Optional[str], func: Callable[[], Any]) -> Any:
+        """
+        Call `func` with retries and the circuit breaker of `host`. With no host,
+        `func` is expected to check and feed breakers itself (`BalancedClient`
+        does, per node).
+        """
+        breaker = self.breaker(host) if host is not None else None
+        self.budget.record_request()
+        attempt = 1
+        while True:
+            if breaker is not None:
+                breaker.allow()
+            try:
+                result = func()
+            except Exception as e:
+                if not self._should_retry(e, breaker, attempt):
+                    raise
+                time.sleep(self.backoff(attempt))
+                attempt += 1
+                continue
+            if breaker is not None:
+                breaker.record_success()
+            return result
+
+    async def acall(self, host: Optional[str], func: Callable[[], Any]) -> Any:
+        """Await `func()` with retries and the circuit breaker of `host`."""
+        breaker = self.breaker(host) if host is not None else None
+        self.budget.record_request()
+        attempt = 1
+        while True:
+            if breaker is not None:
+                breaker.allow()
+            try:
+                result = await func()
+            except Exception as e:
+                if not self._should_retry(e, breaker, attempt):
+                    raise
+                await asyncio.sleep(self.backoff(attempt))
+                attempt += 1
+                continue
+            if breaker is not None:
+                breaker.record_success()
+            return result
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {
+            "retries": self.retries,
+            "budget_exhausted": self.budget.exhausted,
+            "circuits": {
+                b.host: {"state": b.state, "failures": b.failures, "trips": b.trips}
+                for b in breakers
+            },
+        }
@@ -0,0 +1,218 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+from .util import percentile
+
+
+class _Waiter:
+    """A completion waiting for its model's turn."""
+
+    def __init__(self, model: str, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.model = model
+        self.enqueued_at = time.monotonic()
+        self.granted = False
+        self.loop = loop
+        if loop is None:
+            self.event = threading.Event()
+        else:
+            self.future = loop.create_future()
+
+    def wake(self) -> None:
+        self.granted = True
+        if self.loop is None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(self._resolve)
+
+    def _resolve(self) -> None:
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class _ModelQueue:
+    def __init__(self, max_samples: int):
+        self.waiters: Deque[_Waiter] = deque()
+        self.waits: Deque[float] = deque(maxlen=max_samples)
+        self.dispatched = 0
+
+
+class ModelScheduler:
+    """
+    Group chat completions by model so Ollama does not keep swapping models.
+
+    Completions run in waves: while a model is active, its requests are
+    dispatched up to `max_concurrency` at a time, and requests for other models
+    wait in per-model queues. When the wave drains, the model with the oldest
+    waiting request goes next. To bound starvation, once a request has waited
+    `max_wait` seconds the active model stops admitting new requests, so the
+    switch happens as soon as its in-flight requests finish.
+
+    Args:
+        max_concurrency (int): Completions in flight at once, all of one model.
+            Match it to the server's `OLLAMA_NUM_PARALLEL`.
+        max_wait (float): Seconds a request may wait before the active model is
+            drained in its favour.
+        max_samples (int): Wait times kept per model for `stats`.
+    """
+
+    def __init__(
+        self, max_concurrency: int = 4, max_wait: float = 5.0, max_samples: int = 1000
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        self.max_concurrency = max_concurrency
+        self.max_wait = max_wait
+        self.max_samples = max_samples
+        self.active_model: Optional[str] = None
+        self.in_flight = 0
+        self.switches = 0
+        self._last_model: Optional[str] = None
+        self._queues: Dict[str, _ModelQueue] = {}
+        self._lock = threading.Lock()
+
+    def _queue(self, model: str) -> _ModelQueue:
+        queue = self._queues.get(model)
+        if queue is None:
+            queue = self._queues[model] = _ModelQueue(self.max_samples)
+        return queue
+
+    def _oldest_waiter(self, exclude: Optional[str] = None) -> Optional[_Waiter]:
+        heads = [
+            queue.waiters[0]
+            for model, queue in self._queues.items()
+            if queue.waiters and model != exclude
+        ]
+        return min(heads, key=lambda w: w.enqueued_at, default=None)
+
+    def _starving(self, now: float) -> bool:
+        """Whether a request for another model has waited past `max_wait`."""
+        oldest = self._oldest_waiter(exclude=self.active_model)
+        return oldest is not None and now - oldest.enqueued_at >= self.max_wait
+
+    def _admit(self, model: str, now: float, enqueued_at: float) -> None:
+        if self._last_model is not None and model != self._last_model:
+            self.switches += 1
+        self.active_model = self._last_model = model
+        self.in_flight += 1
+        queue = self._queue(model)
+        queue.dispatched += 1
+        queue.waits.append(now - enqueued_at)
+
+    def _dispatch(self) -> None:
+        """Wake queued waiters that may run now. Called with the lock held."""
+        now = time.monotonic()
+        if self.in_flight == 0:
+            queue = self._queues.get(self.active_model)
+            if self._starving(now):
+                nxt = self._oldest_waiter(exclude=self.active_model)
+            elif queue and queue.waiters:
+                nxt = queue.waiters[0]
+            else:
+                nxt = self._oldest_waiter()
+            if nxt is None:
+                self.active_model = None
+                return
+            # the wave continues, or a new one starts for the next model
+            self.active_model = nxt.model
+        elif self._starving(now):
+            return
+        queue = self._queues.get(self.active_model)
+        while queue and queue.waiters and self.in_flight < self.max_concurrency:
+            waiter = queue.waiters.popleft()
+            self._admit(waiter.model, now, waiter.enqueued_at)
+            waiter.wake()
+
+    def _try_admit(self, model: str) -> bool:
+        now = time.monotonic()
+        queue = self._queues.get(model)
+        if (
+            self.in_flight < self.max_concurrency
+            and self.active_model in (model, None)
+            and not (queue and queue.waiters)
+            and not self._starving(now)
+        ):
+            self._admit(model, now, now)
+            return True
+        return False
+
+    def _releaser(self) -> Callable[[], None]:
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            with self._lock:
+                if released:
+                    return
+                released = True
+                self.in_flight -= 1
+                self._dispatch()
+
+        return release
+
+    def acquire(self, model: str) -> Callable[[], None]:
+        """
+        Block until a completion for `model` may be sent. Returns the function
+        to call, once, when the completion is done.
+        """
+        with self._lock:
+            if self._try_admit(model):
+                return self._releaser()
+            waiter = _Waiter(model)
+            self._queue(model).waiters.append(waiter)
+        waiter.event.wait()
+        return self._releaser()
+
+    async def acquire_async(self, model: str) -> Callable[[], None]:
+        """
+        Wait, without blocking the event loop, until a completion for `model`
+        may be sent. Returns the function to call once the completion is done.
+        """
+        with self._lock:
+            if self._try_admit(model):
+                return self._releaser()
+            waiter = _Waiter(model, asyncio.get_running_loop())
+            self._queue(model).waiters.append(waiter)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.granted:
+                    # admitted while being cancelled: give the slot back
+                    self.in_flight -= 1
+                    self._dispatch()
+                else:
+                    self._queues[model].waiters.remove(waiter)
+            raise
+        return self._releaser()
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """
+        Queue depth, dispatch count and wait time (mean, p50, p95, max, in
+        seconds) per model, plus the active model and the number of switches.
+        """
+        with self._lock:
+            models = {
+                model: (len(queue.waiters), queue.dispatched, list(queue.waits))
+                for model, queue in self._queues.items()
+            }
+            stats = {
+                "active_model": self.active_model,
+                "in_flight": self.in_flight,
+                "switches": self.switches,
+            }
+        stats["models"] = {
+            model: {
+                "queued": queued,
+                "dispatched": dispatched,
+                "mean_wait": sum(waits) / len(waits) if waits else 0.0,
+                "p50_wait": percentile(waits, 50),
+                "p95_wait": percentile(waits, 95),
+                "max_wait": max(waits, default=0.0),
+            }
+            for model, (queued, dispatched, waits) in models.items()
+        }
+        return stats
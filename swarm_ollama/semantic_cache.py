@@ -0,0 +1,163 @@
+import copy
+import inspect
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .types import Agent
+
+
+class _AgentIndex:
+    """Normalized query embeddings and the answers they produced, for one agent."""
+
+    def __init__(self, dim: int):
+        self.vectors = np.empty((0, dim), dtype=np.float32)
+        self.created_at = np.empty(0, dtype=np.float64)
+        self.answers: List[dict] = []
+
+    def __len__(self) -> int:
+        return len(self.answers)
+
+    def keep(self, mask: np.ndarray) -> None:
+        self.vectors = self.vectors[mask]
+        self.created_at = self.created_at[mask]
+        self.answers = [a for a, kept in zip(self.answers, mask) if kept]
+
+
+class SemanticCache:
+    """
+    Reuse answers to near-duplicate user turns for single-turn, tool-free agents.
+
+    The last user message is embedded with Ollama's embedding endpoint and
+    compared, by cosine similarity, with the previous queries answered by the
+    same agent. Above `threshold`, the stored answer is returned without calling
+    the chat model. Only runs made of a single user message (plus system
+    messages) use the cache, since earlier turns are not compared.
+
+    Args:
+        client: Object with an Ollama-style `embed(model=..., input=...)` method,
+            sync or async. Defaults to the client of the Swarm it is given to.
+        model (str): The embedding model.
+        threshold (float): Minimum cosine similarity for a hit.
+        ttl (float, optional): Seconds an answer stays valid. None keeps it forever.
+        max_entries (int): Maximum number of answers kept per agent; the oldest
+            are evicted first.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        model: str = "nomic-embed-text",
+        threshold: float = 0.92,
+        ttl: Optional[float] = 3600.0,
+        max_entries: int = 1000,
+    ):
+        self.client = client
+        self.model = model
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._indexes: Dict[Tuple[str, str, str], _AgentIndex] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _agent_key(agent: Agent) -> Tuple[str, str, str]:
+        return (agent.name, agent.model, agent.instructions)
+
+    def eligible(self, agent: Agent, messages: List) -> bool:
+        """
+        Whether a run can be answered from the cache: the agent has no tools and
+        static instructions, and the conversation is a single user message, with
+        optional system messages. Earlier turns are not part of the key, so runs
+        continuing a conversation always go to the model.
+        """
+        roles = [m.get("role") for m in messages]
+        return (
+            not agent.functions
+            and isinstance(agent.instructions, str)
+            and roles.count("user") == 1
+            and all(role in ("system", "user") for role in roles)
+            and roles[-1] == "user"
+            and isinstance(messages[-1].get("content"), str)
+        )
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed(self, text: str) -> np.ndarray:
+        response = self.client.embed(model=self.model, input=text)
+        return self._normalize(response["embeddings"][0])
+
+    async def aembed(self, text: str) -> np.ndarray:
+        response = self.client.embed(model=self.model, input=text)
+        if inspect.isawaitable(response):
+            response = await response
+        return self._normalize(response["embeddings"][0])
+
+    def _expire(self, index: _AgentIndex, now: float) -> None:
+        if self.ttl is not None and len(index):
+            fresh = index.created_at > now - self.ttl
+            if not fresh.all():
+                index.keep(fresh)
+
+    def search(self, agent: Agent, vector: np.ndarray) -> Optional[dict]:
+        """
+        Return a copy of the answer stored for the most similar previous query of
+        `agent`, if it is at least `threshold` similar.
+        """
+        with self._lock:
+            index = self._indexes.get(self._agent_key(agent))
+            if index is not None:
+                self._expire(index, time.time())
+            if index is None or not len(index) or index.vectors.shape[1] != len(vector):
+                self.misses += 1
+                return None
+            similarities = index.vectors @ vector
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return copy.deepcopy(index.answers[best])
+
+    def add(self, agent: Agent, vector: np.ndarray, new_messages: List) -> None:
+        """
+        Remember the answer to a query, if the run produced a single plain
+        assistant message.
+        """
+        if len(new_messages) != 1:
+            return
+        answer = new_messages[0]
+        if answer.get("role") != "assistant" or answer.get("tool_calls"):
+            return
+
+        key = self._agent_key(agent)
+        now = time.time()
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None or index.vectors.shape[1] != len(vector):
+                index = self._indexes[key] = _AgentIndex(len(vector))
+            self._expire(index, now)
+            if len(index) >= self.max_entries:
+                # entries are appended in time order, so the oldest come first
+                keep = np.arange(len(index)) > len(index) - self.max_entries
+                index.keep(keep)
+            index.vectors = np.vstack([index.vectors, vector[None, :]])
+            index.created_at = np.append(index.created_at, now)
+            index.answers.append(copy.deepcopy(answer))
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": sum(len(index) for index in self._indexes.values()),
+            }
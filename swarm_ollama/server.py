@@ -0,0 +1,413 @@
+import asyncio
+import json
+from typing import Any, Dict, Iterable, Optional, Union
+
+from .admission import AdmissionRejected, Priority
+from .core import AsyncSwarm
+from .logging import setup_logging
+from .retry import CircuitOpenError
+from .types import Agent, Response
+
+logger = setup_logging(__name__)
+
+_DONE = object()
+
+
+class _HTTPError(Exception):
+    def __init__(self, status: int, message: str, headers: Optional[list] = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or []
+
+
+class _Disconnected(Exception):
+    """The client went away before the response was sent."""
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, default=str).encode("utf-8")
+
+
+def serialize_response(response: Response) -> Dict[str, Any]:
+    """A `Response` as JSON, with the agent reduced to its name."""
+    return {
+        "messages": response.messages,
+        "agent": response.agent.name if response.agent else None,
+        "context_variables": response.context_variables,
+        "usage": response.usage.summary(),
+    }
+
+
+def _positive(body: Dict[str, Any], key: str, integer: bool = False):
+    """The positive number at `key` of a request body, or None if absent."""
+    value = body.get(key)
+    if value is None:
+        return None
+    types = int if integer else (int, float)
+    if isinstance(value, bool) or not isinstance(value, types) or value <= 0:
+        kind = "integer" if integer else "number"
+        raise _HTTPError(400, f"`{key}` must be a positive {kind}.")
+    return value
+
+
+def _sse(event: str, data: Any) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + _dumps(data) + b"\n\n"
+
+
+class SwarmApp:
+    """
+    ASGI application serving Swarm runs over HTTP.
+
+    Endpoints:
+        GET  /healthz  Liveness, and whether the app is draining.
+        GET  /agents   The registered agents.
+        POST /run      Run a conversation; returns the `Response` as JSON.
+        POST /stream   Run a conversation, streaming `run_and_stream` events as
+                       Server-Sent Events (`delim`, `delta`, then `response`).
+
+    Request bodies are JSON objects with `agent` (a registered name, defaults to
+    the first agent), `messages`, and optionally `context_variables`,
+    `model_override`, `max_turns`, `priority` ("interactive" or "batch") and
+    `deadline` (seconds). With a `session_id` (and a swarm created with a session
+    store), `messages` holds only the new messages of the turn and the
+    conversation is continued from the store.
+
+    Errors are JSON objects with an `error` message: invalid fields get a 400,
+    runs rejected by admission control or an open circuit a 503, and runs that
+    cannot reach Ollama a 502.
+
+    Streams buffer at most `max_buffered_events` events per client: when a client
+    reads slowly, the run waits, and a client that does not read for
+    `slow_client_timeout` seconds is disconnected. On shutdown (ASGI lifespan),
+    new requests get a 503 while running ones get `drain_timeout` seconds to
+    finish.
+
+    Args:
+        agents: Agents by name, or a list of agents registered under their names.
+        swarm (AsyncSwarm, optional): The swarm running the agents.
+        max_concurrent_runs (int): Runs in flight before requests get a 503.
+        max_buffered_events (int): Stream events buffered per client.
+        slow_client_timeout (float): Seconds a stream may wait on its client.
+        drain_timeout (float): Seconds running requests get on shutdown.
+        max_body_bytes (int): Maximum request body size.
+    """
+
+    def __init__(
+        self,
+        agents: Union[Dict[str, Agent], Iterable[Agent]],
+        swarm: Optional[AsyncSwarm] = None,
+        max_concurrent_runs: int = 64,
+        max_buffered_events: int = 64,
+        slow_client_timeout: float = 30.0,
+        drain_timeout: float = 30.0,
+        max_body_bytes: int = 1024 * 1024,
+    ):
+        if not isinstance(agents, dict):
+            agents = {agent.name: agent for agent in agents}
+        if not agents:
+            raise ValueError("SwarmApp needs at least one agent.")
+        self.agents = agents
+        self.swarm = swarm or AsyncSwarm()
+        self.max_concurrent_runs = max_concurrent_runs
+        self.max_buffered_events = max_buffered_events
+        self.slow_client_timeout = slow_client_timeout
+        self.drain_timeout = drain_timeout
+        self.max_body_bytes = max_body_bytes
+        self.draining = False
+        self._active = set()
+        self._runs = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.drain()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def drain(self) -> None:
+        """
+        Stop accepting runs and wait up to `drain_timeout` seconds for running
+        ones, then cancel the rest.
+        """
+        self.draining = True
+        if not self._active:
+            return
+        logger.info("Draining %s running requests", len(self._active))
+        _, pending = await asyncio.wait(self._active, timeout=self.drain_timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+
+    async def _http(self, scope, receive, send):
+        route = (scope["method"], scope["path"].rstrip("/") or "/")
+        handlers = {
+            ("GET", "/healthz"): self._healthz,
+            ("GET", "/agents"): self._agents,
+            ("POST", "/run"): self._run,
+            ("POST", "/stream"): self._stream,
+        }
+        handler = handlers.get(route)
+        reserved = False
+        try:
+            if handler is None:
+                known = {path for _, path in handlers}
+                if route[1] in known:
+                    raise _HTTPError(405, "Method not allowed.")
+                raise _HTTPError(404, "Not found.")
+            if route[0] == "POST":
+                if self.draining:
+                    raise _HTTPError(503, "Shutting down.", [(b"retry-after", b"1")])
+                if self._runs >= self.max_concurrent_runs:
+                    raise _HTTPError(503, "Too many runs.", [(b"retry-after", b"1")])
+                # taken before the first await, so requests arriving together
+                # cannot all pass the check
+                self._runs += 1
+                reserved = True
+            await handler(scope, receive, send)
+        except _HTTPError as e:
+            await self._send_json(send, e.status, {"error": str(e)}, e.headers)
+        except _Disconnected:
+            pass
+        finally:
+            if reserved:
+                self._runs -= 1
+
+    async def _send_json(self, send, status: int, payload: Any, headers=()):
+        body = _dumps(payload)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    *headers,
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    async def _healthz(self, scope, receive, send):
+        status = "draining" if self.draining else "ok"
+        await self._send_json(
+            send,
+            503 if self.draining else 200,
+            {"status": status, "active_runs": self._runs},
+        )
+
+    async def _agents(self, scope, receive, send):
+        await self._send_json(
+            send,
+            200,
+            [
+                {
+                    "name": name,
+                    "model": agent.model,
+                    "functions": [
+                        getattr(f, "__name__", repr(f)) for f in agent.functions
+                    ],
+                }
+                for name, agent in self.agents.items()
+            ],
+        )
+
+    async def _read_json(self, receive) -> Dict[str, Any]:
+        chunks, size = [], 0
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                raise _Disconnected()
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_body_bytes:
+                raise _HTTPError(413, "Request body too large.")
+            chunks.append(chunk)
+            if not message.get("more_body"):
+                break
+        try:
+            body = json.loads(b"".join(chunks) or b"{}")
+        except ValueError as e:
+            raise _HTTPError(400, f"Invalid JSON: {e}")
+        if not isinstance(body, dict):
+            raise _HTTPError(400, "Expected a JSON object.")
+        return body
+
+    def _run_kwargs(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        name = body.get("agent") or next(iter(self.agents))
+        if not isinstance(name, str):
+            raise _HTTPError(400, "`agent` must be an agent name.")
+        agent = self.agents.get(name)
+        if agent is None:
+            raise _HTTPError(404, f"Unknown agent: {name}")
+        session_id = body.get("session_id")
+        messages = body.get("messages", [] if session_id is not None else None)
+        if not isinstance(messages, list):
+            raise _HTTPError(400, "`messages` must be a list.")
+        context_variables = body.get("context_variables")
+        if context_variables is None:
+            context_variables = {}
+        elif not isinstance(context_variables, dict):
+            raise _HTTPError(400, "`context_variables` must be an object.")
+        if session_id is not None and self.swarm.sessions is None:
+            raise _HTTPError(400, "This server does not keep sessions.")
+        try:
+            priority = Priority[str(body.get("priority", "interactive")).upper()]
+        except KeyError:
+            raise _HTTPError(400, f"Unknown priority: {body.get('priority')}")
+        kwargs = {
+            "agent": agent,
+            "messages": messages,
+            "context_variables": context_variables,
+            "model_override": body.get("model_override"),
+            "priority": priority,
+            "deadline": _positive(body, "deadline"),
+        }
+        if session_id is not None:
+            # the stored history comes first; `messages` holds the new turn only
+            kwargs["messages"] = None
+            kwargs["session_id"] = str(session_id)
+            kwargs["new_messages"] = messages
+        max_turns = _positive(body, "max_turns", integer=True)
+        if max_turns is not None:
+            kwargs["max_turns"] = max_turns
+        return kwargs
+
+    async def _track(self, coro, receive):
+        """
+        Run `coro` as a tracked task (for draining), cancelling it if the client
+        disconnects.
+        """
+        task = asyncio.ensure_future(coro)
+        self._active.add(task)
+        disconnected = False
+
+        async def watch():
+            nonlocal disconnected
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            disconnected = True
+            task.cancel()
+
+        watcher = asyncio.ensure_future(watch())
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if disconnected:
+                raise _Disconnected()
+            raise
+        finally:
+            watcher.cancel()
+            self._active.discard(task)
+
+    async def _run(self, scope, receive, send):
+        kwargs = self._run_kwargs(await self._read_json(receive))
+        try:
+            response = await self._track(self.swarm.run(**kwargs), receive)
+        except (AdmissionRejected, CircuitOpenError) as e:
+            raise _HTTPError(503, str(e), [(b"retry-after", b"1")])
+        except ConnectionError as e:
+            raise _HTTPError(502, str(e))
+        except asyncio.CancelledError:
+            if self.draining:
+                raise _HTTPError(503, "Shut down before the run finished.")
+            raise
+        except Exception as e:
+            logger.exception("Run failed")
+            raise _HTTPError(500, f"Run failed: {e}")
+        await self._send_json(send, 200, serialize_response(response))
+
+    async def _stream(self, scope, receive, send):
+        kwargs = self._run_kwargs(await self._read_json(receive))
+        events = asyncio.Queue(maxsize=self.max_buffered_events)
+
+        async def produce():
+            try:
+                async for event in self.swarm.run_and_stream(**kwargs):
+                    if "response" in event:
+                        name, data = "response", serialize_response(event["response"])
+                    elif "delim" in event:
+                        name, data = "delim", event["delim"]
+                    else:
+                        name, data = "delta", event
+                    # a full buffer means the client reads slowly: wait for it
+                    await asyncio.wait_for(
+                        events.put(_sse(name, data)), self.slow_client_timeout
+                    )
+            except asyncio.TimeoutError:
+                logger.warning("Dropping a stream whose client stopped reading")
+                return
+            except AdmissionRejected as e:
+                await events.put(_sse("error", {"error": str(e), "reason": e.reason}))
+            except Exception as e:
+                logger.exception("Streamed run failed")
+                await events.put(_sse("error", {"error": str(e)}))
+            await events.put(_DONE)
+
+        async def send_or_drop(message):
+            # a client that stops reading must not hold the run forever
+            try:
+                await asyncio.wait_for(send(message), self.slow_client_timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Dropping a stream whose client stopped reading")
+                raise _Disconnected()
+
+        async def consume():
+            await send_or_drop(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [
+                        (b"content-type", b"text/event-stream"),
+                        (b"cache-control", b"no-cache"),
+                        (b"x-accel-buffering", b"no"),
+                    ],
+                }
+            )
+            producer = asyncio.ensure_future(produce())
+            try:
+                while not (producer.done() and events.empty()):
+                    get = asyncio.ensure_future(events.get())
+                    # stop waiting if the producer gives up without a final event
+                    waiters = {get} if producer.done() else {get, producer}
+                    await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+                    if not get.done():
+                        get.cancel()
+                        continue
+                    event = get.result()
+                    if event is _DONE:
+                        break
+                    await send_or_drop(
+                        {"type": "http.response.body", "body": event, "more_body": True}
+                    )
+            finally:
+                producer.cancel()
+            await send_or_drop({"type": "http.response.body", "body": b""})
+
+        try:
+            await self._track(consume(), receive)
+        except asyncio.CancelledError:
+            if not self.draining:
+                raise
+
+
+def serve(app: SwarmApp, host: str = "127.0.0.1", port: int = 8000, **kwargs) -> None:
+    """
+    Serve `app` with uvicorn (`pip install uvicorn`).
+    """
+    try:
+        import uvicorn
+    except ImportError as e:
+        raise ImportError(
+            "Serving a SwarmApp requires uvicorn: pip install uvicorn"
+        ) from e
+    uvicorn.run(app, host=host, port=port, lifespan="on", **kwargs)
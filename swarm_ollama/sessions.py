@@ -0,0 +1,200 @@
+import copy
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class Session:
+    """
+    A conversation kept server-side between runs.
+
+    Attributes:
+        session_id (str): The key of the session.
+        messages (List[dict]): The full history, oldest first.
+        agent_name (str, optional): Name of the agent that answered last.
+        context_variables (dict): Context variables after the last run.
+    """
+
+    session_id: str
+    messages: List[dict] = field(default_factory=list)
+    agent_name: Optional[str] = None
+    context_variables: Dict[str, Any] = field(default_factory=dict)
+
+
+class SessionStore:
+    """
+    Where `Swarm.run(session_id=...)` keeps conversations.
+
+    Stores only ever append to a history, so a turn writes its new messages
+    rather than the whole conversation.
+    """
+
+    def load(self, session_id: str) -> Optional[Session]:
+        """Return the session, or None if it does not exist. The returned
+        `messages` list is the caller's to extend."""
+        raise NotImplementedError
+
+    def append(
+        self,
+        session_id: str,
+        messages: List[dict],
+        agent_name: Optional[str],
+        context_variables: Dict[str, Any],
+    ) -> None:
+        """Append `messages` to the session, creating it if needed, and record
+        the active agent and context variables."""
+        raise NotImplementedError
+
+    def delete(self, session_id: str) -> None:
+        raise NotImplementedError
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    Sessions kept in process, least recently used evicted first.
+
+    Args:
+        max_sessions (int, optional): Sessions kept before evicting. Unbounded
+            by default.
+    """
+
+    def __init__(self, max_sessions: Optional[int] = None):
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def load(self, session_id: str) -> Optional[Session]:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            self._sessions.move_to_end(session_id)
+            # a new list of the same message dicts, which are never mutated
+            return Session(
+                session_id,
+                list(session.messages),
+                session.agent_name,
+                dict(session.context_variables),
+            )
+
+    def append(
+        self,
+        session_id: str,
+        messages: List[dict],
+        agent_name: Optional[str],
+        context_variables: Dict[str, Any],
+    ) -> None:
+        # only the new messages are copied, so callers may reuse their dicts
+        messages = copy.deepcopy(messages)
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._sessions[session_id] = Session(session_id)
+            self._sessions.move_to_end(session_id)
+            session.messages.extend(messages)
+            session.agent_name = agent_name
+            session.context_variables = dict(context_variables)
+            while (
+                self.max_sessions is not None
+                and len(self._sessions) > self.max_sessions
+            ):
+                self._sessions.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Sessions stored in SQLite, so they survive restarts and can be shared by
+    processes on one machine.
+
+    Each message is a row, so a turn inserts its new messages only.
+
+    Args:
+        path (str): The database file. Created if missing.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "id TEXT PRIMARY KEY, agent TEXT, context_variables TEXT NOT NULL, "
+                "updated_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS session_messages ("
+                "session_id TEXT NOT NULL, seq INTEGER NOT NULL, message TEXT NOT NULL, "
+                "PRIMARY KEY (session_id, seq))"
+            )
+
+    def load(self, session_id: str) -> Optional[Session]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT agent, context_variables FROM sessions WHERE id = ?",
+                (session_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            messages = self._conn.execute(
+                "SELECT message FROM session_messages WHERE session_id = ? "
+                "ORDER BY seq",
+                (session_id,),
+            ).fetchall()
+        return Session(
+            session_id,
+            [json.loads(message) for (message,) in messages],
+            row[0],
+            json.loads(row[1]),
+        )
+
+    def append(
+        self,
+        session_id: str,
+        messages: List[dict],
+        agent_name: Optional[str],
+        context_variables: Dict[str, Any],
+    ) -> None:
+        rows = [json.dumps(m, ensure_ascii=False, default=str) for m in messages]
+        context = json.dumps(context_variables, ensure_ascii=False, default=str)
+        with self._lock, self._conn:
+            (last,) = self._conn.execute(
+                "SELECT COALESCE(MAX(seq), -1) FROM session_messages "
+                "WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+            self._conn.executemany(
+                "INSERT INTO session_messages (session_id, seq, message) "
+                "VALUES (?, ?, ?)",
+                [(session_id, last + 1 + i, row) for i, row in enumerate(rows)],
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sessions "
+                "(id, agent, context_variables, updated_at) VALUES (?, ?, ?, ?)",
+                (session_id, agent_name, context, time.time()),
+            )
+
+    def delete(self, session_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM session_messages WHERE session_id = ?", (session_id,)
+            )
+            self._conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,108 @@
+import inspect
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import List, Mapping, Tuple
+
+from .types import AgentFunction
+from .util import function_to_json
+
+__CTX_VARS_NAME__ = "context_variables"
+
+_TOOLSET_CACHE_SIZE = 256
+_toolset_cache = OrderedDict()
+_toolset_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class ToolSpec:
+    """
+    Everything Swarm needs to advertise and call one agent function.
+
+    Attributes:
+        name (str): The tool name exposed to the model.
+        function (AgentFunction): The underlying agent function.
+        schema (dict): The tool schema, with `context_variables` hidden. Shared
+            between turns, so it must be treated as read-only.
+        takes_context_variables (bool): Whether to pass `context_variables`.
+        is_async (bool): Whether the function is a coroutine or async generator function.
+    """
+
+    name: str
+    function: AgentFunction
+    schema: dict
+    takes_context_variables: bool
+    is_async: bool
+
+
+@dataclass(frozen=True)
+class ToolSet:
+    """
+    The compiled tools of an agent.
+
+    Attributes:
+        specs (Tuple[ToolSpec, ...]): One spec per function, in agent order.
+        schemas (Tuple[dict, ...]): The schemas to send as `tools`.
+        by_name (Mapping[str, ToolSpec]): Specs indexed by tool name.
+    """
+
+    specs: Tuple[ToolSpec, ...]
+    schemas: Tuple[dict, ...]
+    by_name: Mapping[str, ToolSpec]
+
+
+def compile_tool(func: AgentFunction) -> ToolSpec:
+    """
+    Build the `ToolSpec` of a single agent function.
+    """
+    schema = function_to_json(func)
+    # hide context_variables from model
+    params = schema["function"]["parameters"]
+    takes_context_variables = (
+        params["properties"].pop(__CTX_VARS_NAME__, None) is not None
+    )
+    if __CTX_VARS_NAME__ in params["required"]:
+        params["required"].remove(__CTX_VARS_NAME__)
+
+    return ToolSpec(
+        name=func.__name__,
+        function=func,
+        schema=schema,
+        takes_context_variables=takes_context_variables,
+        is_async=inspect.iscoroutinefunction(func) or inspect.isasyncgenfunction(func),
+    )
+
+
+def compile_tools(functions: List[AgentFunction]) -> ToolSet:
+    """
+    Return the `ToolSet` for a list of agent functions, compiling it at most once.
+
+    Tool sets are cached by the identity of the functions, in order, so an agent
+    whose `functions` list changes simply maps to a new entry.
+
+    Args:
+        functions: The agent functions.
+
+    Returns:
+        The cached or freshly compiled `ToolSet`.
+    """
+    key = tuple(map(id, functions))
+    with _toolset_lock:
+        toolset = _toolset_cache.get(key)
+        if toolset is not None:
+            _toolset_cache.move_to_end(key)
+            return toolset
+
+    specs = tuple(compile_tool(f) for f in functions)
+    # the cached specs keep the functions alive, so their ids cannot be reused
+    toolset = ToolSet(
+        specs=specs,
+        schemas=tuple(spec.schema for spec in specs),
+        by_name=MappingProxyType({spec.name: spec for spec in specs}),
+    )
+    with _toolset_lock:
+        _toolset_cache[key] = toolset
+        if len(_toolset_cache) > _TOOLSET_CACHE_SIZE:
+            _toolset_cache.popitem(last=False)
+    return toolset
@@ -0,0 +1,373 @@
+import contextvars
+import json
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .hooks import RunInfo, SwarmHooks
+from .logging import setup_logging
+from .types import Response, TurnUsage
+
+logger = setup_logging(__name__)
+
+# converts `time.monotonic()` timestamps to wall-clock time for exporters
+_EPOCH_OFFSET = time.time() - time.monotonic()
+
+# the open llm_call span, for `ChatCompletions.create` to nest its span under
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "swarm_ollama_current_span", default=None
+)
+
+
+class _Trace:
+    """The spans of one sampled run."""
+
+    def __init__(self, lane: int):
+        self.trace_id = os.urandom(16).hex()
+        self.lane = lane
+        self.spans: List["Span"] = []
+
+
+@dataclass
+class Span:
+    """
+    A timed operation of a run. Times are `time.monotonic()` seconds.
+
+    Attributes:
+        name (str): `run`, `turn`, `llm_call`, `chat.create`, `tool_call` or
+            `handoff`.
+        trace_id (str): Shared by the spans of a run.
+        span_id (str): Unique id of the span.
+        parent_id (str, optional): The enclosing span.
+        start (float): When the span started.
+        end (float, optional): When it ended; None while open.
+        attributes (dict): Model, agent, token counts, payload sizes...
+    """
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start: float
+    end: Optional[float] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    _trace: Optional[_Trace] = field(default=None, repr=False, compare=False)
+
+    @property
+    def duration(self) -> Optional[float]:
+        return None if self.end is None else self.end - self.start
+
+    @property
+    def lane(self) -> int:
+        """The run the span belongs to, as a small integer (a Chrome trace row)."""
+        return self._trace.lane if self._trace else 0
+
+    def child(self, name: str, ts: Optional[float] = None, **attributes) -> "Span":
+        span = Span(
+            name=name,
+            trace_id=self.trace_id,
+            span_id=os.urandom(8).hex(),
+            parent_id=self.span_id,
+            start=time.monotonic() if ts is None else ts,
+            attributes=attributes,
+            _trace=self._trace,
+        )
+        if self._trace is not None:
+            self._trace.spans.append(span)
+        return span
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    def finish(self, ts: Optional[float] = None, **attributes) -> None:
+        if self.end is None:
+            self.attributes.update(attributes)
+            self.end = time.monotonic() if ts is None else ts
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start + _EPOCH_OFFSET,
+            "duration": self.duration,
+            "attributes": self.attributes,
+        }
+
+
+def current_span() -> Optional[Span]:
+    """The open span a traced chat completion is nested under, if any."""
+    span = _current_span.get()
+    return span if span is not None and span.end is None else None
+
+
+class SpanExporter:
+    """Receives the spans of each sampled run once the run ends."""
+
+    def export(self, spans: List[Span]) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class InMemoryExporter(SpanExporter):
+    """Keeps exported spans in `spans`, for tests and notebooks."""
+
+    def __init__(self):
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        with self._lock:
+            self.spans.extend(spans)
+
+
+class JSONLExporter(SpanExporter):
+    """
+    Appends spans to a file, one JSON object per line.
+
+    Args:
+        path (str): The file to append to.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def export(self, spans: List[Span]) -> None:
+        lines = "".join(
+            json.dumps(span.to_dict(), ensure_ascii=False, default=str) + "\n"
+            for span in spans
+        )
+        with self._lock:
+            self._file.write(lines)
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class ChromeTraceExporter(SpanExporter):
+    """
+    Writes spans as Chrome trace events, to open in `chrome://tracing` or
+    Perfetto. Each run is a row.
+
+    The file uses the trace-event array format without its closing bracket,
+    which the viewers accept, so events can be appended as runs end.
+
+    Args:
+        path (str): The file to write. Overwritten.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "w", encoding="utf-8")
+        self._file.write("[\n")
+        self._pid = os.getpid()
+
+    def _event(self, span: Span) -> Dict[str, Any]:
+        return {
+            "name": span.name,
+            "cat": "swarm",
+            "ph": "X",
+            "ts": (span.start + _EPOCH_OFFSET) * 1e6,
+            "dur": (span.duration or 0.0) * 1e6,
+            "pid": self._pid,
+            "tid": span.lane,
+            "args": span.attributes,
+        }
+
+    def export(self, spans: List[Span]) -> None:
+        events = "".join(
+            json.dumps(self._event(span), ensure_ascii=False, default=str) + ",\n"
+            for span in spans
+        )
+        with self._lock:
+            self._file.write(events)
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+def _content_size(messages) -> int:
+    return sum(len(m.get("content") or "") for m in messages)
+
+
+class Tracer(SwarmHooks):
+    """
+    Span-based tracing of Swarm runs, as hooks: `Swarm(hooks=[Tracer(...)])`.
+
+    Spans nest as run → turn → llm_call (→ chat.create) / tool_call / handoff,
+    and are handed to the exporter when their run ends. Only a `sample_ratio`
+    fraction of runs is traced; the others record nothing.
+
+    Args:
+        exporter (SpanExporter): Where finished runs go.
+        sample_ratio (float): Fraction of runs traced, between 0 and 1.
+    """
+
+    def __init__(self, exporter: SpanExporter, sample_ratio: float = 1.0):
+        self.exporter = exporter
+        self.sample_ratio = sample_ratio
+        self.sampled = 0
+        self.dropped = 0
+
+    def _spans(self, run: RunInfo) -> Optional[Dict[str, Any]]:
+        # keyed by tracer, so several tracers can follow the same run
+        return run.extra.get(self)
+
+    def on_run_start(self, run: RunInfo, messages: List[dict], ts: float) -> None:
+        if self.sample_ratio < 1.0 and random.random() >= self.sample_ratio:
+            self.dropped += 1
+            return
+        self.sampled += 1
+        trace = _Trace(lane=run.run_id)
+        root = Span(
+            name="run",
+            trace_id=trace.trace_id,
+            span_id=os.urandom(8).hex(),
+            parent_id=None,
+            start=ts,
+            attributes={
+                "run_id": run.run_id,
+                "agent": run.agent.name,
+                "messages": len(messages),
+                "message_chars": _content_size(messages),
+            },
+            _trace=trace,
+        )
+        trace.spans.append(root)
+        run.extra[self] = {"run": root, "turn": None, "llm": None, "tools": {}}
+
+    def on_turn_start(self, run: RunInfo, ts: float) -> None:
+        spans = self._spans(run)
+        if spans is None:
+            return
+        if spans["turn"] is not None:
+            spans["turn"].finish(ts)
+        spans["turn"] = spans["run"].child(
+            "turn", ts, turn=run.turn, agent=run.agent.name
+        )
+
+    def on_request_sent(self, run: RunInfo, request: Dict[str, Any], ts: float) -> None:
+        spans = self._spans(run)
+        if spans is None:
+            return
+        span = spans["turn"].child(
+            "llm_call",
+            ts,
+            agent=run.agent.name,
+            model=request.get("model"),
+            stream=request.get("stream", False),
+            messages=len(request.get("messages") or ()),
+            message_chars=_content_size(request.get("messages") or ()),
+            tools=len(request.get("tools") or ()),
+        )
+        spans["llm"] = span
+        _current_span.set(span)
+
+    def on_first_token(self, run: RunInfo, ts: float) -> None:
+        spans = self._spans(run)
+        if spans is not None and spans["llm"] is not None:
+            spans["llm"].set(time_to_first_token=ts - spans["llm"].start)
+
+    def on_completion(
+        self, run: RunInfo, message: dict, usage: TurnUsage, ts: float
+    ) -> None:
+        spans = self._spans(run)
+        if spans is None or spans["llm"] is None:
+            return
+        spans["llm"].finish(
+            ts,
+            prompt_tokens=usage.prompt_tokens,
+            completion_tokens=usage.completion_tokens,
+            tokens_per_second=usage.tokens_per_second,
+            load_duration=usage.load_duration,
+            cached=usage.cached,
+            response_chars=len(message.get("content") or ""),
+            tool_calls=len(message.get("tool_calls") or ()),
+        )
+        spans["llm"] = None
+        _current_span.set(None)
+
+    def on_tool_start(self, run: RunInfo, tool_call: Any, ts: float) -> None:
+        spans = self._spans(run)
+        if spans is None:
+            return
+        spans["tools"][id(tool_call)] = spans["turn"].child(
+            "tool_call",
+            ts,
+            tool=tool_call.function.name,
+            argument_chars=len(tool_call.function.arguments or ""),
+        )
+
+    def on_tool_end(
+        self,
+        run: RunInfo,
+        tool_call: Any,
+        result: Any,
+        error: Optional[BaseException],
+        ts: float,
+    ) -> None:
+        spans = self._spans(run)
+        if spans is None:
+            return
+        span = spans["tools"].pop(id(tool_call), None)
+        if span is None:
+            return
+        if error is not None:
+            span.set(error=repr(error))
+        span.finish(ts)
+
+    def on_handoff(self, run, from_agent, to_agent, ts: float) -> None:
+        spans = self._spans(run)
+        if spans is None:
+            return
+        span = spans["turn"].child(
+            "handoff", ts, from_agent=from_agent.name, to_agent=to_agent.name
+        )
+        span.finish(ts)
+
+    def on_run_end(
+        self,
+        run: RunInfo,
+        response: Optional[Response],
+        error: Optional[BaseException],
+        ts: float,
+    ) -> None:
+        spans = run.extra.pop(self, None)
+        if spans is None:
+            return
+        if _current_span.get() is spans["llm"]:
+            _current_span.set(None)
+        root = spans["run"]
+        if error is not None:
+            root.set(error=repr(error))
+        if response is not None:
+            root.set(
+                final_agent=response.agent.name if response.agent else None,
+                turns=run.turn,
+                prompt_tokens=response.usage.prompt_tokens,
+                completion_tokens=response.usage.completion_tokens,
+                tool_time=response.usage.tool_time,
+            )
+        # close whatever the error interrupted, then the run
+        for span in root._trace.spans:
+            span.finish(ts)
+        try:
+            self.exporter.export(root._trace.spans)
+        except Exception:
+            logger.exception("Exporting the trace of run %s failed", run.run_id)
+
+    def close(self) -> None:
+        self.exporter.close()
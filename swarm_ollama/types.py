@@ -3,12 +3,21 @@ from openai.types.chat.chat_completion_message_tool_call import (
     ChatCompletionMessageToolCall,
     Function,
 )
-from typing import List, Callable, Union, Optional
+from typing import AsyncIterator, Awaitable, Dict, List, Callable, Union, Optional
 
 # Third-party imports
 from pydantic import BaseModel
 
-AgentFunction = Callable[[], Union[str, "Agent", dict]]
+AgentFunction = Callable[
+    ...,
+    Union[
+        str,
+        "Agent",
+        dict,
+        Awaitable[Union[str, "Agent", dict]],
+        AsyncIterator[Union[str, "Agent", dict]],
+    ],
+]
 
 
 class Agent(BaseModel):
@@ -18,12 +27,126 @@ class Agent(BaseModel):
     functions: List[AgentFunction] = []
     tool_choice: str = None
     parallel_tool_calls: bool = True
+    keep_alive: Optional[Union[float, str]] = None
+
+
+class TurnUsage(BaseModel):
+    """
+    Token counts and timings of one completion of a run, in seconds.
+
+    Attributes:
+        agent (str): Name of the agent that asked for the completion.
+        model (str): The model that answered.
+        prompt_tokens (int): Prompt tokens evaluated (Ollama `prompt_eval_count`).
+        completion_tokens (int): Tokens generated (Ollama `eval_count`).
+        prompt_eval_duration (float): Time Ollama spent on the prompt.
+        eval_duration (float): Time Ollama spent generating.
+        load_duration (float): Time Ollama spent loading the model.
+        total_duration (float): Total time Ollama spent on the request.
+        wall_time (float): Time the completion took, seen from the client.
+        time_to_first_token (float, optional): Measured for streams; estimated
+            from the load and prompt durations otherwise.
+        tool_time (float): Wall time of the tool calls that followed.
+        cached (bool): Whether the completion came from a cache.
+    """
+
+    agent: str = ""
+    model: str = ""
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    prompt_eval_duration: float = 0.0
+    eval_duration: float = 0.0
+    load_duration: float = 0.0
+    total_duration: float = 0.0
+    wall_time: float = 0.0
+    time_to_first_token: Optional[float] = None
+    tool_time: float = 0.0
+    cached: bool = False
+
+    @property
+    def tokens_per_second(self) -> float:
+        return (
+            self.completion_tokens / self.eval_duration if self.eval_duration else 0.0
+        )
+
+    @property
+    def prompt_tokens_per_second(self) -> float:
+        if not self.prompt_eval_duration:
+            return 0.0
+        return self.prompt_tokens / self.prompt_eval_duration
+
+
+class Usage(BaseModel):
+    """
+    The `TurnUsage` of every completion of a run, with totals. Add the usages of
+    successive runs to aggregate a conversation.
+    """
+
+    turns: List[TurnUsage] = []
+
+    def _total(self, field: str) -> float:
+        return sum(getattr(turn, field) for turn in self.turns)
+
+    @property
+    def prompt_tokens(self) -> int:
+        return self._total("prompt_tokens")
+
+    @property
+    def completion_tokens(self) -> int:
+        return self._total("completion_tokens")
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    @property
+    def tool_time(self) -> float:
+        return self._total("tool_time")
+
+    @property
+    def wall_time(self) -> float:
+        return self._total("wall_time")
+
+    @property
+    def tokens_per_second(self) -> float:
+        eval_duration = self._total("eval_duration")
+        return self.completion_tokens / eval_duration if eval_duration else 0.0
+
+    def __add__(self, other: "Usage") -> "Usage":
+        return Usage(turns=self.turns + other.turns)
+
+    def _group(self, key: str) -> Dict[str, "Usage"]:
+        groups: Dict[str, Usage] = {}
+        for turn in self.turns:
+            groups.setdefault(getattr(turn, key), Usage()).turns.append(turn)
+        return groups
+
+    def by_agent(self) -> Dict[str, "Usage"]:
+        return self._group("agent")
+
+    def by_model(self) -> Dict[str, "Usage"]:
+        return self._group("model")
+
+    def summary(self) -> dict:
+        """Totals as a JSON-friendly dict."""
+        return {
+            "turns": len(self.turns),
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "prompt_eval_duration": self._total("prompt_eval_duration"),
+            "eval_duration": self._total("eval_duration"),
+            "load_duration": self._total("load_duration"),
+            "wall_time": self.wall_time,
+            "tool_time": self.tool_time,
+            "tokens_per_second": self.tokens_per_second,
+        }
 
 
 class Response(BaseModel):
     messages: List = []
     agent: Optional[Agent] = None
     context_variables: dict = {}
+    usage: Usage = Usage()
 
 
 class Result(BaseModel):
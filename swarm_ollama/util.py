@@ -1,5 +1,14 @@
+import asyncio
 import inspect
+import json
+import threading
+from concurrent.futures import Future
 from datetime import datetime
+from typing import Coroutine
+
+_background_loop = None
+_background_thread = None
+_background_lock = threading.Lock()
 
 
 def debug_print(debug: bool, *args: str) -> None:
@@ -10,6 +19,43 @@ def debug_print(debug: bool, *args: str) -> None:
     print(f"\033[97m[\033[90m{timestamp}\033[97m]\033[90m {message}\033[0m")
 
 
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the process-wide event loop used to run coroutines from sync code.
+
+    The loop is started lazily in a daemon thread and shared by every `Swarm`.
+    """
+    global _background_loop, _background_thread
+    with _background_lock:
+        if _background_loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever, name="swarm-async-tools", daemon=True
+            )
+            thread.start()
+            _background_loop, _background_thread = loop, thread
+    return _background_loop
+
+
+def submit_coroutine(coro: Coroutine) -> Future:
+    """
+    Schedule `coro` on the background loop and return a `concurrent.futures.Future`.
+    """
+    loop = get_background_loop()
+    if threading.current_thread() is _background_thread:
+        coro.close()
+        raise RuntimeError(
+            "Cannot block on the background loop from within itself; "
+            "use AsyncSwarm inside async agent functions."
+        )
+    return asyncio.run_coroutine_threadsafe(coro, loop)
+
+
+def run_coroutine_sync(coro: Coroutine):
+    """Run `coro` on the background loop and block until it completes."""
+    return submit_coroutine(coro).result()
+
+
 def merge_fields(target, source):
     for key, value in source.items():
         if isinstance(value, str):
@@ -22,10 +68,74 @@ def merge_chunk(final_response: dict, delta: dict) -> None:
     delta.pop("role", None)
     merge_fields(final_response, delta)
 
-    tool_calls = delta.get("tool_calls")
-    if tool_calls and len(tool_calls) > 0:
-        index = tool_calls[0].pop("index")
-        merge_fields(final_response["tool_calls"][index], tool_calls[0])
+    for tool_call in delta.get("tool_calls") or []:
+        index = tool_call.pop("index")
+        merge_fields(final_response["tool_calls"][index], tool_call)
+
+
+def delta_to_dict(delta) -> dict:
+    """
+    Return a streamed delta as a plain dict, without a JSON round trip.
+
+    Accepts dicts, Swarm's own `Delta`, and pydantic deltas such as OpenAI's
+    `ChoiceDelta`. The result is owned by the caller.
+    """
+    if isinstance(delta, dict):
+        return delta
+    if hasattr(delta, "model_dump"):
+        return delta.model_dump()
+    return json.loads(delta.json())
+
+
+class MessageAccumulator:
+    """
+    Assemble streamed deltas into an assistant message.
+
+    Content and tool call fragments are buffered in lists and joined once, in
+    `build`, instead of being concatenated chunk by chunk.
+    """
+
+    __slots__ = ("_content", "_tool_calls")
+
+    def __init__(self):
+        self._content = []
+        self._tool_calls = {}  # index -> [id, type, name, arguments] part lists
+
+    def add(self, delta: dict) -> None:
+        content = delta.get("content")
+        if content:
+            self._content.append(content)
+
+        for tool_call in delta.get("tool_calls") or ():
+            parts = self._tool_calls.get(tool_call["index"])
+            if parts is None:
+                parts = self._tool_calls[tool_call["index"]] = ([], [], [], [])
+            if tool_call.get("id"):
+                parts[0].append(tool_call["id"])
+            if tool_call.get("type"):
+                parts[1].append(tool_call["type"])
+            function = tool_call.get("function") or {}
+            if function.get("name"):
+                parts[2].append(function["name"])
+            if function.get("arguments"):
+                parts[3].append(function["arguments"])
+
+    def build(self, sender: str) -> dict:
+        tool_calls = [
+            {
+                "function": {"arguments": "".join(arguments), "name": "".join(name)},
+                "id": "".join(id_),
+                "type": "".join(type_),
+            }
+            for id_, type_, name, arguments in self._tool_calls.values()
+        ]
+        return {
+            "content": "".join(self._content),
+            "sender": sender,
+            "role": "assistant",
+            "function_call": None,
+            "tool_calls": tool_calls or None,
+        }
 
 
 def function_to_json(func) -> dict:
@@ -85,3 +195,18 @@ def function_to_json(func) -> dict:
             },
         },
     }
+
+
+def percentile(values, q: float) -> float:
+    """
+    Return the `q`-th percentile (0-100) of `values`, interpolating linearly.
+
+    Returns 0.0 for an empty sequence.
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * q / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
@@ -2,10 +2,43 @@ import json
 from httpx import ConnectError
 from ollama._types import ResponseError
 from dataclasses import dataclass
-from typing import Any, Dict, List
-from .logging import setup_logging
+from typing import Any, Dict, List, Optional, Union
+from .balancer import BalancedClient
+from .cache import CompletionCache, cache_key
+from .logging import StructuredLogger, setup_logging
+from .retry import CircuitOpenError, RetryPolicy
+from .scheduler import ModelScheduler
+from .tracing import Span, current_span
 
 logger = setup_logging(__name__)
+log = StructuredLogger(logger)
+
+_FORMATTED_TOOLS_CACHE_SIZE = 256
+
+
+_USAGE_FIELDS = (
+    "prompt_eval_count",
+    "prompt_eval_duration",
+    "eval_count",
+    "eval_duration",
+    "load_duration",
+    "total_duration",
+)
+
+
+def _noop():
+    pass
+
+
+def _usage(response) -> Dict[str, int]:
+    """The token counters and durations (in nanoseconds) of an Ollama response."""
+    if response is None:
+        return {}
+    return {
+        field: response[field]
+        for field in _USAGE_FIELDS
+        if response.get(field) is not None
+    }
 
 
 @dataclass
@@ -76,9 +109,13 @@ class WrappedResponse:
 
     Args:
         ollama_response (Dict[str, Any]): The response from the Ollama client.
+        cached (bool): Whether the response was served from a cache, in which
+            case it reports no usage.
     """
 
-    def __init__(self, ollama_response: Dict[str, Any]):
+    def __init__(self, ollama_response: Dict[str, Any], cached: bool = False):
+        self.cached = cached
+        self.usage = {} if cached else _usage(ollama_response)
         message_data = ollama_response.get("message", {})
         message = Message(
             content=message_data.get("content", ""),
@@ -100,40 +137,305 @@ class WrappedResponse:
         self.choices = [Choice(message=message)]
 
 
+def _chat_span(host: str, model: str, stream: bool) -> Optional[Span]:
+    """A `chat.create` span under the traced llm_call, if the run is traced."""
+    parent = current_span()
+    if parent is None:
+        return None
+    # for streams, the span covers sending the request, not reading the reply
+    return parent.child("chat.create", host=host, model=model, stream=stream)
+
+
+def _as_dict(response) -> Dict[str, Any]:
+    """
+    Return an Ollama response as a plain dict.
+
+    Recent `ollama` clients return pydantic models instead of dicts.
+    """
+    if hasattr(response, "model_dump"):
+        return response.model_dump(exclude_none=True)
+    return response
+
+
+@dataclass
+class Delta:
+    """
+    An incremental message update, shaped like an OpenAI `ChoiceDelta`.
+
+    `tool_calls` holds `{"index", "id", "type", "function": {"name", "arguments"}}`
+    fragments to be merged by `index`.
+    """
+
+    content: Optional[str] = None
+    role: Optional[str] = None
+    function_call: Optional[Dict[str, Any]] = None
+    tool_calls: Optional[List[Dict[str, Any]]] = None
+
+    def model_dump(self) -> Dict[str, Any]:
+        return {
+            "content": self.content,
+            "role": self.role,
+            "function_call": self.function_call,
+            "tool_calls": self.tool_calls,
+        }
+
+    def json(self) -> str:
+        return json.dumps(self.model_dump())
+
+
+@dataclass
+class StreamChoice:
+    delta: Delta
+    finish_reason: Optional[str] = None
+    index: int = 0
+
+
+class WrappedChunk:
+    """
+    Wrap one streamed Ollama chunk to provide a consistent interface.
+
+    Args:
+        delta (Delta): The message update carried by the chunk.
+        finish_reason (str, optional): Set on the last chunk of the stream.
+    """
+
+    def __init__(self, delta: Delta, finish_reason: Optional[str] = None):
+        self.choices = [StreamChoice(delta=delta, finish_reason=finish_reason)]
+
+
+class _ChunkTranslator:
+    """
+    Turn Ollama's streamed NDJSON chunks into `WrappedChunk` deltas.
+
+    Ollama emits each tool call whole, in a single chunk; they are forwarded as
+    complete fragments with a running `index` so they merge like OpenAI deltas.
+    The role is only sent on the first chunk.
+    """
+
+    def __init__(self):
+        self.sent_role = False
+        self.tool_call_count = 0
+        self.final_chunk = None
+
+    def translate(self, chunk) -> WrappedChunk:
+        message = chunk.get("message") or {}
+        delta = Delta(content=message.get("content") or None)
+        if not self.sent_role:
+            delta.role = message.get("role") or "assistant"
+            self.sent_role = True
+
+        tool_calls = message.get("tool_calls")
+        if tool_calls:
+            delta.tool_calls = []
+            for tc in tool_calls:
+                index = self.tool_call_count
+                self.tool_call_count += 1
+                function = Function.from_ollama(tc.get("function") or {})
+                delta.tool_calls.append(
+                    {
+                        "index": index,
+                        "id": tc.get("id") or f"call_{index}",
+                        "type": tc.get("type") or "function",
+                        "function": {
+                            "name": function.name,
+                            "arguments": function.arguments,
+                        },
+                    }
+                )
+
+        finish_reason = None
+        if chunk.get("done"):
+            self.final_chunk = chunk
+            finish_reason = chunk.get("done_reason") or "stop"
+            if self.tool_call_count:
+                finish_reason = "tool_calls"
+        return WrappedChunk(delta, finish_reason)
+
+
+class WrappedStream:
+    """
+    Iterate over a streamed Ollama chat response as `WrappedChunk`s.
+
+    Args:
+        stream: The chunk iterator returned by `ollama.Client.chat(stream=True)`.
+        translate_error: Maps transport errors raised mid-stream.
+        on_close (callable, optional): Called once the stream ends or fails.
+        breaker (CircuitBreaker, optional): Told how the stream ended: exhausted,
+            failed, or closed early without a verdict on the host.
+    """
+
+    def __init__(self, stream, translate_error, on_close=None, breaker=None):
+        self._stream = stream
+        self._translate_error = translate_error
+        self._translator = _ChunkTranslator()
+        self._on_close = on_close or _noop
+        self._breaker = breaker
+        self._closed = False
+
+    @property
+    def final_chunk(self):
+        """The last (`done`) Ollama chunk, once the stream is exhausted."""
+        return self._translator.final_chunk
+
+    @property
+    def usage(self) -> Dict[str, int]:
+        """Ollama's counters, from the final chunk."""
+        return _usage(self._translator.final_chunk)
+
+    def _release(self, error: Optional[Exception] = None, abandoned=False) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._on_close()
+        if self._breaker is None:
+            return
+        if abandoned:
+            self._breaker.release_probe()
+        else:
+            self._breaker.record(error)
+
+    def close(self) -> None:
+        """
+        Stop the stream and release its scheduler slot. Safe to call more than
+        once; exhausting the stream closes it too.
+        """
+        try:
+            close = getattr(self._stream, "close", None)
+            if close is not None and not self._closed:
+                close()
+        finally:
+            self._release(abandoned=True)
+
+    def __iter__(self):
+        try:
+            for chunk in self._stream:
+                yield self._translator.translate(chunk)
+            self._release()
+        except Exception as e:
+            self._release(e)
+            raise self._translate_error(e) from e
+        finally:
+            # still unreleased only if the consumer stopped reading
+            self._release(abandoned=True)
+
+
+class AsyncWrappedStream(WrappedStream):
+    """
+    Async-iterate over a streamed Ollama chat response as `WrappedChunk`s.
+    """
+
+    def __iter__(self):
+        raise TypeError("AsyncWrappedStream must be consumed with `async for`.")
+
+    def close(self) -> None:
+        # the async iterator can only be closed from the event loop
+        self._release(abandoned=True)
+
+    async def aclose(self) -> None:
+        """Async counterpart of `WrappedStream.close`."""
+        try:
+            aclose = getattr(self._stream, "aclose", None)
+            if aclose is not None and not self._closed:
+                await aclose()
+        finally:
+            self._release(abandoned=True)
+
+    async def __aiter__(self):
+        try:
+            async for chunk in self._stream:
+                yield self._translator.translate(chunk)
+            self._release()
+        except Exception as e:
+            self._release(e)
+            raise self._translate_error(e) from e
+        finally:
+            self._release(abandoned=True)
+
+
 class ChatCompletions:
     """
     Initialize the ChatCompletions with an Ollama client.
 
     Args:
         client: The Ollama client instance.
+        cache (CompletionCache, optional): Cache for non-streaming completions.
+        scheduler (ModelScheduler, optional): Groups completions by model.
+        retry (RetryPolicy, optional): Retries and circuit breaking. Off by default.
     """
 
-    def __init__(self, client):
+    def __init__(
+        self,
+        client,
+        cache: Optional[CompletionCache] = None,
+        scheduler: Optional[ModelScheduler] = None,
+        retry: Optional[RetryPolicy] = None,
+    ):
         self.client = client
         self.completions = self
+        self.cache = cache
+        self.scheduler = scheduler
+        self.retry = retry
+        base_url = getattr(client, "host", None) or getattr(
+            getattr(client, "_client", None), "base_url", None
+        )
+        self.host = str(base_url) if base_url is not None else "default"
+        # circuit breakers are per host; a balanced client checks and feeds the
+        # breakers of its nodes itself, taking the policy with each request
+        self.breaker_host = self.host
+        self._chat_kwargs = {}
+        if isinstance(client, BalancedClient):
+            self.breaker_host = None
+            if retry is not None:
+                self._chat_kwargs["retry"] = retry
+        self._formatted_tools = {}
+
+    def _format_tools(self, tools) -> List[Dict[str, Any]]:
+        """
+        Format tool schemas for Ollama.
 
-    def create(
+        Tuples (such as `ToolSet.schemas`) are immutable and reused turn after
+        turn, so their formatted list is memoized by identity.
+        """
+        if isinstance(tools, tuple):
+            cached = self._formatted_tools.get(id(tools))
+            if cached is not None and cached[0] is tools:
+                return cached[1]
+
+        formatted_tools = []
+        for tool in tools:
+            formatted_tool = {
+                "type": "function",
+                "function": {
+                    "name": tool["function"]["name"],
+                    "description": tool["function"].get("description", ""),
+                    "parameters": {
+                        "type": "object",
+                        "properties": tool["function"]["parameters"]["properties"],
+                        "required": tool["function"]["parameters"].get("required", []),
+                    },
+                },
+            }
+            formatted_tools.append(formatted_tool)
+
+        if isinstance(tools, tuple):
+            if len(self._formatted_tools) >= _FORMATTED_TOOLS_CACHE_SIZE:
+                self._formatted_tools.clear()
+            # keep a reference to `tools` so its id cannot be reused
+            self._formatted_tools[id(tools)] = (tools, formatted_tools)
+        return formatted_tools
+
+    def _build_request(
         self,
         messages: List[Dict[str, str]],
-        model: str = "llama3.2:3b",
-        stream: bool = False,
+        model: str,
+        stream: bool,
         tools: List[Dict[str, Any]] = None,
-        **kwargs,
-    ) -> WrappedResponse:
+        options: Optional[Dict[str, Any]] = None,
+        keep_alive: Optional[Union[float, str]] = None,
+    ) -> Dict[str, Any]:
         """
-        Create a chat completion using the specified model and messages.
-
-        Args:
-            model (str): The model name to use (e.g., 'llama2:13b')
-            messages (List[Dict[str, str]]): List of conversation messages
-            stream (bool, optional): Whether to stream the response. Defaults to False.
-            tools (List[Dict[str, Any]], optional): List of tools/functions available. Defaults to None.
-            **kwargs: Additional arguments passed to Ollama
-
-        Returns:
-            WrappedResponse: The wrapped response from the Ollama client.
+        Translate Swarm's chat completion parameters into Ollama `chat` kwargs.
         """
-
         # Clean and format messages
         clean_messages = []
         for msg in messages:
@@ -149,75 +451,293 @@ class ChatCompletions:
 
         # Format tools correctly for Ollama
         if tools:
-            formatted_tools = []
-            for tool in tools:
-                formatted_tool = {
-                    "type": "function",
-                    "function": {
-                        "name": tool["function"]["name"],
-                        "description": tool["function"].get("description", ""),
-                        "parameters": {
-                            "type": "object",
-                            "properties": tool["function"]["parameters"]["properties"],
-                            "required": tool["function"]["parameters"].get(
-                                "required", []
-                            ),
-                        },
-                    },
-                }
-                formatted_tools.append(formatted_tool)
-            ollama_kwargs["tools"] = formatted_tools  # Add tools to ollama_kwargs
+            ollama_kwargs["tools"] = self._format_tools(tools)
+        if options:
+            ollama_kwargs["options"] = options
+        if keep_alive is not None:
+            ollama_kwargs["keep_alive"] = keep_alive
+
+        # serialized only if debug logging is on
+        log.debug(
+            "Sending to Ollama",
+            model=model,
+            messages=clean_messages,
+            tools=ollama_kwargs.get("tools", []),
+        )
+        return ollama_kwargs
 
+    def _parse_response(self, response):
+        """
+        Extract function calls that the model wrote inline in its content.
+        """
+        response = _as_dict(response)
+        log.debug("Received response", response=response)
+        # Parse function calls from response content
+        if "[" in response.get("message", {}).get("content", ""):
+            content = response["message"]["content"]
+            # Extract function call if present
+            if "[" in content and "]" in content:
+                function_call = content[content.find("[") + 1 : content.find("]")]
+                if "(" in function_call and ")" in function_call:
+                    func_name = function_call.split("(")[0].strip()
+                    func_args = function_call.split("(")[1].split(")")[0].strip()
+                    # Create tool call structure
+                    tool_call = {
+                        "id": "call_1",
+                        "type": "function",
+                        "function": {
+                            "name": func_name,
+                            "arguments": "{}" if not func_args else func_args,
+                        },
+                    }
+                    # Clean content and add tool calls
+                    response["message"]["content"] = content.replace(
+                        f"[{function_call}]", ""
+                    ).strip()
+                    response["message"]["tool_calls"] = [tool_call]
+        return response
+
+    def _send(self, model: str, ollama_kwargs: Dict[str, Any]):
+        """
+        Send one chat request, after waiting for the model's turn if there is a
+        scheduler. Returns the response and the function releasing the turn.
+        """
+        release = self.scheduler.acquire(model) if self.scheduler else _noop
         try:
-            # Debug print to see what we're sending to Ollama
-            debug_request = {
-                "model": ollama_kwargs["model"],
-                "messages": ollama_kwargs["messages"],
-                "tools": ollama_kwargs.get("tools", []),
+            return self.client.chat(**ollama_kwargs, **self._chat_kwargs), release
+        except BaseException:
+            release()
+            raise
+
+    def _complete(self, model: str, ollama_kwargs: Dict[str, Any]):
+        response, release = self._send(model, ollama_kwargs)
+        release()
+        return response
+
+    def _stream_breaker(self):
+        """
+        The circuit breaker of a streamed request, after letting it through.
+        Streams are not retried, but fail fast on an open circuit, and their
+        outcome is recorded once they end.
+        """
+        if not self.retry or self.breaker_host is None:
+            return None
+        breaker = self.retry.breaker(self.breaker_host)
+        breaker.allow()
+        return breaker
+
+    def _translate_error(self, e: Exception) -> Exception:
+        if isinstance(e, CircuitOpenError):
+            return e
+        if isinstance(e, ResponseError):
+            return NameError(f"LLM model error: {e}")
+        if isinstance(e, (ConnectError, ConnectionError)):
+            return ConnectionError(
+                f"Connection error occurred.. Is the `ollama serve` running?: {e}"
+            )
+        # logger.error("Unexpected error: %s", str(e), exc_info=True)
+        return RuntimeError(f"Failed to get chat response: {e}")
+
+    def _cache_key(self, ollama_kwargs: Dict[str, Any], bypass_cache: bool):
+        """
+        Return the cache key of a request, or None if it must not be cached.
+        """
+        if self.cache is None or bypass_cache or ollama_kwargs["stream"]:
+            return None
+        return cache_key(
+            {
+                k: v
+                for k, v in ollama_kwargs.items()
+                if k not in ("stream", "keep_alive")
             }
-            logger.debug(
-                "Sending to Ollama: %s",
-                json.dumps(debug_request, indent=2, ensure_ascii=False),
+        )
+
+    def create(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = "llama3.2:3b",
+        stream: bool = False,
+        tools: List[Dict[str, Any]] = None,
+        bypass_cache: bool = False,
+        **kwargs,
+    ) -> Union[WrappedResponse, WrappedStream]:
+        """
+        Create a chat completion using the specified model and messages.
+
+        Args:
+            model (str): The model name to use (e.g., 'llama2:13b')
+            messages (List[Dict[str, str]]): List of conversation messages
+            stream (bool, optional): Whether to stream the response. Defaults to False.
+            tools (List[Dict[str, Any]], optional): List of tools/functions available. Defaults to None.
+            bypass_cache (bool, optional): Neither read nor fill the completion cache. Defaults to False.
+            **kwargs: Additional arguments passed to Ollama (only `options` and
+                `keep_alive` are forwarded)
+
+        Returns:
+            WrappedResponse: The wrapped response from the Ollama client, or a
+            `WrappedStream` of `WrappedChunk`s when `stream` is True.
+        """
+        span = _chat_span(self.host, model, stream)
+        if span is None:
+            return self._create(messages, model, stream, tools, bypass_cache, **kwargs)
+        try:
+            response = self._create(
+                messages, model, stream, tools, bypass_cache, **kwargs
             )
+        except Exception as e:
+            span.finish(error=repr(e))
+            raise
+        span.finish(cached=getattr(response, "cached", False))
+        return response
 
-            response = self.client.chat(**ollama_kwargs)
-            logger.debug(
-                "Received response: %s",
-                json.dumps(response, indent=2, ensure_ascii=False),
+    def _create(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        stream: bool,
+        tools: List[Dict[str, Any]],
+        bypass_cache: bool,
+        **kwargs,
+    ) -> Union[WrappedResponse, WrappedStream]:
+        try:
+            ollama_kwargs = self._build_request(
+                messages,
+                model,
+                stream,
+                tools,
+                kwargs.get("options"),
+                kwargs.get("keep_alive"),
             )
-            # Parse function calls from response content
-            if "[" in response.get("message", {}).get("content", ""):
-                content = response["message"]["content"]
-                # Extract function call if present
-                if "[" in content and "]" in content:
-                    function_call = content[content.find("[") + 1 : content.find("]")]
-                    if "(" in function_call and ")" in function_call:
-                        func_name = function_call.split("(")[0].strip()
-                        func_args = function_call.split("(")[1].split(")")[0].strip()
-                        # Create tool call structure
-                        tool_call = {
-                            "id": "call_1",
-                            "type": "function",
-                            "function": {
-                                "name": func_name,
-                                "arguments": "{}" if not func_args else func_args,
-                            },
-                        }
-                        # Clean content and add tool calls
-                        response["message"]["content"] = content.replace(
-                            f"[{function_call}]", ""
-                        ).strip()
-                        response["message"]["tool_calls"] = [tool_call]
-
-        except ResponseError as e:
-            raise NameError(f"LLM model error: {e}")
-        except ConnectError as e:
-            raise ConnectionError(
-                f"Connection error occurred.. Is the `ollama serve` running?: {e}"
+            key = self._cache_key(ollama_kwargs, bypass_cache)
+            cached = self.cache.get(key) if key else None
+            if cached is not None:
+                return WrappedResponse(cached, cached=True)
+
+            if stream:
+                breaker = self._stream_breaker()
+                try:
+                    response, release = self._send(model, ollama_kwargs)
+                except BaseException as e:
+                    if breaker is not None:
+                        breaker.record(e)
+                    raise
+                return WrappedStream(response, self._translate_error, release, breaker)
+            if self.retry:
+                response = self.retry.call(
+                    self.breaker_host, lambda: self._complete(model, ollama_kwargs)
+                )
+            else:
+                response = self._complete(model, ollama_kwargs)
+            response = self._parse_response(response)
+        except Exception as e:
+            raise self._translate_error(e) from e
+        if key:
+            self.cache.set(key, response)
+        return WrappedResponse(response)
+
+
+class AsyncChatCompletions(ChatCompletions):
+    """
+    Asynchronous counterpart of `ChatCompletions`, backed by an `ollama.AsyncClient`.
+
+    Args:
+        client: The Ollama async client instance.
+    """
+
+    async def _send(self, model: str, ollama_kwargs: Dict[str, Any]):
+        release = _noop
+        if self.scheduler:
+            release = await self.scheduler.acquire_async(model)
+        try:
+            response = await self.client.chat(**ollama_kwargs, **self._chat_kwargs)
+            return response, release
+        except BaseException:
+            release()
+            raise
+
+    async def _complete(self, model: str, ollama_kwargs: Dict[str, Any]):
+        response, release = await self._send(model, ollama_kwargs)
+        release()
+        return response
+
+    async def create(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = "llama3.2:3b",
+        stream: bool = False,
+        tools: List[Dict[str, Any]] = None,
+        bypass_cache: bool = False,
+        **kwargs,
+    ) -> Union[WrappedResponse, AsyncWrappedStream]:
+        """
+        Create a chat completion without blocking the event loop.
+
+        Takes the same arguments as `ChatCompletions.create`.
+
+        Returns:
+            WrappedResponse: The wrapped response from the Ollama client, or an
+            `AsyncWrappedStream` of `WrappedChunk`s when `stream` is True.
+        """
+        span = _chat_span(self.host, model, stream)
+        if span is None:
+            return await self._create(
+                messages, model, stream, tools, bypass_cache, **kwargs
+            )
+        try:
+            response = await self._create(
+                messages, model, stream, tools, bypass_cache, **kwargs
             )
         except Exception as e:
-            # logger.error("Unexpected error: %s", str(e), exc_info=True)
-            raise RuntimeError(f"Failed to get chat response: {e}")
+            span.finish(error=repr(e))
+            raise
+        span.finish(cached=getattr(response, "cached", False))
+        return response
+
+    async def _create(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        stream: bool,
+        tools: List[Dict[str, Any]],
+        bypass_cache: bool,
+        **kwargs,
+    ) -> Union[WrappedResponse, AsyncWrappedStream]:
+        try:
+            ollama_kwargs = self._build_request(
+                messages,
+                model,
+                stream,
+                tools,
+                kwargs.get("options"),
+                kwargs.get("keep_alive"),
+            )
+            key = self._cache_key(ollama_kwargs, bypass_cache)
+            cached = self.cache.get(key) if key else None
+            if cached is not None:
+                return WrappedResponse(cached, cached=True)
+
+            if stream:
+                breaker = self._stream_breaker()
+                try:
+                    response, release = await self._send(model, ollama_kwargs)
+                except BaseException as e:
+                    if breaker is not None:
+                        breaker.record(e)
+                    raise
+                return AsyncWrappedStream(
+                    response, self._translate_error, release, breaker
+                )
+            if self.retry:
+                response = await self.retry.acall(
+                    self.breaker_host, lambda: self._complete(model, ollama_kwargs)
+                )
+            else:
+                response = await self._complete(model, ollama_kwargs)
+            response = self._parse_response(response)
+        except Exception as e:
+            raise self._translate_error(e) from e
+        if key:
+            self.cache.set(key, response)
         return WrappedResponse(response)
 
 
@@ -227,11 +747,22 @@ class OllamaWrapper:
 
     Args:
         client: The Ollama client instance.
+        cache (CompletionCache, optional): Cache for non-streaming completions.
+        scheduler (ModelScheduler, optional): Groups completions by model.
+        retry (RetryPolicy, optional): Retries and circuit breaking.
     """
 
-    def __init__(self, client):
+    def __init__(
+        self,
+        client,
+        cache: Optional[CompletionCache] = None,
+        scheduler: Optional[ModelScheduler] = None,
+        retry: Optional[RetryPolicy] = None,
+    ):
         self.client = client
-        self.chat = ChatCompletions(client)
+        self.chat = ChatCompletions(
+            client, cache=cache, scheduler=scheduler, retry=retry
+        )
 
     def __getattr__(self, name):
         """
@@ -244,3 +775,27 @@ class OllamaWrapper:
             Any: The attribute from the client.
         """
         return getattr(self.client, name)
+
+
+class AsyncOllamaWrapper(OllamaWrapper):
+    """
+    Wrap the Ollama async client to provide a consistent interface.
+
+    Args:
+        client: The `ollama.AsyncClient` instance.
+        cache (CompletionCache, optional): Cache for non-streaming completions.
+        scheduler (ModelScheduler, optional): Groups completions by model.
+        retry (RetryPolicy, optional): Retries and circuit breaking.
+    """
+
+    def __init__(
+        self,
+        client,
+        cache: Optional[CompletionCache] = None,
+        scheduler: Optional[ModelScheduler] = None,
+        retry: Optional[RetryPolicy] = None,
+    ):
+        self.client = client
+        self.chat = AsyncChatCompletions(
+            client, cache=cache, scheduler=scheduler, retry=retry
+        )
@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 from swarm_ollama.types import (
     ChatCompletionMessage,
     ChatCompletionMessageToolCall,
@@ -67,6 +67,12 @@ class MockOpenAIClient:
         self.chat.completions.create.assert_called_with(**kwargs)
 
 
+class MockAsyncOpenAIClient(MockOpenAIClient):
+    def __init__(self):
+        super().__init__()
+        self.chat.completions.create = AsyncMock()
+
+
 # Initialize the mock client
 client = MockOpenAIClient()
 
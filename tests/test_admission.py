@@ -0,0 +1,72 @@
+import threading
+import time
+
+import pytest
+
+from swarm_ollama import Agent, Swarm
+from swarm_ollama.admission import AdmissionController, AdmissionRejected, Priority
+from tests.mock_client import MockOpenAIClient, create_mock_response
+
+
+def wait_until_queued(controller, count):
+    while sum(controller.stats["queued"].values()) < count:
+        time.sleep(0.001)
+
+
+def test_interactive_runs_are_admitted_before_batch_runs():
+    controller = AdmissionController(max_concurrency=1)
+    order = []
+
+    def run(name, priority):
+        with controller.admit(priority):
+            order.append(name)
+
+    threads = []
+    with controller.admit():
+        for count, (name, priority) in enumerate(
+            [("batch", Priority.BATCH), ("interactive", Priority.INTERACTIVE)], 1
+        ):
+            threads.append(threading.Thread(target=run, args=(name, priority)))
+            threads[-1].start()
+            wait_until_queued(controller, count)
+    for thread in threads:
+        thread.join()
+
+    assert order == ["interactive", "batch"]
+    assert controller.stats["admitted"] == 3
+
+
+def test_runs_are_rejected_when_they_would_miss_their_deadline():
+    controller = AdmissionController(max_concurrency=1)
+    with controller.admit():
+        # no run has finished yet, so the wait cannot be predicted
+        with pytest.raises(AdmissionRejected) as rejected:
+            with controller.admit(deadline=0.01):
+                pass
+        assert rejected.value.reason == "expired"
+
+        controller.service_time = 10.0
+        with pytest.raises(AdmissionRejected) as rejected:
+            with controller.admit(deadline=1.0):
+                pass
+        assert rejected.value.reason == "predicted"
+
+    stats = controller.stats
+    assert stats["rejected"] == {"queue_full": 0, "predicted": 1, "expired": 1}
+    assert stats["rejection_rate"] == 2 / 3
+    assert stats["in_flight"] == 0
+
+
+def test_swarm_runs_go_through_admission():
+    mock_client = MockOpenAIClient()
+    mock_client.set_response(
+        create_mock_response({"role": "assistant", "content": "Hi"})
+    )
+    controller = AdmissionController(max_concurrency=2)
+    client = Swarm(client=mock_client, admission=controller)
+
+    client.run(agent=Agent(), messages=[{"role": "user", "content": "Hello"}])
+    list(client.run_many([(Agent(), [{"role": "user", "content": "Hello"}])]))
+
+    assert controller.stats["admitted"] == 2
+    assert controller.service_time is not None
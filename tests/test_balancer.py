@@ -0,0 +1,267 @@
+import asyncio
+import time
+
+from ollama import ChatResponse, Message, ResponseError
+
+from swarm_ollama import Agent, Swarm
+from swarm_ollama.balancer import AsyncBalancedClient, BalancedClient
+from swarm_ollama.hedging import HedgePolicy
+
+
+class FakeNode:
+    """Stands in for the `ollama.Client` of one node."""
+
+    def __init__(self, name, error=None):
+        self.name = name
+        self.error = error
+        self.calls = 0
+
+    def chat(self, **kwargs):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return ChatResponse(
+            model=kwargs["model"],
+            done=True,
+            message=Message(role="assistant", content=self.name),
+        )
+
+    def ps(self):
+        return {"models": []}
+
+
+def streamed(name, done):
+    return ChatResponse(
+        model="llama3.2:3b",
+        done=done,
+        message=Message(role="assistant", content=name if not done else ""),
+    )
+
+
+class StreamingNode:
+    """A node answering in streamed chunks after `delay` seconds."""
+
+    def __init__(self, name, delay=0.0):
+        self.name = name
+        self.delay = delay
+        self.closed = False
+
+    def chat(self, **kwargs):
+        def chunks():
+            try:
+                time.sleep(self.delay)
+                yield streamed(self.name, done=False)
+                yield streamed(self.name, done=True)
+            finally:
+                self.closed = True
+
+        return chunks()
+
+
+class AsyncStreamingNode(StreamingNode):
+    async def chat(self, **kwargs):
+        async def chunks():
+            try:
+                await asyncio.sleep(self.delay)
+                yield streamed(self.name, done=False)
+                yield streamed(self.name, done=True)
+            finally:
+                self.closed = True
+
+        return chunks()
+
+
+def balanced(*nodes, client_class=BalancedClient, **kwargs):
+    client = client_class(
+        [f"http://balancer-test-{node.name}:11434" for node in nodes], **kwargs
+    )
+    for backend, node in zip(client.backends, nodes):
+        backend.client = node
+    return client
+
+
+def ask(client, text, model="llama3.2:3b"):
+    response = client.chat(model=model, messages=[{"role": "user", "content": text}])
+    return response["message"]["content"]
+
+
+def test_least_outstanding_and_sticky_sessions():
+    client = balanced(FakeNode("a"), FakeNode("b"))
+    client.backends[0].outstanding = 1
+
+    assert ask(client, "first conversation") == "b"
+    client.backends[0].outstanding = 0
+    client.backends[1].outstanding = 1
+    # the same conversation stays on the node holding its context
+    assert ask(client, "first conversation") == "b"
+    assert ask(client, "second conversation") == "a"
+
+
+def test_ejects_failing_node_and_fails_over_on_connect_errors():
+    broken = FakeNode("a", error=ResponseError("overloaded", 503))
+    client = balanced(broken, FakeNode("b"), eject_after=2)
+
+    for _ in range(2):
+        try:
+            ask(client, f"question {broken.calls}")
+        except ResponseError:
+            pass
+    assert client.stats()[0]["available"] is False
+    assert ask(client, "another question") == "b"
+    assert broken.calls == 2
+
+    unreachable = balanced(FakeNode("a", error=ConnectionError()), FakeNode("b"))
+    assert ask(unreachable, "hello") == "b"
+
+
+def test_swarm_wraps_balanced_client():
+    client = balanced(FakeNode("a"))
+    swarm = Swarm(client=client)
+    response = swarm.run(
+        agent=Agent(), messages=[{"role": "user", "content": "Hi"}], max_turns=1
+    )
+    assert response.messages[-1]["content"] == "a"
+
+
+def test_hedges_requests_whose_first_chunk_is_late():
+    hedge = HedgePolicy(initial_delay=0.05, max_ratio=1.0)
+    slow, fast = StreamingNode("a", delay=2), StreamingNode("b")
+    client = balanced(slow, fast, hedge=hedge)
+
+    start = time.perf_counter()
+    assert ask(client, "hello") == "b"
+    assert time.perf_counter() - start < 1
+    assert (client.hedges, client.hedge_wins) == (1, 1)
+    assert client.stats()[1]["first_chunk_latency"]["count"] == 1
+
+
+def test_async_hedging_cancels_the_losing_request():
+    hedge = HedgePolicy(initial_delay=0.05, max_ratio=1.0)
+    slow, fast = AsyncStreamingNode("a", delay=5), AsyncStreamingNode("b")
+    client = balanced(slow, fast, client_class=AsyncBalancedClient, hedge=hedge)
+
+    async def main():
+        response = await client.chat(
+            model="llama3.2:3b", messages=[{"role": "user", "content": "hello"}]
+        )
+        await asyncio.sleep(0)
+        return response["message"]["content"]
+
+    assert asyncio.run(main()) == "b"
+    assert slow.closed
+    assert [b["outstanding"] for b in client.stats()] == [0, 0]
+
+
+def test_closed_streams_release_their_node():
+    node = StreamingNode("a")
+    client = balanced(node, FakeNode("b"))
+    client.backends[0].failures = 2
+
+    for i in range(3):
+        chunks = client.chat(
+            model="llama3.2:3b",
+            messages=[{"role": "user", "content": f"q{i}"}],
+            stream=True,
+        )
+        next(iter(chunks))
+        chunks.close()
+        chunks.close()
+    assert [b["outstanding"] for b in client.stats()] == [0, 0]
+    assert node.closed
+    # closing is not a verdict on the node's health
+    assert client.backends[0].failures == 2
+
+    async_node = AsyncStreamingNode("a")
+    async_client = balanced(async_node, client_class=AsyncBalancedClient)
+
+    async def main():
+        chunks = await async_client.chat(
+            model="llama3.2:3b",
+            messages=[{"role": "user", "content": "q"}],
+            stream=True,
+        )
+        await chunks.__aiter__().__anext__()
+        await chunks.aclose()
+
+    asyncio.run(main())
+    assert async_node.closed
+    assert async_client.stats()[0]["outstanding"] == 0
+
+
+def test_abandoned_async_streams_close_their_node_stream():
+    node = AsyncStreamingNode("a")
+    client = balanced(node, client_class=AsyncBalancedClient)
+
+    async def request():
+        return await client.chat(
+            model="llama3.2:3b",
+            messages=[{"role": "user", "content": "q"}],
+            stream=True,
+        )
+
+    async def break_early():
+        chunks = (await request()).__aiter__()
+        await chunks.__anext__()
+        await chunks.aclose()
+        # not left to the loop's shutdown to close
+        assert node.closed
+
+    asyncio.run(break_early())
+    assert client.stats()[0]["outstanding"] == 0
+
+    node.closed = False
+
+    async def close_without_awaiting():
+        chunks = await request()
+        await chunks.__aiter__().__anext__()
+        chunks.close()
+        await asyncio.sleep(0)
+        assert node.closed
+
+    asyncio.run(close_without_awaiting())
+    assert client.stats()[0]["outstanding"] == 0
+
+
+def test_forwarded_methods_leave_node_health_alone():
+    broken = FakeNode("a", error=ResponseError("overloaded", 503))
+    client = balanced(broken, eject_after=3)
+    for i in range(2):
+        try:
+            ask(client, f"question {i}")
+        except ResponseError:
+            pass
+
+    for _ in range(3):
+        client.ps()
+    assert client.backends[0].failures == 2
+    assert client.stats()[0]["outstanding"] == 0
+
+
+def test_async_health_checks_run_in_a_task():
+    class AsyncNode:
+        def __init__(self, error=None):
+            self.error = error
+
+        async def ps(self):
+            if self.error is not None:
+                raise self.error
+            return {"models": [{"model": "llama3.2:3b"}]}
+
+    client = AsyncBalancedClient(
+        ["http://balancer-test-health-a:11434", "http://balancer-test-health-b:11434"]
+    )
+    client.backends[0].client = AsyncNode()
+    client.backends[1].client = AsyncNode(ConnectionError())
+
+    async def main():
+        task = client.start_health_checks(interval=0.01)
+        assert client.start_health_checks(interval=0.01) is task
+        await asyncio.sleep(0.05)
+        task.cancel()
+        return task
+
+    task = asyncio.run(main())
+    assert task.cancelled()
+    stats = client.stats()
+    assert stats[0]["models"] == ["llama3.2:3b"]
+    assert stats[1]["available"] is False
@@ -1,6 +1,13 @@
+import asyncio
+import threading
 import pytest
-from swarm_ollama import Swarm, Agent
-from tests.mock_client import MockOpenAIClient, create_mock_response
+from swarm_ollama import AsyncSwarm, Swarm, Agent, SemanticCache
+from swarm_ollama.types import Result
+from tests.mock_client import (
+    MockAsyncOpenAIClient,
+    MockOpenAIClient,
+    create_mock_response,
+)
 from unittest.mock import Mock
 import json
 
@@ -16,6 +23,15 @@ def mock_openai_client():
     return m
 
 
+@pytest.fixture
+def mock_async_openai_client():
+    m = MockAsyncOpenAIClient()
+    m.set_response(
+        create_mock_response({"role": "assistant", "content": DEFAULT_RESPONSE_CONTENT})
+    )
+    return m
+
+
 def test_run_with_simple_message(mock_openai_client: MockOpenAIClient):
     agent = Agent()
     # set up client and run
@@ -143,3 +159,256 @@ def test_handoff(mock_openai_client: MockOpenAIClient):
     assert response.agent == agent2
     assert response.messages[-1]["role"] == "assistant"
     assert response.messages[-1]["content"] == DEFAULT_RESPONSE_CONTENT
+
+
+def test_async_run_with_simple_message(mock_async_openai_client: MockAsyncOpenAIClient):
+    agent = Agent()
+    client = AsyncSwarm(client=mock_async_openai_client)
+    messages = [{"role": "user", "content": "Hello, how are you?"}]
+    response = asyncio.run(client.run(agent=agent, messages=messages))
+
+    assert response.messages[-1]["role"] == "assistant"
+    assert response.messages[-1]["content"] == DEFAULT_RESPONSE_CONTENT
+
+
+def test_async_handoff(mock_async_openai_client: MockAsyncOpenAIClient):
+    def transfer_to_agent2():
+        return agent2
+
+    agent1 = Agent(name="Test Agent 1", functions=[transfer_to_agent2])
+    agent2 = Agent(name="Test Agent 2")
+
+    mock_async_openai_client.set_sequential_responses(
+        [
+            create_mock_response(
+                message={"role": "assistant", "content": ""},
+                function_calls=[{"name": "transfer_to_agent2"}],
+            ),
+            create_mock_response(
+                {"role": "assistant", "content": DEFAULT_RESPONSE_CONTENT}
+            ),
+        ]
+    )
+
+    client = AsyncSwarm(client=mock_async_openai_client)
+    messages = [{"role": "user", "content": "I want to talk to agent 2"}]
+    response = asyncio.run(client.run(agent=agent1, messages=messages))
+
+    assert response.agent == agent2
+    assert response.messages[-1]["content"] == DEFAULT_RESPONSE_CONTENT
+
+
+def test_parallel_tool_calls(mock_openai_client: MockOpenAIClient):
+    # both tools must be in flight at the same time to pass the barrier
+    barrier = threading.Barrier(2, timeout=5)
+
+    def lookup_order(order_id):
+        barrier.wait()
+        return Result(value=f"order {order_id}", context_variables={"source": "db"})
+
+    def lookup_customer(customer_id):
+        barrier.wait()
+        return Result(
+            value=f"customer {customer_id}", context_variables={"source": "crm"}
+        )
+
+    agent = Agent(name="Test Agent", functions=[lookup_order, lookup_customer])
+    mock_openai_client.set_sequential_responses(
+        [
+            create_mock_response(
+                message={"role": "assistant", "content": ""},
+                function_calls=[
+                    {"name": "lookup_order", "args": {"order_id": "1"}},
+                    {"name": "lookup_customer", "args": {"customer_id": "2"}},
+                ],
+            ),
+            create_mock_response(
+                {"role": "assistant", "content": DEFAULT_RESPONSE_CONTENT}
+            ),
+        ]
+    )
+
+    client = Swarm(client=mock_openai_client, max_tool_workers=2)
+    messages = [{"role": "user", "content": "Look up my order and account."}]
+    response = client.run(agent=agent, messages=messages)
+
+    tool_messages = [m for m in response.messages if m["role"] == "tool"]
+    assert [m["content"] for m in tool_messages] == ["order 1", "customer 2"]
+    # later tool calls win on conflicting context_variables keys
+    assert response.context_variables == {"source": "crm"}
+
+
+def test_async_agent_functions(mock_openai_client: MockOpenAIClient):
+    async def get_weather(location):
+        await asyncio.sleep(0)
+        return f"It's sunny in {location}."
+
+    async def get_forecast(location):
+        for part in ("Rain ", "tomorrow ", f"in {location}."):
+            yield part
+
+    agent = Agent(name="Test Agent", functions=[get_weather, get_forecast])
+    mock_openai_client.set_sequential_responses(
+        [
+            create_mock_response(
+                message={"role": "assistant", "content": ""},
+                function_calls=[
+                    {"name": "get_weather", "args": {"location": "Paris"}},
+                    {"name": "get_forecast", "args": {"location": "Paris"}},
+                ],
+            ),
+            create_mock_response(
+                {"role": "assistant", "content": DEFAULT_RESPONSE_CONTENT}
+            ),
+        ]
+    )
+
+    client = Swarm(client=mock_openai_client)
+    messages = [{"role": "user", "content": "What's the weather in Paris?"}]
+    response = client.run(agent=agent, messages=messages)
+
+    tool_messages = [m for m in response.messages if m["role"] == "tool"]
+    assert [m["content"] for m in tool_messages] == [
+        "It's sunny in Paris.",
+        "Rain tomorrow in Paris.",
+    ]
+
+
+def test_async_swarm_awaits_async_handoff(
+    mock_async_openai_client: MockAsyncOpenAIClient,
+):
+    async def transfer_to_agent2():
+        await asyncio.sleep(0)
+        return agent2
+
+    agent1 = Agent(name="Test Agent 1", functions=[transfer_to_agent2])
+    agent2 = Agent(name="Test Agent 2")
+
+    mock_async_openai_client.set_sequential_responses(
+        [
+            create_mock_response(
+                message={"role": "assistant", "content": ""},
+                function_calls=[{"name": "transfer_to_agent2"}],
+            ),
+            create_mock_response(
+                {"role": "assistant", "content": DEFAULT_RESPONSE_CONTENT}
+            ),
+        ]
+    )
+
+    client = AsyncSwarm(client=mock_async_openai_client)
+    messages = [{"role": "user", "content": "I want to talk to agent 2"}]
+    response = asyncio.run(client.run(agent=agent1, messages=messages))
+
+    assert response.agent == agent2
+
+
+def test_run_many_isolates_failures_and_timeouts(mock_openai_client: MockOpenAIClient):
+    release = threading.Event()
+
+    def slow_lookup():
+        release.wait(5)
+        return "late"
+
+    def broken_lookup():
+        raise ValueError("boom")
+
+    mock_openai_client.chat.completions.create.side_effect = lambda **kwargs: (
+        create_mock_response(
+            {"role": "assistant", "content": ""},
+            [{"name": kwargs["tools"][0]["function"]["name"]}],
+        )
+        if kwargs["tools"] and kwargs["messages"][-1]["role"] == "user"
+        else create_mock_response(
+            {"role": "assistant", "content": DEFAULT_RESPONSE_CONTENT}
+        )
+    )
+    messages = [{"role": "user", "content": "Hi"}]
+    jobs = [
+        (Agent(), messages),
+        (Agent(functions=[broken_lookup]), messages),
+        (Agent(functions=[slow_lookup]), messages, {"user": "a"}),
+        {"agent": Agent(), "messages": messages},
+    ]
+
+    client = Swarm(client=mock_openai_client)
+    batch = client.run_many(jobs, max_concurrency=4, timeout=0.2, ordered=True)
+    results = list(batch)
+    release.set()
+
+    assert [r.index for r in results] == [0, 1, 2, 3]
+    assert results[0].response.messages[-1]["content"] == DEFAULT_RESPONSE_CONTENT
+    assert isinstance(results[1].error, ValueError)
+    assert isinstance(results[2].error, TimeoutError)
+    assert results[3].ok
+    assert batch.stats.succeeded == 2
+    assert batch.stats.failed == 1
+    assert batch.stats.timed_out == 1
+
+
+class KeywordEmbedder:
+    """Embeds text as a bag of known keywords."""
+
+    vocabulary = ["password", "reset", "refund", "order"]
+
+    def embed(self, model, input):
+        words = input.lower().replace("?", "").split()
+        return {"embeddings": [[float(w in words) for w in self.vocabulary]]}
+
+
+def test_semantic_cache_reuses_answers(mock_openai_client: MockOpenAIClient):
+    cache = SemanticCache(client=KeywordEmbedder(), threshold=0.9)
+    client = Swarm(client=mock_openai_client, semantic_cache=cache)
+    agent = Agent(name="Support Agent")
+
+    first = client.run(
+        agent=agent,
+        messages=[{"role": "user", "content": "How do I reset my password"}],
+    )
+    second = client.run(
+        agent=agent, messages=[{"role": "user", "content": "password reset how?"}]
+    )
+    other = client.run(
+        agent=agent, messages=[{"role": "user", "content": "Where is my order?"}]
+    )
+
+    assert mock_openai_client.chat.completions.create.call_count == 2
+    assert second.messages == first.messages
+    assert other.messages[-1]["content"] == DEFAULT_RESPONSE_CONTENT
+    assert cache.stats == {"hits": 1, "misses": 2, "entries": 2}
+
+    # a follow-up may mean something else entirely, whatever its wording
+    follow_up = [
+        {"role": "user", "content": "Where is my order?"},
+        {"role": "assistant", "content": "Which order?"},
+        {"role": "user", "content": "How do I reset my password"},
+    ]
+    assert not cache.eligible(agent, follow_up)
+    client.run(agent=agent, messages=follow_up)
+    assert mock_openai_client.chat.completions.create.call_count == 3
+
+
+class MissingEmbedder:
+    """An embedding endpoint whose model is not pulled."""
+
+    def embed(self, model, input):
+        raise ConnectionError("model 'nomic-embed-text' not found")
+
+
+def test_semantic_cache_failures_fall_back_to_the_model(
+    mock_openai_client: MockOpenAIClient,
+):
+    cache = SemanticCache(client=MissingEmbedder())
+    client = Swarm(client=mock_openai_client, semantic_cache=cache)
+    messages = [{"role": "user", "content": "How do I reset my password"}]
+
+    response = client.run(agent=Agent(), messages=messages)
+    assert response.messages[-1]["content"] == DEFAULT_RESPONSE_CONTENT
+    assert cache.stats["entries"] == 0
+
+    async_client = AsyncSwarm(client=MockAsyncOpenAIClient(), semantic_cache=cache)
+    async_client.client.set_response(
+        create_mock_response({"role": "assistant", "content": "async"})
+    )
+    response = asyncio.run(async_client.run(agent=Agent(), messages=messages))
+    assert response.messages[-1]["content"] == "async"
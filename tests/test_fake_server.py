@@ -0,0 +1,81 @@
+from swarm_ollama import Agent, Swarm
+from swarm_ollama.bench.fake_server import FakeModelConfig, FakeOllamaServer
+from swarm_ollama.bench.loadtest import (
+    LoadTestConfig,
+    LoadTestReport,
+    _Recorder,
+    run_load_test,
+)
+from swarm_ollama.bench.suite import run_suite
+from swarm_ollama.types import Response, TurnUsage, Usage
+
+
+def lookup(query: str) -> str:
+    return f"found {query}"
+
+
+def test_swarm_against_fake_server():
+    agent = Agent(functions=[lookup])
+    messages = [{"role": "user", "content": "hi"}]
+    with FakeOllamaServer(FakeModelConfig(response_tokens=3, tool_calls=2)) as server:
+        swarm = Swarm(base_url=server.url)
+
+        response = swarm.run(agent, messages)
+        assert [m["role"] for m in response.messages] == [
+            "assistant",
+            "tool",
+            "tool",
+            "assistant",
+        ]
+        assert response.messages[1]["content"] == "found x"
+        assert response.messages[-1]["content"] == "tok " * 3
+        assert response.usage.completion_tokens == 3
+
+        server.config = FakeModelConfig(response_tokens=5)
+        chunks = list(swarm.run_and_stream(agent, messages))
+        assert chunks[-1]["response"].messages[-1]["content"] == "tok " * 5
+        assert server.loaded == {agent.model}
+
+
+def test_suite_reports_overhead():
+    report = run_suite(["run[history=1,tools=0]", "batch"], iterations=1, warmup=0)
+
+    assert [r["id"] for r in report["results"]] == [
+        "run[history=1,tools=0]",
+        "batch[jobs=64,concurrency=1]",
+        "batch[jobs=64,concurrency=8]",
+        "batch[jobs=64,concurrency=32]",
+    ]
+    result = report["results"][0]
+    assert result["overhead"] == result["median"] - result["baseline_median"]
+    assert report["results"][1]["throughput"] > 0
+
+
+def test_load_test_drives_tools_and_handoffs():
+    config = LoadTestConfig(
+        sessions=4,
+        turns=6,
+        tool_probability=0.4,
+        handoff_probability=0.3,
+        stream=False,
+        seed=7,
+    )
+    with FakeOllamaServer() as server:
+        report = run_load_test(server.url, config)
+
+    summary = report.summary()
+    assert summary["turns"] == 24 and summary["error_rate"] == 0.0
+    assert report.tool_calls > 0 and report.handoffs > 0
+    assert len(report.time_to_first_token) == 24
+    assert summary["latency"]["p50"] <= summary["latency"]["p99"]
+
+
+def test_load_test_skips_unknown_time_to_first_token():
+    report = LoadTestReport(LoadTestConfig())
+    recorder = _Recorder(report)
+    for ttft in (None, 0.2):
+        usage = Usage(turns=[TurnUsage(time_to_first_token=ttft)])
+        recorder.turn(0.5, Response(usage=usage), handoff=False)
+
+    assert report.time_to_first_token == [0.2]
+    assert report.summary()["turns"] == 2
@@ -0,0 +1,148 @@
+import asyncio
+
+import pytest
+from ollama import Message
+
+from swarm_ollama import Agent, AsyncOllamaWrapper, OllamaWrapper, Swarm, AsyncSwarm
+from swarm_ollama.hooks import SwarmHooks
+
+from .test_wrapper import FakeOllamaClient, chunk
+
+
+class Recorder(SwarmHooks):
+    def __init__(self):
+        self.events = []
+        self.timestamps = []
+
+    def _record(self, name, run, ts, *payload):
+        self.events.append((name, run.turn, run.agent.name, *payload))
+        self.timestamps.append(ts)
+
+    def on_run_start(self, run, messages, ts):
+        self._record("run_start", run, ts)
+
+    def on_turn_start(self, run, ts):
+        self._record("turn_start", run, ts)
+
+    def on_request_sent(self, run, request, ts):
+        self._record("request_sent", run, ts, request["model"])
+
+    def on_first_token(self, run, ts):
+        self._record("first_token", run, ts)
+
+    def on_completion(self, run, message, usage, ts):
+        self._record("completion", run, ts, message["content"])
+
+    def on_tool_start(self, run, tool_call, ts):
+        self._record("tool_start", run, ts, tool_call.function.name)
+
+    def on_tool_end(self, run, tool_call, result, error, ts):
+        self._record("tool_end", run, ts, tool_call.function.name)
+
+    def on_handoff(self, run, from_agent, to_agent, ts):
+        self._record("handoff", run, ts, from_agent.name)
+
+    def on_run_end(self, run, response, error, ts):
+        self._record("run_end", run, ts, type(error).__name__ if error else None)
+
+
+class Broken(SwarmHooks):
+    def on_turn_start(self, run, ts):
+        raise RuntimeError("hook bug")
+
+
+def _handoff_client(stream=False):
+    tool_call = Message.ToolCall(
+        function=Message.ToolCall.Function(name="transfer", arguments={})
+    )
+    if stream:
+        responses = [
+            [chunk(tool_calls=[tool_call]), chunk(done=True)],
+            [chunk("Hi from 2"), chunk(done=True)],
+        ]
+    else:
+        responses = [
+            chunk(tool_calls=[tool_call], done=True),
+            chunk("Hi from 2", done=True),
+        ]
+    return FakeOllamaClient(responses)
+
+
+def _agents():
+    def transfer():
+        return agent2
+
+    agent2 = Agent(name="Agent 2", model="qwen2.5:7b")
+    return Agent(name="Agent 1", functions=[transfer]), agent2
+
+
+EXPECTED = [
+    ("run_start", 0, "Agent 1"),
+    ("turn_start", 1, "Agent 1"),
+    ("request_sent", 1, "Agent 1", "llama3.2:3b"),
+    ("completion", 1, "Agent 1", ""),
+    ("tool_start", 1, "Agent 1", "transfer"),
+    ("tool_end", 1, "Agent 1", "transfer"),
+    ("handoff", 1, "Agent 2", "Agent 1"),
+    ("turn_start", 2, "Agent 2"),
+    ("request_sent", 2, "Agent 2", "qwen2.5:7b"),
+]
+
+
+def test_hooks_see_turns_tools_and_handoffs():
+    recorder = Recorder()
+    agent1, _ = _agents()
+    swarm = Swarm(client=OllamaWrapper(_handoff_client()), hooks=[Broken(), recorder])
+
+    response = swarm.run(agent1, [{"role": "user", "content": "hi"}])
+
+    assert response.messages[-1]["content"] == "Hi from 2"
+    assert recorder.events == EXPECTED + [
+        ("completion", 2, "Agent 2", "Hi from 2"),
+        ("run_end", 2, "Agent 2", None),
+    ]
+    assert recorder.timestamps == sorted(recorder.timestamps)
+
+
+def test_async_stream_hooks_and_errors():
+    recorder = Recorder()
+    agent1, _ = _agents()
+    fake = _handoff_client(stream=True)
+
+    async def stream(items):
+        for item in items:
+            yield item
+
+    class AsyncFake:
+        async def chat(self, **kwargs):
+            response = fake.chat(**kwargs)
+            return stream(response) if kwargs["stream"] else response
+
+    swarm = AsyncSwarm(client=AsyncOllamaWrapper(AsyncFake()), hooks=recorder)
+
+    async def main():
+        return [
+            event
+            async for event in swarm.run_and_stream(
+                agent1, [{"role": "user", "content": "hi"}]
+            )
+        ]
+
+    asyncio.run(main())
+    assert recorder.events[:4] == [
+        ("run_start", 0, "Agent 1"),
+        ("turn_start", 1, "Agent 1"),
+        ("request_sent", 1, "Agent 1", "llama3.2:3b"),
+        ("first_token", 1, "Agent 1"),
+    ]
+    assert recorder.events[-3:] == [
+        ("first_token", 2, "Agent 2"),
+        ("completion", 2, "Agent 2", "Hi from 2"),
+        ("run_end", 2, "Agent 2", None),
+    ]
+
+    # the client has no responses left: the failure reaches on_run_end
+    with pytest.raises(Exception):
+        asyncio.run(main())
+    assert recorder.events[-1][0] == "run_end"
+    assert recorder.events[-1][-1] is not None
@@ -0,0 +1,111 @@
+import logging
+import threading
+
+from swarm_ollama import logging as swarm_logging
+from swarm_ollama.logging import LazyPayload, StructuredLogger, configure_logging
+
+
+class Payload:
+    def __init__(self):
+        self.serialized = 0
+
+    def __str__(self):
+        self.serialized += 1
+        return "x" * 100
+
+
+def test_payloads_are_serialized_only_when_logged(caplog):
+    payload = Payload()
+    log = StructuredLogger(logging.getLogger("swarm_ollama.test_logging"))
+
+    with caplog.at_level(logging.WARNING):
+        log.debug("Sending", messages=[payload])
+    assert payload.serialized == 0 and not caplog.records
+
+    configure_logging(max_chars=50)
+    try:
+        with caplog.at_level(logging.DEBUG):
+            log.debug("Sending", model="llama3.2:3b", messages=[payload])
+    finally:
+        configure_logging()
+    record = caplog.records[-1]
+    assert record.getMessage().startswith("Sending model=llama3.2:3b messages=")
+    assert record.getMessage().endswith("more chars)")
+    assert record.fields["model"] == "llama3.2:3b"
+    assert str(LazyPayload({"a": 1}, max_chars=None)) == '{"a": 1}'
+
+
+def test_sampling_and_background_handlers(caplog):
+    log = StructuredLogger(logging.getLogger("swarm_ollama.test_logging"))
+    configure_logging(sample_ratio=0.0)
+    try:
+        with caplog.at_level(logging.DEBUG):
+            log.debug("sampled out")
+            log.warning("kept")
+    finally:
+        configure_logging()
+    assert [r.getMessage() for r in caplog.records] == ["kept"]
+
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+    try:
+        configure_logging(background=True)
+        (queued,) = root.handlers
+        assert isinstance(queued, logging.handlers.QueueHandler)
+        assert list(swarm_logging._listener.handlers) == handlers
+
+    finally:
+        swarm_logging._stop_background()
+        root.handlers[:] = handlers
+
+
+class ThreadPayload:
+    def __init__(self):
+        self.threads = []
+
+    def __str__(self):
+        self.threads.append(threading.get_ident())
+        return "x"
+
+
+def test_background_records_are_formatted_off_the_logging_thread(caplog):
+    log = StructuredLogger(logging.getLogger("swarm_ollama.test_logging"))
+    payload = ThreadPayload()
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+    try:
+        with caplog.at_level(logging.DEBUG):
+            configure_logging(background=True)
+            log.debug("Sending", messages=[payload])
+            swarm_logging._stop_background()
+    finally:
+        swarm_logging._stop_background()
+        root.handlers[:] = handlers
+    assert payload.threads and threading.get_ident() not in payload.threads
+
+
+def test_truncation_bounds_serialization():
+    payloads = [Payload() for _ in range(10000)]
+    text = str(LazyPayload({"messages": payloads}, max_chars=300))
+
+    assert len(text) < 350 and text.endswith("more chars)")
+    assert sum(p.serialized for p in payloads) <= 3
+
+
+def test_debug_flag_leaves_help_to_the_program(monkeypatch):
+    monkeypatch.setattr("sys.argv", ["prog", "--help", "--debug"])
+
+    assert swarm_logging.get_debug_flag() is True
+
+
+def test_runs_log_their_turns_lazily(caplog):
+    from swarm_ollama import Agent, Swarm
+    from tests.mock_client import MockOpenAIClient, create_mock_response
+
+    mock = MockOpenAIClient()
+    mock.set_response(create_mock_response({"role": "assistant", "content": "hi"}))
+    with caplog.at_level(logging.DEBUG, logger="swarm_ollama.core"):
+        Swarm(client=mock).run(Agent(), [{"role": "user", "content": "hello"}])
+
+    events = [r.event for r in caplog.records if r.name == "swarm_ollama.core"]
+    assert events == ["Getting chat completion", "Received completion", "Ending turn"]
@@ -0,0 +1,28 @@
+import json
+
+from swarm_ollama.bench.micro import compare, main, summarize
+
+
+def test_compare_needs_a_significant_change():
+    baseline = summarize([1.0, 1.02, 0.98, 1.01, 0.99], "op")
+
+    assert compare(baseline, summarize([1.3, 1.32, 1.29, 1.31, 1.3], "op")) == "slower"
+    assert compare(baseline, summarize([0.7, 0.71, 0.69, 0.7, 0.72], "op")) == "faster"
+    # 5% slower is under the threshold
+    assert compare(baseline, summarize([1.05, 1.06, 1.04, 1.05, 1.05], "op")) == "same"
+    # so is a shift lost in the noise
+    assert compare(baseline, summarize([0.8, 1.6, 1.1, 1.5, 0.9], "op")) == "same"
+
+
+def test_compare_exits_non_zero_on_slowdowns(tmp_path):
+    path = tmp_path / "baseline.json"
+    assert main(["merge_chunk", "--repeat", "3", "--save", str(path)]) == 0
+
+    baseline = json.loads(path.read_text())
+    assert main(["merge_chunk", "--repeat", "3", "--compare", str(path)]) == 0
+
+    fast = baseline["benchmarks"]["merge_chunk"]
+    for key in ("median", "low", "high"):
+        fast[key] /= 10
+    path.write_text(json.dumps(baseline))
+    assert main(["merge_chunk", "--repeat", "3", "--compare", str(path)]) == 1
@@ -0,0 +1,60 @@
+import asyncio
+
+from swarm_ollama import Agent, AsyncSwarm, Swarm
+from swarm_ollama.bench.fake_server import FakeModelConfig, FakeOllamaServer
+from swarm_ollama.pool import (
+    LoopLocalAsyncClient,
+    PoolConfig,
+    get_async_client,
+    get_client,
+    pool_stats,
+)
+
+
+def test_swarms_share_clients_per_host_and_config():
+    host = "http://pool-test:11434"
+    first = Swarm(base_url=host)
+    second = Swarm(base_url=host + "/")
+    tuned = Swarm(base_url=host, pool=PoolConfig(max_connections=4))
+
+    assert first.client.client is second.client.client
+    assert tuned.client.client is not first.client.client
+    assert AsyncSwarm(base_url=host).client.client is not first.client.client
+    assert get_client(host) is first.client.client
+
+    stats = [s for s in pool_stats() if s["host"] == host and not s["async"]]
+    assert sorted(s["max_connections"] for s in stats) == [4, 100]
+    default = next(s for s in stats if s["max_connections"] == 100)
+    assert default["acquisitions"] == 3
+    assert default["connections"] == 0
+
+
+def test_async_swarm_survives_its_event_loop():
+    messages = [{"role": "user", "content": "hi"}]
+    with FakeOllamaServer(FakeModelConfig(response_tokens=2)) as server:
+        swarm = AsyncSwarm(base_url=server.url)
+
+        async def ask():
+            response = await swarm.run(Agent(), messages)
+            return response, get_async_client(server.url)
+
+        first, first_client = asyncio.run(ask())
+        second, second_client = asyncio.run(ask())
+
+    assert first.messages[-1]["content"] == second.messages[-1]["content"] == "tok " * 2
+    assert first_client is not second_client
+
+
+def test_loop_local_clients_are_acquired_once_per_loop():
+    host = "http://loop-local-test:11434"
+    client = LoopLocalAsyncClient(host)
+
+    async def resolve():
+        return client.chat, client.ps, client._client
+
+    asyncio.run(resolve())
+    asyncio.run(resolve())
+
+    stats = [s for s in pool_stats() if s["host"] == host]
+    # the first loop's client is forgotten once the second loop needs one
+    assert [s["acquisitions"] for s in stats] == [1]
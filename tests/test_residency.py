@@ -0,0 +1,78 @@
+from swarm_ollama import Agent, Swarm
+from swarm_ollama.residency import ModelResidency, reachable_agents
+
+sales_agent = Agent(name="Sales", model="qwen2.5:7b", keep_alive="1h")
+refunds_agent = Agent(name="Refunds", model="mistral")
+
+
+def transfer_to_sales():
+    return sales_agent
+
+
+def transfer_to_refunds():
+    return refunds_agent
+
+
+triage_agent = Agent(name="Triage", functions=[transfer_to_sales, transfer_to_refunds])
+refunds_agent.functions = [lambda: triage_agent]
+
+
+class FakeOllamaClient:
+    def __init__(self):
+        self.generated = []
+        self.loaded = []
+
+    def generate(self, **kwargs):
+        self.generated.append(kwargs)
+        return {"model": kwargs["model"], "load_duration": 2_500_000_000}
+
+    def ps(self):
+        return {"models": [{"model": model} for model in self.loaded]}
+
+
+def test_reachable_agents_follow_handoffs():
+    agents = reachable_agents(triage_agent)
+    assert [agent.name for agent in agents] == ["Triage", "Sales", "Refunds"]
+
+
+def test_warmup_preloads_reachable_models_with_their_keep_alive():
+    client = FakeOllamaClient()
+    swarm = Swarm(client=client, residency=ModelResidency(client, keep_alive="10m"))
+
+    loaded = swarm.warmup(triage_agent, models=["nomic-embed-text"])
+
+    assert loaded == {
+        "nomic-embed-text": 2.5,
+        "llama3.2:3b": 2.5,
+        "qwen2.5:7b": 2.5,
+        "mistral": 2.5,
+    }
+    keep_alive = {call["model"]: call["keep_alive"] for call in client.generated}
+    assert keep_alive["qwen2.5:7b"] == "1h"
+    assert keep_alive["mistral"] == "10m"
+    assert all(call["prompt"] == "" for call in client.generated)
+
+
+def test_refresh_reports_evictions():
+    client = FakeOllamaClient()
+    residency = ModelResidency(client)
+    residency.preload(["mistral", "llama3.2:3b"])
+
+    client.loaded = ["mistral:latest", "qwen2.5:7b"]
+    events = residency.refresh()
+
+    assert sorted((e.kind, e.model) for e in events) == [
+        ("evict", "llama3.2:3b"),
+        ("load", "qwen2.5:7b"),
+    ]
+    assert residency.resident == ["mistral:latest", "qwen2.5:7b"]
+    assert residency.stats["llama3.2:3b"]["evictions"] == 1
+    assert residency.stats["mistral:latest"]["last_load_seconds"] == 2.5
+
+
+def test_agent_keep_alive_is_sent_with_chat_requests():
+    swarm = Swarm(client=FakeOllamaClient())
+    params = swarm._build_create_params(
+        sales_agent, [], {}, model_override=None, stream=False, debug=False
+    )
+    assert params["keep_alive"] == "1h"
@@ -0,0 +1,126 @@
+import pytest
+from ollama import ResponseError
+
+from swarm_ollama import OllamaWrapper
+from swarm_ollama.retry import CircuitOpenError, RetryBudget, RetryPolicy
+
+from .test_wrapper import chunk
+
+
+class FlakyOllamaClient:
+    """Raises the queued errors, then answers."""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def chat(self, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return chunk("Hello", done=True)
+
+
+def create(client):
+    return client.chat.completions.create(messages=[{"role": "user", "content": "Hi"}])
+
+
+def test_transient_errors_are_retried():
+    ollama_client = FlakyOllamaClient(ResponseError("busy", 503), ConnectionError())
+    client = OllamaWrapper(ollama_client, retry=RetryPolicy(base_delay=0))
+
+    assert create(client).choices[0].message.content == "Hello"
+    assert ollama_client.calls == 3
+
+
+def test_other_errors_and_exhausted_budgets_are_not_retried():
+    ollama_client = FlakyOllamaClient(ResponseError("model not found", 404))
+    client = OllamaWrapper(ollama_client, retry=RetryPolicy(base_delay=0))
+    with pytest.raises(NameError):
+        create(client)
+    assert ollama_client.calls == 1
+
+    budget = RetryBudget(ratio=0, min_retries_per_second=0)
+    ollama_client = FlakyOllamaClient(ResponseError("busy", 503))
+    policy = RetryPolicy(base_delay=0, budget=budget)
+    with pytest.raises(NameError):
+        create(OllamaWrapper(ollama_client, retry=policy))
+    assert ollama_client.calls == 1
+    assert policy.stats["budget_exhausted"] == 1
+
+
+def test_open_circuit_fails_fast():
+    ollama_client = FlakyOllamaClient(*[ConnectionError()] * 4)
+    policy = RetryPolicy(max_attempts=2, base_delay=0, failure_threshold=2)
+    client = OllamaWrapper(ollama_client, retry=policy)
+
+    with pytest.raises(ConnectionError):
+        create(client)
+    with pytest.raises(CircuitOpenError):
+        create(client)
+    assert ollama_client.calls == 2
+    assert policy.stats["circuits"]["default"]["state"] == "open"
+
+
+class BrokenStreamClient:
+    """Streams one chunk, then fails while `broken`."""
+
+    def __init__(self):
+        self.broken = True
+
+    def chat(self, **kwargs):
+        def chunks():
+            yield chunk("Hel")
+            if self.broken:
+                raise ConnectionError("reset")
+            yield chunk("lo", done=True)
+
+        return chunks()
+
+
+def stream(client):
+    return client.chat.completions.create(
+        messages=[{"role": "user", "content": "Hi"}], stream=True
+    )
+
+
+def test_stream_outcomes_feed_the_breaker():
+    ollama_client = BrokenStreamClient()
+    policy = RetryPolicy(failure_threshold=2, reset_timeout=0)
+    client = OllamaWrapper(ollama_client, retry=policy)
+    breaker = policy.breaker(client.chat.completions.host)
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            list(stream(client))
+    assert breaker.state == "open"
+
+    # a probe closed early gives no verdict, and does not block the next one
+    probe = stream(client)
+    next(iter(probe))
+    probe.close()
+    assert breaker.state == "half_open"
+
+    ollama_client.broken = False
+    assert len(list(stream(client))) == 2
+    assert breaker.state == "closed"
+
+
+def test_balanced_nodes_have_their_own_breakers():
+    from .test_balancer import FakeNode, balanced
+
+    down, up = FakeNode("down", error=ConnectionError()), FakeNode("up")
+    policy = RetryPolicy(failure_threshold=1)
+    shared = balanced(down, up)
+    client = OllamaWrapper(shared, retry=policy)
+
+    # the request fails over, and only the failing node's circuit opens
+    assert create(client).choices[0].message.content == "up"
+    create(client)
+    assert down.calls == 1
+    circuits = policy.stats["circuits"]
+    assert circuits["http://balancer-test-down:11434"]["state"] == "open"
+    assert circuits["http://balancer-test-up:11434"]["state"] == "closed"
+
+    # the policy belongs to the wrapper, not to the client it shares
+    assert shared.retry is None
@@ -0,0 +1,127 @@
+import asyncio
+import threading
+import time
+
+from swarm_ollama import Agent, AsyncOllamaWrapper, AsyncSwarm, OllamaWrapper, Swarm
+from swarm_ollama.scheduler import ModelScheduler
+
+from .test_wrapper import FakeOllamaClient, chunk
+
+
+def run_queued(scheduler, models):
+    """Queue one completion per model, in order, and return the dispatch order."""
+    order = []
+    threads = []
+    for i, model in enumerate(models):
+
+        def complete(name=f"{model}{i}", model=model):
+            release = scheduler.acquire(model)
+            order.append(name)
+            release()
+
+        queued = sum(m["queued"] for m in scheduler.stats["models"].values())
+        thread = threading.Thread(target=complete)
+        thread.start()
+        threads.append(thread)
+        while sum(m["queued"] for m in scheduler.stats["models"].values()) == queued:
+            time.sleep(0.001)
+    return order, threads
+
+
+def test_completions_are_dispatched_in_model_waves():
+    scheduler = ModelScheduler(max_concurrency=1, max_wait=60)
+    release = scheduler.acquire("a")
+    order, threads = run_queued(scheduler, ["b", "a", "b", "a"])
+
+    release()
+    for thread in threads:
+        thread.join()
+
+    assert order == ["a1", "a3", "b0", "b2"]
+    stats = scheduler.stats
+    assert stats["switches"] == 1
+    assert stats["models"]["b"]["dispatched"] == 2
+    assert stats["models"]["b"]["max_wait"] > 0
+
+
+def test_waiting_past_max_wait_forces_a_switch():
+    scheduler = ModelScheduler(max_concurrency=1, max_wait=0)
+    release = scheduler.acquire("a")
+    order, threads = run_queued(scheduler, ["b", "a", "b", "a"])
+
+    release()
+    for thread in threads:
+        thread.join()
+
+    assert order == ["b0", "a1", "b2", "a3"]
+
+
+def test_streamed_completions_hold_their_slot_until_consumed():
+    scheduler = ModelScheduler(max_concurrency=1)
+    client = OllamaWrapper(
+        FakeOllamaClient([[chunk("Hi"), chunk(done=True)]]), scheduler=scheduler
+    )
+    stream = client.chat.completions.create(
+        messages=[{"role": "user", "content": "Hi"}], stream=True
+    )
+    assert scheduler.stats["in_flight"] == 1
+    list(stream)
+    assert scheduler.stats["in_flight"] == 0
+
+
+def test_abandoned_streams_release_their_slot():
+    scheduler = ModelScheduler(max_concurrency=2)
+    responses = [[chunk("Hi"), chunk(done=True)] for _ in range(3)]
+    fake = FakeOllamaClient(responses + [chunk("Bye", done=True)])
+    swarm = Swarm(client=OllamaWrapper(fake, scheduler=scheduler))
+    messages = [{"role": "user", "content": "Hi"}]
+
+    for _ in range(3):
+        events = swarm.run_and_stream(Agent(), messages)
+        assert next(events) == {"delim": "start"}
+        events.close()
+        assert scheduler.stats["in_flight"] == 0
+
+    # with leaked slots, this would wait forever
+    assert swarm.run(Agent(), messages).messages[-1]["content"] == "Bye"
+
+    async def stream(items):
+        for item in items:
+            yield item
+
+    class AsyncFake:
+        async def chat(self, **kwargs):
+            return stream([chunk("Hi"), chunk(done=True)])
+
+    async_swarm = AsyncSwarm(
+        client=AsyncOllamaWrapper(AsyncFake(), scheduler=scheduler)
+    )
+
+    async def main():
+        events = async_swarm.run_and_stream(Agent(), messages)
+        assert await events.__anext__() == {"delim": "start"}
+        await events.aclose()
+
+    asyncio.run(main())
+    assert scheduler.stats["in_flight"] == 0
+
+
+def test_async_completions_are_grouped_by_model():
+    scheduler = ModelScheduler(max_concurrency=1, max_wait=60)
+    order = []
+
+    async def complete(model):
+        release = await scheduler.acquire_async(model)
+        order.append(model)
+        await asyncio.sleep(0)
+        release()
+
+    async def main():
+        release = await scheduler.acquire_async("a")
+        tasks = [asyncio.create_task(complete(model)) for model in "baba"]
+        await asyncio.sleep(0)
+        release()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+    assert order == ["a", "a", "b", "b"]
@@ -0,0 +1,206 @@
+import asyncio
+import json
+
+from ollama import ChatResponse, Message
+
+from swarm_ollama import Agent, AsyncSwarm
+from swarm_ollama.admission import AdmissionRejected
+from swarm_ollama.retry import CircuitOpenError
+from swarm_ollama.server import SwarmApp
+from swarm_ollama.types import Response
+
+
+class FakeAsyncOllamaClient:
+    """Stands in for `ollama.AsyncClient`, answering every chat with `Hi!`."""
+
+    async def chat(self, **kwargs):
+        chunks = [
+            ChatResponse(
+                model=kwargs["model"],
+                done=done,
+                message=Message(role="assistant", content=content),
+            )
+            for content, done in [("Hi", False), ("!", True)]
+        ]
+        if not kwargs["stream"]:
+            return ChatResponse(
+                model=kwargs["model"],
+                done=True,
+                message=Message(role="assistant", content="Hi!"),
+            )
+
+        async def stream():
+            for chunk in chunks:
+                yield chunk
+
+        return stream()
+
+
+def make_app(**kwargs):
+    swarm = AsyncSwarm(client=FakeAsyncOllamaClient())
+    return SwarmApp([Agent(name="Helper")], swarm=swarm, **kwargs)
+
+
+def request(app, method, path, body=None):
+    """Send one HTTP request to the ASGI app; returns (status, body)."""
+    sent = []
+    incoming = [
+        {"type": "http.request", "body": json.dumps(body or {}).encode()},
+    ]
+
+    async def receive():
+        if incoming:
+            return incoming.pop(0)
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": method, "path": path}
+    asyncio.run(app(scope, receive, send))
+    status = sent[0]["status"]
+    return status, b"".join(m.get("body", b"") for m in sent[1:]).decode()
+
+
+def test_run_returns_the_response_as_json():
+    messages = [{"role": "user", "content": "Hello"}]
+    status, body = request(make_app(), "POST", "/run", {"messages": messages})
+
+    assert status == 200
+    response = json.loads(body)
+    assert response["agent"] == "Helper"
+    assert response["messages"][-1]["content"] == "Hi!"
+
+
+def test_stream_sends_server_sent_events():
+    messages = [{"role": "user", "content": "Hello"}]
+    status, body = request(make_app(), "POST", "/stream", {"messages": messages})
+
+    assert status == 200
+    events = [block.split("\n") for block in body.strip().split("\n\n")]
+    names = [event[0].removeprefix("event: ") for event in events]
+    assert names[0] == "delim" and names[-1] == "response"
+    deltas = [
+        json.loads(e[1].removeprefix("data: ")) for e in events if "delta" in e[0]
+    ]
+    assert "".join(d.get("content") or "" for d in deltas) == "Hi!"
+
+
+def test_errors_health_and_drain():
+    app = make_app()
+    assert request(app, "GET", "/nope")[0] == 404
+    assert request(app, "GET", "/run")[0] == 405
+    assert request(app, "POST", "/run", {"agent": "Nobody", "messages": []})[0] == 404
+    assert json.loads(request(app, "GET", "/agents")[1])[0]["name"] == "Helper"
+    assert request(app, "GET", "/healthz")[0] == 200
+
+    asyncio.run(app.drain())
+    assert request(app, "GET", "/healthz")[0] == 503
+    assert request(app, "POST", "/run", {"messages": []})[0] == 503
+
+
+class FailingSwarm:
+    """Stands in for an `AsyncSwarm` whose runs raise `error`."""
+
+    sessions = None
+
+    def __init__(self, error):
+        self.error = error
+
+    async def run(self, **kwargs):
+        raise self.error
+
+
+def test_run_error_paths():
+    app = make_app()
+    for body in [
+        {"agent": ["Helper"]},
+        {"context_variables": []},
+        {"deadline": "soon"},
+        {"deadline": -1},
+        {"max_turns": 0},
+        {"max_turns": 1.5},
+        {"max_turns": True},
+    ]:
+        status, error = request(app, "POST", "/run", {"messages": [], **body})
+        assert status == 400, body
+        assert "error" in json.loads(error)
+
+    for error, expected in [
+        (AdmissionRejected("Queue full.", "queue_full"), 503),
+        (CircuitOpenError("Circuit open."), 503),
+        (ConnectionError("Refused."), 502),
+        (RuntimeError("Boom."), 500),
+    ]:
+        app = SwarmApp([Agent(name="Helper")], swarm=FailingSwarm(error))
+        status, body = request(app, "POST", "/run", {"messages": []})
+        assert status == expected
+        assert str(error) in json.loads(body)["error"]
+
+
+def test_streams_drop_clients_that_stop_reading():
+    app = make_app(slow_client_timeout=0.05)
+    body = json.dumps({"messages": [{"role": "user", "content": "Hello"}]}).encode()
+    sent = []
+    incoming = [{"type": "http.request", "body": body}]
+
+    async def receive():
+        if incoming:
+            return incoming.pop(0)
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        sent.append(message)
+        if message["type"] == "http.response.body":
+            await asyncio.sleep(3600)  # the client never reads
+
+    scope = {"type": "http", "method": "POST", "path": "/stream"}
+    asyncio.run(asyncio.wait_for(app(scope, receive, send), 5))
+
+    assert sent[0]["status"] == 200 and len(sent) == 2
+    assert not app._active and app._runs == 0
+
+
+class BlockedSwarm:
+    """Stands in for an `AsyncSwarm` whose runs wait for `release`."""
+
+    sessions = None
+
+    def __init__(self):
+        self.release = asyncio.Event()
+
+    async def run(self, **kwargs):
+        await self.release.wait()
+        return Response(messages=[], agent=None, context_variables={})
+
+
+def test_concurrent_requests_cannot_overshoot_the_run_limit():
+    swarm = BlockedSwarm()
+    app = SwarmApp([Agent(name="Helper")], swarm=swarm, max_concurrent_runs=1)
+    statuses = []
+
+    async def post():
+        sent, incoming = [], [{"type": "http.request", "body": b'{"messages": []}'}]
+
+        async def receive():
+            await asyncio.sleep(0)  # the body arrives later
+            if incoming:
+                return incoming.pop(0)
+            await asyncio.sleep(3600)
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "method": "POST", "path": "/run"}
+        await app(scope, receive, send)
+        statuses.append(sent[0]["status"])
+
+    async def main():
+        requests = [asyncio.ensure_future(post()) for _ in range(3)]
+        while len(statuses) < 2:
+            await asyncio.sleep(0.01)
+        swarm.release.set()
+        await asyncio.gather(*requests)
+
+    asyncio.run(asyncio.wait_for(main(), 5))
+    assert sorted(statuses) == [200, 503, 503]
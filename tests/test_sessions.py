@@ -0,0 +1,162 @@
+import asyncio
+
+import pytest
+
+from swarm_ollama import Agent, AsyncSwarm, Swarm
+from swarm_ollama.types import Result
+from swarm_ollama.sessions import InMemorySessionStore, SQLiteSessionStore
+from tests.mock_client import (
+    MockAsyncOpenAIClient,
+    MockOpenAIClient,
+    create_mock_response,
+)
+
+
+def _handoff_responses():
+    return [
+        create_mock_response(
+            message={"role": "assistant", "content": ""},
+            function_calls=[{"name": "transfer_to_agent2"}],
+        ),
+        create_mock_response({"role": "assistant", "content": "agent 2 here"}),
+        create_mock_response({"role": "assistant", "content": "still agent 2"}),
+    ]
+
+
+def _agents():
+    def transfer_to_agent2():
+        return agent2
+
+    agent1 = Agent(name="Agent 1", functions=[transfer_to_agent2])
+    agent2 = Agent(name="Agent 2")
+    return agent1, agent2
+
+
+@pytest.mark.parametrize("store", ["memory", "sqlite"])
+def test_session_continues_conversation(store, tmp_path):
+    sessions = (
+        InMemorySessionStore()
+        if store == "memory"
+        else SQLiteSessionStore(str(tmp_path / "sessions.db"))
+    )
+    mock = MockOpenAIClient()
+    mock.set_sequential_responses(_handoff_responses())
+    client = Swarm(client=mock, sessions=sessions)
+    agent1, agent2 = _agents()
+
+    first = client.run(
+        agent1,
+        session_id="s1",
+        new_messages=[{"role": "user", "content": "hi"}],
+        context_variables={"user": "ada"},
+    )
+    assert first.agent is agent2
+
+    second = client.run(
+        agent1, session_id="s1", new_messages=[{"role": "user", "content": "again"}]
+    )
+    # the stored agent answers, with the whole history and stored context
+    assert second.agent is agent2
+    assert [m["content"] for m in second.messages] == ["still agent 2"]
+    sent = mock.chat.completions.create.call_args.kwargs["messages"]
+    assert [m["role"] for m in sent] == [
+        "system",
+        "user",
+        "assistant",
+        "tool",
+        "assistant",
+        "user",
+    ]
+    assert second.context_variables == {"user": "ada"}
+
+    session = sessions.load("s1")
+    assert session.agent_name == "Agent 2"
+    assert len(session.messages) == 6
+    assert session.messages[-1]["content"] == "still agent 2"
+
+    sessions.delete("s1")
+    assert sessions.load("s1") is None
+
+
+def test_session_store_is_append_only():
+    sessions = InMemorySessionStore(max_sessions=1)
+    message = {"role": "user", "content": "hi"}
+    sessions.append("a", [message], None, {})
+    message["content"] = "changed"
+    loaded = sessions.load("a")
+    loaded.messages.append({"role": "user", "content": "not stored"})
+    assert sessions.load("a").messages == [{"role": "user", "content": "hi"}]
+
+    sessions.append("b", [], "Agent", {})
+    assert sessions.load("a") is None
+    assert sessions.evictions == 1
+
+
+def test_async_session():
+    mock = MockAsyncOpenAIClient()
+    mock.set_response(create_mock_response({"role": "assistant", "content": "hello"}))
+    sessions = InMemorySessionStore()
+    client = AsyncSwarm(client=mock, sessions=sessions)
+
+    async def main():
+        await client.run(
+            Agent(), session_id="s", new_messages=[{"role": "user", "content": "hi"}]
+        )
+        return await client.run(
+            Agent(), session_id="s", new_messages=[{"role": "user", "content": "bye"}]
+        )
+
+    response = asyncio.run(main())
+    assert response.messages[-1]["content"] == "hello"
+    assert [m["content"] for m in sessions.load("s").messages] == [
+        "hi",
+        "hello",
+        "bye",
+        "hello",
+    ]
+
+
+def test_session_requires_store():
+    client = Swarm(client=MockOpenAIClient())
+    with pytest.raises(ValueError):
+        client.run(Agent(), session_id="s", new_messages=[])
+
+
+def test_demo_loop_keeps_handoff_targets(monkeypatch, capsys):
+    from swarm_ollama.repl import repl
+
+    mock = MockOpenAIClient()
+    mock.set_sequential_responses(_handoff_responses())
+    monkeypatch.setattr(repl, "Swarm", lambda **kwargs: Swarm(client=mock, **kwargs))
+    inputs = iter(["hi", "again"])
+
+    def read(prompt):
+        try:
+            return next(inputs)
+        except StopIteration:
+            raise EOFError
+
+    monkeypatch.setattr("builtins.input", read)
+
+    seen = []
+
+    def instructions(context_variables):
+        seen.append(context_variables.get("user"))
+        return "You are agent 2."
+
+    def transfer_to_agent2():
+        # created on the fly: not reachable from the starting agent
+        return Result(
+            agent=Agent(name="Agent 2", instructions=instructions),
+            context_variables={"user": "grace"},
+        )
+
+    with pytest.raises(EOFError):
+        repl.run_demo_loop(
+            Agent(name="Agent 1", functions=[transfer_to_agent2]),
+            context_variables={"user": "ada"},
+        )
+    last = capsys.readouterr().out.splitlines()[-1]
+    assert "Agent 2" in last and last.endswith("still agent 2")
+    # the handoff's update survives the next turn
+    assert seen == ["grace", "grace"]
@@ -0,0 +1,40 @@
+from swarm_ollama.tools import compile_tools
+
+
+def test_compile_tools_hides_context_variables():
+    def greet(context_variables, name: str):
+        """Greets the user."""
+        return f"Hello {name}"
+
+    async def lookup(query):
+        return query
+
+    toolset = compile_tools([greet, lookup])
+
+    greet_spec = toolset.by_name["greet"]
+    assert greet_spec.takes_context_variables
+    assert not greet_spec.is_async
+    assert greet_spec.schema["function"]["parameters"] == {
+        "type": "object",
+        "properties": {"name": {"type": "string"}},
+        "required": ["name"],
+    }
+    assert toolset.by_name["lookup"].is_async
+    assert not toolset.by_name["lookup"].takes_context_variables
+    assert toolset.schemas == (greet_spec.schema, toolset.by_name["lookup"].schema)
+
+
+def test_compile_tools_is_cached_by_function_identity():
+    def first():
+        pass
+
+    def second():
+        pass
+
+    functions = [first]
+    toolset = compile_tools(functions)
+    assert compile_tools(list(functions)) is toolset
+
+    functions.append(second)
+    assert compile_tools(functions) is not toolset
+    assert list(compile_tools(functions).by_name) == ["first", "second"]
@@ -0,0 +1,70 @@
+import json
+
+from swarm_ollama import OllamaWrapper, Swarm
+from swarm_ollama.tracing import (
+    ChromeTraceExporter,
+    InMemoryExporter,
+    JSONLExporter,
+    Tracer,
+)
+
+from .test_hooks import _agents, _handoff_client
+
+
+def _run(hooks):
+    agent1, _ = _agents()
+    swarm = Swarm(client=OllamaWrapper(_handoff_client()), hooks=hooks)
+    return swarm.run(agent1, [{"role": "user", "content": "hi"}])
+
+
+def test_tracer_nests_spans():
+    exporter = InMemoryExporter()
+    _run(Tracer(exporter))
+
+    spans = {span.span_id: span for span in exporter.spans}
+    tree = [
+        (span.name, spans[span.parent_id].name if span.parent_id else None)
+        for span in exporter.spans
+    ]
+    assert tree == [
+        ("run", None),
+        ("turn", "run"),
+        ("llm_call", "turn"),
+        ("chat.create", "llm_call"),
+        ("tool_call", "turn"),
+        ("handoff", "turn"),
+        ("turn", "run"),
+        ("llm_call", "turn"),
+        ("chat.create", "llm_call"),
+    ]
+    assert len({span.trace_id for span in exporter.spans}) == 1
+    assert all(span.end is not None for span in exporter.spans)
+    run, llm_call = exporter.spans[0], exporter.spans[-2]
+    assert run.attributes["final_agent"] == "Agent 2"
+    assert llm_call.attributes["model"] == "qwen2.5:7b"
+    assert llm_call.attributes["response_chars"] == len("Hi from 2")
+    assert exporter.spans[4].attributes["tool"] == "transfer"
+
+
+def test_tracer_samples_and_exports_to_files(tmp_path):
+    skipped = InMemoryExporter()
+    tracer = Tracer(skipped, sample_ratio=0.0)
+    _run(tracer)
+    assert skipped.spans == [] and tracer.dropped == 1
+
+    jsonl = JSONLExporter(str(tmp_path / "trace.jsonl"))
+    chrome = ChromeTraceExporter(str(tmp_path / "trace.json"))
+    _run([Tracer(jsonl), Tracer(chrome)])
+    jsonl.close()
+    chrome.close()
+
+    lines = (tmp_path / "trace.jsonl").read_text().splitlines()
+    assert [json.loads(line)["name"] for line in lines][:3] == [
+        "run",
+        "turn",
+        "llm_call",
+    ]
+    text = (tmp_path / "trace.json").read_text()
+    events = json.loads(text.rstrip().rstrip(",") + "]")
+    assert {event["ph"] for event in events} == {"X"}
+    assert len({event["tid"] for event in events}) == 1
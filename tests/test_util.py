@@ -1,4 +1,4 @@
-from swarm_ollama.util import function_to_json
+from swarm_ollama.util import MessageAccumulator, function_to_json
 
 
 def test_basic_function():
@@ -48,3 +48,46 @@ def test_complex_function():
             },
         },
     }
+
+
+def test_message_accumulator():
+    accumulator = MessageAccumulator()
+    accumulator.add({"content": "Hello", "role": "assistant", "tool_calls": None})
+    accumulator.add({"content": " world", "role": None})
+    accumulator.add(
+        {
+            "content": None,
+            "tool_calls": [
+                {
+                    "index": 0,
+                    "id": "call_0",
+                    "type": "function",
+                    "function": {"name": "get_weather", "arguments": '{"loc'},
+                }
+            ],
+        }
+    )
+    accumulator.add(
+        {
+            "tool_calls": [
+                {"index": 0, "function": {"arguments": 'ation": "Paris"}'}},
+            ]
+        }
+    )
+
+    assert accumulator.build(sender="Agent") == {
+        "content": "Hello world",
+        "sender": "Agent",
+        "role": "assistant",
+        "function_call": None,
+        "tool_calls": [
+            {
+                "function": {
+                    "arguments": '{"location": "Paris"}',
+                    "name": "get_weather",
+                },
+                "id": "call_0",
+                "type": "function",
+            }
+        ],
+    }
@@ -0,0 +1,184 @@
+from ollama import ChatResponse, Message
+
+from swarm_ollama import Agent, CompletionCache, OllamaWrapper, Swarm
+
+
+class FakeOllamaClient:
+    """Stands in for `ollama.Client`, replaying canned chat responses."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def chat(self, **kwargs):
+        self.requests.append(kwargs)
+        response = self.responses.pop(0)
+        if kwargs["stream"]:
+            return iter(response)
+        return response
+
+
+def chunk(content="", tool_calls=None, done=False, **counters):
+    return ChatResponse(
+        model="llama3.2:3b",
+        done=done,
+        done_reason="stop" if done else None,
+        message=Message(role="assistant", content=content, tool_calls=tool_calls),
+        **counters,
+    )
+
+
+def test_create_wraps_ollama_response():
+    client = OllamaWrapper(FakeOllamaClient([chunk("Hello there", done=True)]))
+    response = client.chat.completions.create(
+        messages=[{"role": "user", "content": "Hi"}]
+    )
+
+    message = response.choices[0].message
+    assert message.content == "Hello there"
+    assert message.role == "assistant"
+    assert message.tool_calls is None
+
+
+def test_create_streams_deltas():
+    tool_call = Message.ToolCall(
+        function=Message.ToolCall.Function(
+            name="get_weather", arguments={"location": "Paris"}
+        )
+    )
+    stream = [
+        chunk("Let me "),
+        chunk("check."),
+        chunk(tool_calls=[tool_call]),
+        chunk(done=True),
+    ]
+    client = OllamaWrapper(FakeOllamaClient([stream]))
+    chunks = list(
+        client.chat.completions.create(
+            messages=[{"role": "user", "content": "Weather?"}], stream=True
+        )
+    )
+
+    deltas = [c.choices[0].delta for c in chunks]
+    assert [d.role for d in deltas] == ["assistant", None, None, None]
+    assert "".join(d.content or "" for d in deltas) == "Let me check."
+    assert deltas[2].tool_calls == [
+        {
+            "index": 0,
+            "id": "call_0",
+            "type": "function",
+            "function": {"name": "get_weather", "arguments": '{"location": "Paris"}'},
+        }
+    ]
+    assert chunks[-1].choices[0].finish_reason == "tool_calls"
+
+
+def test_run_and_stream_with_ollama_wrapper():
+    calls = []
+
+    def get_weather(location):
+        calls.append(location)
+        return "Sunny"
+
+    tool_call = Message.ToolCall(
+        function=Message.ToolCall.Function(
+            name="get_weather", arguments={"location": "Paris"}
+        )
+    )
+    fake = FakeOllamaClient(
+        [
+            [chunk(tool_calls=[tool_call]), chunk(done=True)],
+            [chunk("It is "), chunk("sunny."), chunk(done=True)],
+        ]
+    )
+    swarm = Swarm(client=OllamaWrapper(fake))
+    agent = Agent(name="Weather Agent", functions=[get_weather])
+    events = list(
+        swarm.run(agent, [{"role": "user", "content": "Weather?"}], stream=True)
+    )
+
+    response = events[-1]["response"]
+    assert calls == ["Paris"]
+    assert response.messages[0]["tool_calls"][0]["function"]["name"] == "get_weather"
+    assert response.messages[1]["content"] == "Sunny"
+    assert response.messages[-1]["content"] == "It is sunny."
+
+
+def test_run_reports_usage():
+    tool_call = Message.ToolCall(
+        function=Message.ToolCall.Function(name="lookup", arguments={})
+    )
+    counters = dict(
+        prompt_eval_count=40,
+        prompt_eval_duration=200_000_000,
+        eval_count=10,
+        eval_duration=500_000_000,
+        load_duration=100_000_000,
+        total_duration=900_000_000,
+    )
+    fake = FakeOllamaClient(
+        [
+            chunk(tool_calls=[tool_call], done=True, **counters),
+            chunk("Found it", done=True, **counters),
+            [chunk("Done"), chunk(done=True, **counters)],
+        ]
+    )
+
+    def lookup():
+        return "found"
+
+    swarm = Swarm(client=OllamaWrapper(fake))
+    agent = Agent(name="Lookup Agent", functions=[lookup])
+
+    response = swarm.run(agent, [{"role": "user", "content": "Find it"}])
+    first = response.usage.turns[0]
+    assert (first.prompt_tokens, first.completion_tokens) == (40, 10)
+    assert first.tokens_per_second == 20.0
+    assert abs(first.time_to_first_token - 0.3) < 1e-9
+    assert first.tool_time > 0
+
+    events = list(swarm.run(agent, [{"role": "user", "content": "Again"}], stream=True))
+    streamed = events[-1]["response"].usage
+    assert streamed.turns[0].completion_tokens == 10
+    assert streamed.turns[0].time_to_first_token <= streamed.turns[0].wall_time
+
+    total = response.usage + streamed
+    assert total.completion_tokens == 30
+    assert list(total.by_agent()) == ["Lookup Agent"]
+    assert total.summary()["turns"] == 3
+
+
+def test_create_uses_completion_cache(tmp_path):
+    path = str(tmp_path / "completions.sqlite")
+    fake = FakeOllamaClient([chunk("First", done=True), chunk("Second", done=True)])
+    client = OllamaWrapper(fake, cache=CompletionCache(path=path))
+    messages = [{"role": "user", "content": "Hi"}]
+
+    first = client.chat.completions.create(messages=messages)
+    second = client.chat.completions.create(messages=messages)
+    bypassed = client.chat.completions.create(messages=messages, bypass_cache=True)
+
+    assert len(fake.requests) == 2
+    assert first.choices[0].message.content == "First"
+    assert second.choices[0].message.content == "First"
+    assert bypassed.choices[0].message.content == "Second"
+    assert client.chat.cache.stats["hits"] == 1
+    assert client.chat.cache.stats["misses"] == 1
+
+    # a new process only has the on-disk tier
+    restarted = OllamaWrapper(FakeOllamaClient([]), cache=CompletionCache(path=path))
+    response = restarted.chat.completions.create(messages=messages)
+    assert response.choices[0].message.content == "First"
+    assert restarted.chat.cache.stats["disk_hits"] == 1
+
+
+def test_completion_cache_evicts_least_recently_used():
+    cache = CompletionCache(max_entries=2)
+    cache.set("a", {"n": 1})
+    cache.set("b", {"n": 2})
+    assert cache.get("a") == {"n": 1}
+    cache.set("c", {"n": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"n": 1}
+    assert cache.stats["evictions"] == 1